@@ -0,0 +1,134 @@
+"""Read-path load test for `/api/feed`.
+
+Seeds a temporary SQLite DB, then drives the app in-process with a fixed number of
+concurrent clients and reports throughput and latency percentiles as JSON for:
+
+- `threadpool`: the previous sync route (blocking repository call on Starlette's threadpool)
+- `reader`: the async route backed by `AsyncFeedReader`
+
+Usage (from `backend/`):
+
+    python benchmarks/bench_feed_reads.py --items 5000 --concurrency 64 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import httpx
+from fastapi import Depends
+
+from provenance_feed.api.app import create_app
+from provenance_feed.api.deps import get_repo
+from provenance_feed.api.schemas import FeedItemOut
+from provenance_feed.config import Settings
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.repository import FeedRepository
+
+
+def _seed(app, n: int) -> None:
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    for i in range(n):
+        app.state.repo.upsert(
+            FeedItem(
+                content_id=f"bench:{i}",
+                title=f"Synthetic headline number {i}",
+                source_name="Bench",
+                source_url=f"https://example.com/story/{i}",
+                published_at=base + timedelta(minutes=i),
+            )
+        )
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[idx]
+
+
+async def _drive(app, path: str, *, concurrency: int, seconds: float, limit: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                r = await client.get(path, params={"limit": limit})
+                latencies.append(time.perf_counter() - t0)
+                if r.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--reader-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(
+            database_path=Path(tmp) / "feed.db",
+            auto_ingest_on_startup=False,
+            reader_max_workers=args.reader_workers,
+        )
+        app = create_app(settings)
+        # ASGITransport does not run the lifespan, which is where the app migrates.
+        app.state.repo.init_schema()
+        _seed(app, args.items)
+
+        # Baseline: the previous sync route shape, for comparison.
+        @app.get("/bench/feed-threadpool", response_model=list[FeedItemOut])
+        def list_feed_threadpool(
+            limit: int = 50,
+            repo: FeedRepository = Depends(get_repo),  # noqa: B008
+        ) -> list[FeedItemOut]:
+            items = repo.list_latest(limit=limit)
+            return [FeedItemOut.model_validate(i, from_attributes=True) for i in items]
+
+        results = {}
+        for name, path in (("threadpool", "/bench/feed-threadpool"), ("reader", "/api/feed")):
+            results[name] = asyncio.run(
+                _drive(
+                    app,
+                    path,
+                    concurrency=args.concurrency,
+                    seconds=args.seconds,
+                    limit=args.limit,
+                )
+            )
+        app.state.reader.close()
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
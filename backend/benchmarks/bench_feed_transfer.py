@@ -0,0 +1,118 @@
+"""Bytes-on-the-wire comparison for feed downloads.
+
+Fetches each feed twice with `HTTPClient`: once without `Accept-Encoding` (the previous
+behaviour) and once negotiating gzip/deflate (and brotli if installed), and reports the
+transferred and decoded sizes as JSON.
+
+By default a local server serves a synthetic RSS feed (compressing it when asked), so the
+numbers are reproducible offline. With `--live`, the curated sources are fetched instead.
+
+Usage (from `backend/`):
+
+    python benchmarks/bench_feed_transfer.py --items 200
+    python benchmarks/bench_feed_transfer.py --live
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from provenance_feed.ingestion.http_client import HTTPClient
+from provenance_feed.ingestion.real_sources import SOURCES
+from provenance_feed.ingestion.rss_common import fetch_feed_xml
+
+
+def _synthetic_feed(items: int) -> bytes:
+    entries = "".join(
+        f"<item><title>Synthetic headline number {i}</title>"
+        f"<link>https://example.com/story/{i}</link>"
+        f"<guid>https://example.com/story/{i}</guid>"
+        f"<description>Summary paragraph for story {i}, as publishers include.</description>"
+        f"<pubDate>Wed, 01 Jan 2025 12:{i % 60:02d}:00 GMT</pubDate></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>'
+        f"{entries}</channel></rss>"
+    ).encode()
+
+
+def _serve(feed: bytes) -> ThreadingHTTPServer:
+    compressed = gzip.compress(feed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "")
+            body = compressed if gzipped else feed
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def _measure(urls: list[str], *, accept_compressed: bool) -> dict:
+    client = HTTPClient(accept_compressed=accept_compressed)
+    per_url = {}
+    for url in urls:
+        start = client.bytes_received
+        try:
+            fetch_feed_xml(url=url, client=client)
+        except Exception as e:
+            per_url[url] = f"{type(e).__name__}: {e}"
+            continue
+        per_url[url] = client.bytes_received - start
+    client.close()
+    return {
+        "wire_bytes": client.bytes_received,
+        "decoded_bytes": client.bytes_decoded,
+        "per_url": per_url,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200, help="items in the synthetic feed")
+    parser.add_argument("--live", action="store_true", help="fetch the curated sources")
+    args = parser.parse_args()
+
+    httpd = None
+    if args.live:
+        urls = [s.feed_url for s in SOURCES]
+    else:
+        httpd = _serve(_synthetic_feed(args.items))
+        urls = [f"http://127.0.0.1:{httpd.server_address[1]}/feed.xml"]
+
+    try:
+        before = _measure(urls, accept_compressed=False)
+        after = _measure(urls, accept_compressed=True)
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+
+    ratio = after["wire_bytes"] / before["wire_bytes"] if before["wire_bytes"] else None
+    print(
+        json.dumps(
+            {"identity": before, "compressed": after, "wire_ratio": ratio},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Per-item cost of the ingestion record path.
+
+Compares the previous shape (parsers emit dicts with ISO-8601 timestamp strings, which
+`normalise_record` parses back and validates into a pydantic `FeedItem`) with the current
+one (parsers emit slotted `RawRecord`s with native datetimes, normalised into the frozen
+dataclass `FeedItem`). Both paths start from the same parsed entry values, so the feed
+parsing itself (identical in both) is left out. Reports CPU time per item and the bytes
+allocated per item (tracemalloc) as JSON.
+
+Usage (from `backend/`):
+
+    python benchmarks/bench_ingest_records.py --items 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from pydantic import BaseModel, Field
+
+from provenance_feed.domain.identifiers import make_content_id
+from provenance_feed.ingestion.records import RawRecord
+from provenance_feed.ingestion.service import normalise_record
+
+
+class _LegacyFeedItem(BaseModel):
+    # The pydantic FeedItem model as it was before it became a dataclass.
+    content_id: str = Field(..., description="Stable identifier used for provenance lookups")
+    title: str
+    source_name: str
+    source_url: str
+    published_at: datetime
+    image_url: str | None = None
+    image_source: str | None = None
+    image_last_checked: datetime | None = None
+    cluster_id: str | None = None
+
+
+def _ensure_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
+def _legacy(entry: tuple) -> _LegacyFeedItem:
+    source_item_id, title, url, published_at, checked = entry
+    raw = {
+        "source": "bench",
+        "source_item_id": source_item_id,
+        "title": title,
+        "source_name": "Bench",
+        "source_url": url,
+        "published_at": published_at.isoformat(),
+        "image_url": None,
+        "image_source": "none",
+        "image_last_checked": checked.isoformat(),
+    }
+    image_last_checked = raw.get("image_last_checked")
+    return _LegacyFeedItem(
+        content_id=make_content_id(source=raw["source"], source_item_id=raw["source_item_id"]),
+        title=raw["title"].strip(),
+        source_name=raw["source_name"].strip(),
+        source_url=raw["source_url"].strip(),
+        published_at=_ensure_utc(datetime.fromisoformat(raw["published_at"])),
+        image_url=raw.get("image_url") or None,
+        image_source=raw.get("image_source") or None,
+        image_last_checked=(
+            _ensure_utc(datetime.fromisoformat(image_last_checked)) if image_last_checked else None
+        ),
+    )
+
+
+def _current(entry: tuple) -> object:
+    source_item_id, title, url, published_at, checked = entry
+    record = RawRecord(
+        source="bench",
+        source_item_id=source_item_id,
+        title=title,
+        source_name="Bench",
+        source_url=url,
+        published_at=published_at,
+        image_url=None,
+        image_source="none",
+        image_last_checked=checked,
+    )
+    return normalise_record(record)
+
+
+def _entries(n: int) -> list[tuple]:
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    return [
+        (
+            f"https://example.com/story/{i}",
+            f"Synthetic headline number {i}",
+            f"https://example.com/story/{i}",
+            base + timedelta(minutes=i),
+            base,
+        )
+        for i in range(n)
+    ]
+
+
+def _measure(fn: Callable[[tuple], object], entries: list[tuple]) -> dict:
+    gc.collect()
+    start = time.process_time()
+    items = [fn(e) for e in entries]
+    cpu = time.process_time() - start
+    del items
+
+    gc.collect()
+    tracemalloc.start()
+    items = [fn(e) for e in entries]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    n = len(entries)
+    return {
+        "cpu_us_per_item": round(cpu / n * 1e6, 3),
+        "retained_bytes_per_item": round(retained / n, 1),
+        "peak_bytes_per_item": round(peak / n, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50_000)
+    args = parser.parse_args()
+
+    entries = _entries(args.items)
+    # Warm both paths (pydantic builds its validator lazily).
+    _legacy(entries[0])
+    _current(entries[0])
+
+    legacy = _measure(_legacy, entries)
+    current = _measure(_current, entries)
+    print(
+        json.dumps(
+            {
+                "items": args.items,
+                "dict_iso_pydantic": legacy,
+                "raw_record_dataclass": current,
+                "cpu_ratio": round(current["cpu_us_per_item"] / legacy["cpu_us_per_item"], 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""HTTP load test for the feed API, for sizing replicas.
+
+Seeds a temporary SQLite DB with a synthetic corpus, starts the app under uvicorn in a
+separate process, and drives it over real HTTP with a weighted mix of requests:
+
+- `feed`: `/api/feed` with a random `limit` (10, 50 or 200)
+- `feed_cursor`: `/api/feed` deeper pages, via cursors collected up front
+- `feed_source`: `/api/feed?source=...`
+- `feed_collapse`: `/api/feed?collapse=true`
+- `changes`: `/api/changes` from a random sequence
+- `batch_get`: `POST /api/items:batchGet` with 50 random ids
+- `healthz`: `/healthz`
+
+Load is closed-loop (`--concurrency` clients, each sending its next request when the
+previous one completes) or open-loop (`--rate` requests per second on a fixed schedule,
+however slowly the server answers; latency is then measured from the scheduled send
+time, so queueing is included rather than hidden).
+
+With `--ingest-rate`, the run is repeated while another process upserts new items into
+the same database at that many items per second, to measure reader/writer interference.
+
+Prints throughput, error rate and p50/p95/p99/max latency per request kind as JSON. The
+load generator is a single asyncio process; at very high rates it may saturate before
+the server does (its own CPU use is reported as `client_cpu_seconds`).
+
+Usage (from `backend/`):
+
+    python benchmarks/loadtest.py --items 20000 --concurrency 32 --seconds 10
+    python benchmarks/loadtest.py --rate 500 --seconds 10 --ingest-rate 200
+    python benchmarks/loadtest.py --mix feed=1,healthz=1 --server-workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+DEFAULT_MIX = {
+    "feed": 40,
+    "feed_cursor": 20,
+    "feed_source": 10,
+    "feed_collapse": 5,
+    "changes": 10,
+    "batch_get": 10,
+    "healthz": 5,
+}
+
+_WORDS = (
+    "election storm market court climate health science border talks energy police "
+    "budget strike trade rocket vaccine summit flood ceasefire minister launch report "
+    "study protest harvest wildfire earthquake satellite museum festival shortage"
+).split()
+
+_BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _synthetic_item(
+    i: int, *, sources: int, rng: random.Random, published_at: datetime
+) -> FeedItem:
+    source = f"src{i % sources}"
+    digest = hashlib.sha256(f"{source}/{i}".encode()).hexdigest()
+    return FeedItem(
+        content_id=f"{source}:{digest}",
+        title=" ".join(rng.choices(_WORDS, k=8)).capitalize(),
+        source_name=f"Source {i % sources}",
+        source_url=f"https://{source}.example.com/story/{i}",
+        published_at=published_at,
+        image_url=f"https://img.example.com/{i}.jpg" if i % 3 else None,
+        image_source="rss" if i % 3 else "none",
+    )
+
+
+def seed(database_path: Path, *, items: int, sources: int, batch_size: int = 1000) -> None:
+    repo = SQLiteFeedRepository(database_path=database_path)
+    repo.init_schema()
+    rng = random.Random(0)
+    for start in range(0, items, batch_size):
+        repo.upsert_many(
+            [
+                _synthetic_item(
+                    i, sources=sources, rng=rng, published_at=_BASE + timedelta(minutes=i)
+                )
+                for i in range(start, min(items, start + batch_size))
+            ]
+        )
+
+
+def _ingest_writer(
+    database_path: str,
+    rate: float,
+    batch_size: int,
+    seconds: float,
+    first: int,
+    sources: int,
+    out: multiprocessing.Queue,
+) -> None:
+    # Runs in its own process, as the ingestion CLI would.
+    repo = SQLiteFeedRepository(database_path=Path(database_path))
+    rng = random.Random(first)
+    interval = batch_size / rate
+    latencies: list[float] = []
+    i = first
+    start = time.perf_counter()
+    while (now := time.perf_counter()) - start < seconds:
+        batch = [
+            _synthetic_item(j, sources=sources, rng=rng, published_at=datetime.now(tz=UTC))
+            for j in range(i, i + batch_size)
+        ]
+        t0 = time.perf_counter()
+        repo.upsert_many(batch)
+        latencies.append(time.perf_counter() - t0)
+        i += batch_size
+        time.sleep(max(0.0, now + interval - time.perf_counter()))
+    out.put({"items": i - first, "batches": len(latencies), **_latency_summary(latencies)})
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[idx]
+
+
+def _latency_summary(latencies: list[float]) -> dict:
+    values = sorted(latencies)
+    return {
+        "p50_ms": round(_percentile(values, 50) * 1000, 2),
+        "p95_ms": round(_percentile(values, 95) * 1000, 2),
+        "p99_ms": round(_percentile(values, 99) * 1000, 2),
+        "max_ms": round((values[-1] if values else 0.0) * 1000, 2),
+    }
+
+
+@dataclass
+class Context:
+    """What the request generators pick from, collected from the live server."""
+
+    sources: list[str]
+    cursors: list[str] = field(default_factory=list)
+    content_ids: list[str] = field(default_factory=list)
+    max_change_seq: int = 0
+
+
+Request = Callable[[httpx.AsyncClient, Context, random.Random], Awaitable[httpx.Response]]
+
+
+def _requests() -> dict[str, Request]:
+    def feed(client, ctx, rng):
+        return client.get("/api/feed", params={"limit": rng.choice((10, 50, 200))})
+
+    def feed_cursor(client, ctx, rng):
+        return client.get("/api/feed", params={"limit": 50, "cursor": rng.choice(ctx.cursors)})
+
+    def feed_source(client, ctx, rng):
+        return client.get("/api/feed", params={"limit": 50, "source": rng.choice(ctx.sources)})
+
+    def feed_collapse(client, ctx, rng):
+        return client.get("/api/feed", params={"limit": 50, "collapse": "true"})
+
+    def changes(client, ctx, rng):
+        since = rng.randrange(max(1, ctx.max_change_seq))
+        return client.get("/api/changes", params={"since": since, "limit": 100})
+
+    def batch_get(client, ctx, rng):
+        ids = rng.sample(ctx.content_ids, min(50, len(ctx.content_ids)))
+        return client.post("/api/items:batchGet", json={"content_ids": ids})
+
+    def healthz(client, ctx, rng):
+        return client.get("/healthz")
+
+    return {
+        "feed": feed,
+        "feed_cursor": feed_cursor,
+        "feed_source": feed_source,
+        "feed_collapse": feed_collapse,
+        "changes": changes,
+        "batch_get": batch_get,
+        "healthz": healthz,
+    }
+
+
+async def _collect_context(base_url: str, sources: int, pages: int) -> Context:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        return await _walk(client, Context(sources=[f"src{i}" for i in range(sources)]), pages)
+
+
+async def _walk(client: httpx.AsyncClient, ctx: Context, pages: int) -> Context:
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": 200, **({"cursor": cursor} if cursor else {})}
+        r = await client.get("/api/feed", params=params)
+        r.raise_for_status()
+        ctx.content_ids += [i["content_id"] for i in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        ctx.cursors.append(cursor)
+    ctx.cursors = ctx.cursors or [""]
+    since = 0
+    while True:
+        r = await client.get("/api/changes", params={"since": since, "limit": 1000})
+        r.raise_for_status()
+        body = r.json()
+        if body["next_since"] == since:
+            break
+        since = body["next_since"]
+    ctx.max_change_seq = since
+    return ctx
+
+
+async def _drive(
+    base_url: str,
+    ctx: Context,
+    mix: dict[str, int],
+    *,
+    seconds: float,
+    concurrency: int,
+    rate: float | None,
+) -> dict:
+    requests = _requests()
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies: dict[str, list[float]] = {n: [] for n in names}
+    errors: dict[str, int] = dict.fromkeys(names, 0)
+    rng = random.Random(1)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def one(name: str, started: float) -> None:
+            try:
+                r = await requests[name](client, ctx, rng)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies[name].append(time.perf_counter() - started)
+            if not ok:
+                errors[name] += 1
+
+        cpu_before = time.process_time()
+        t_start = time.perf_counter()
+        deadline = t_start + seconds
+        if rate is None:
+
+            async def worker() -> None:
+                while time.perf_counter() < deadline:
+                    await one(rng.choices(names, weights)[0], time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            tasks: set[asyncio.Task] = set()
+            n = 0
+            while (scheduled := t_start + n / rate) < deadline:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = asyncio.create_task(one(rng.choices(names, weights)[0], scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                n += 1
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - t_start
+        cpu = time.process_time() - cpu_before
+
+    total = [v for values in latencies.values() for v in values]
+    total_errors = sum(errors.values())
+    by_kind = {
+        n: {
+            "requests": len(latencies[n]),
+            "errors": errors[n],
+            "error_rate": round(errors[n] / len(latencies[n]), 4) if latencies[n] else 0.0,
+            "rps": round(len(latencies[n]) / elapsed, 1),
+            **_latency_summary(latencies[n]),
+        }
+        for n in names
+    }
+    return {
+        "requests": len(total),
+        "errors": total_errors,
+        "error_rate": round(total_errors / len(total), 4) if total else 0.0,
+        "rps": round(len(total) / elapsed, 1),
+        **_latency_summary(total),
+        "seconds": round(elapsed, 2),
+        "client_cpu_seconds": round(cpu, 2),
+        "by_kind": by_kind,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(database_path: Path, port: int, args: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "BACKEND_DATABASE_PATH": str(database_path),
+        "BACKEND_AUTO_INGEST_ON_STARTUP": "false",
+        "BACKEND_READER_MAX_WORKERS": str(args.reader_workers),
+        "BACKEND_SNAPSHOT_ENABLED": "true" if args.snapshot else "false",
+    }
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH")) if p)
+    cmd = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "provenance_feed.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(args.server_workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    proc = subprocess.Popen(cmd, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/healthz", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("uvicorn did not become ready")
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown request kind: {name}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000, help="items in the seeded corpus")
+    parser.add_argument("--sources", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each phase")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=32, help="closed-loop clients")
+    load.add_argument("--rate", type=float, default=None, help="open-loop requests/second")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX, help="e.g. feed=3,healthz=1")
+    parser.add_argument("--ingest-rate", type=float, default=0.0, help="items/second written")
+    parser.add_argument("--ingest-batch-size", type=int, default=50)
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--reader-workers", type=int, default=4)
+    parser.add_argument("--snapshot", action="store_true", help="serve from the in-memory snapshot")
+    parser.add_argument("--database", type=Path, help="reuse/keep this DB instead of a temp one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = args.database or Path(tmp) / "feed.db"
+        seeded = time.perf_counter()
+        if not database_path.exists():
+            seed(database_path, items=args.items, sources=args.sources)
+        seed_seconds = time.perf_counter() - seeded
+
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = _start_server(database_path, port, args)
+        try:
+            ctx = asyncio.run(_collect_context(base_url, args.sources, 20))
+            concurrency = args.concurrency if args.rate is None else 1000
+            drive = dict(seconds=args.seconds, concurrency=concurrency, rate=args.rate)
+            report: dict = {
+                "config": {
+                    k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()
+                },
+                "seed_seconds": round(seed_seconds, 2),
+                "read_only": asyncio.run(_drive(base_url, ctx, args.mix, **drive)),
+            }
+
+            if args.ingest_rate > 0:
+                mp = multiprocessing.get_context("spawn")
+                out: multiprocessing.Queue = mp.Queue()
+                writer = mp.Process(
+                    target=_ingest_writer,
+                    args=(
+                        str(database_path),
+                        args.ingest_rate,
+                        max(1, args.ingest_batch_size),
+                        args.seconds,
+                        10 * max(args.items, 1),
+                        args.sources,
+                        out,
+                    ),
+                )
+                writer.start()
+                report["with_ingest"] = asyncio.run(_drive(base_url, ctx, args.mix, **drive))
+                report["ingest"] = out.get(timeout=args.seconds + 60)
+                writer.join()
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,128 @@
 from __future__ import annotations
 
+import logging
+import threading
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from provenance_feed.api.compression import ResponseCache
+from provenance_feed.api.profiling import PROFILE_REPORT_HEADER, ProfileRequests
+from provenance_feed.api.routes.changes import router as changes_router
+from provenance_feed.api.routes.export import router as export_router
+from provenance_feed.api.routes.feed import NEXT_CURSOR_HEADER
 from provenance_feed.api.routes.feed import router as feed_router
-from provenance_feed.config import Settings, get_settings
-from provenance_feed.ingestion.real_sources import fetch_all_records
-from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.api.routes.ingest import router as ingest_router
+from provenance_feed.api.routes.items import router as items_router
+from provenance_feed.api.stream import FeedBroadcaster
+from provenance_feed.config import (
+    Settings,
+    get_settings,
+    leader_election,
+)
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+from provenance_feed.persistence.ingest_runs import SQLiteIngestRunStore
+from provenance_feed.persistence.repository import FeedRepository
+from provenance_feed.persistence.snapshot import SnapshotFeedRepository
 from provenance_feed.persistence.sqlite import SQLiteFeedRepository
-from provenance_feed.provenance_graph.observer import ProvenanceGraphObserver
+
+if TYPE_CHECKING:
+    from provenance_feed.leader import LeaderElection
+    from provenance_feed.provenance_graph.observer import ProvenanceGraphObserver
+
+logger = logging.getLogger(__name__)
+
+# Routes whose responses stay open for as long as the client keeps reading.
+STREAMING_PATHS = frozenset({"/api/feed/stream", "/api/export.ndjson"})
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
     settings = settings or get_settings()
-    repo = SQLiteFeedRepository(database_path=settings.database_path)
-    repo.init_schema()
-
-    observer = ProvenanceGraphObserver(
-        enabled=settings.provenance_graph_observe_enabled,
-        observe_url=settings.provenance_graph_observe_url,
-        api_key=settings.provenance_graph_write_api_key,
-        timeout_seconds=settings.provenance_graph_observe_timeout_seconds,
-        queue_size=settings.provenance_graph_observe_queue_size,
+    repo: FeedRepository = SQLiteFeedRepository(
+        database_path=settings.database_path,
+        slow_query_seconds=settings.slow_query_seconds,
+        partition_dir=settings.partition_dir,
     )
+    if settings.snapshot_enabled:
+        repo = SnapshotFeedRepository(
+            backing=repo,
+            database_path=settings.database_path,
+            max_items=settings.snapshot_max_items,
+            poll_seconds=settings.snapshot_poll_seconds,
+        )
+    profiling = settings.profile_token is not None
+    reader = AsyncFeedReader(repo=repo, max_workers=settings.reader_max_workers, profiled=profiling)
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        # Optional convenience for local development only.
+        # Migrations run here rather than in create_app, so merely importing the app (a
+        # tool, a test, `provenance_feed.main`) never rewrites the database.
+        repo.init_schema()
+        election = None
+        periodic = None
+        stop_periodic = threading.Event()
+        if settings.auto_ingest_on_startup or settings.ingest_interval_seconds:
+            # Of the processes sharing the database, only the lease holder ingests; the
+            # others just serve reads.
+            election = leader_election(settings)
+            election.start()
         if settings.auto_ingest_on_startup:
-            # NOTE: This is intentionally simple (startup ingestion). No background
-            # orchestration is introduced in this phase.
-            ingest_once(repo=repo, records=fetch_all_records(), observer=observer)
+            if election.is_leader:
+                app.state.provenance_graph_observer = _run_ingestion(settings=settings, repo=repo)
+            else:
+                logger.info("startup ingestion skipped: another process holds the lease")
+        if settings.ingest_interval_seconds:
+            periodic = threading.Thread(
+                target=_ingest_periodically,
+                kwargs={
+                    "app": app,
+                    "settings": settings,
+                    "repo": repo,
+                    "election": election,
+                    "stop": stop_periodic,
+                },
+                name="ingest-periodic",
+                daemon=True,
+            )
+            periodic.start()
+        elif election is not None:
+            # Startup ingestion only: the lease is left to expire rather than released, so
+            # workers that start a little later do not ingest the same feeds again.
+            election.stop(release=False)
         yield
+        stop_periodic.set()
+        if periodic is not None:
+            periodic.join()
+        if election is not None:
+            election.stop()
+        await app.state.broadcaster.stop()
+        reader.close()
+        repo.close()
 
     app = FastAPI(title="provenance-feed", version="0.1.0", lifespan=lifespan)
 
     app.state.settings = settings
     app.state.repo = repo
-    app.state.provenance_graph_observer = observer
+    app.state.reader = reader
+    app.state.response_cache = ResponseCache(max_entries=settings.response_cache_max_entries)
+    # Started by the first stream subscriber, so processes nobody streams from never poll.
+    app.state.broadcaster = FeedBroadcaster(
+        reader=reader,
+        poll_seconds=settings.stream_poll_seconds,
+        buffer_size=settings.stream_buffer_size,
+    )
+    app.state.ingest_runs = SQLiteIngestRunStore(settings.database_path)
+    app.state.provenance_graph_observer = None
+
+    if profiling:
+        app.add_middleware(
+            ProfileRequests,
+            token=settings.profile_token,
+            out_dir=settings.profile_dir,
+            skip_paths=STREAMING_PATHS,
+        )
 
     origins = [o.strip() for o in settings.cors_allow_origins.split(",") if o.strip()]
     if origins:
@@ -47,14 +130,55 @@ def create_app(settings: Settings | None = None) -> FastAPI:
             CORSMiddleware,
             allow_origins=origins,
             allow_credentials=False,
-            allow_methods=["GET"],
+            allow_methods=["GET", "POST"],
             allow_headers=["*"],
+            expose_headers=[NEXT_CURSOR_HEADER, PROFILE_REPORT_HEADER],
         )
 
     app.include_router(feed_router)
+    app.include_router(changes_router)
+    app.include_router(items_router)
+    app.include_router(ingest_router)
+    app.include_router(export_router)
 
     @app.get("/healthz")
-    def healthz() -> dict:
+    async def healthz() -> dict:
         return {"ok": True}
 
     return app
+
+
+def _ingest_periodically(
+    *,
+    app: FastAPI,
+    settings: Settings,
+    repo: FeedRepository,
+    election: LeaderElection,
+    stop: threading.Event,
+) -> None:
+    # Runs on its own thread. A process that takes the lease over from a dead leader
+    # ingests on its next tick, so at most one interval late.
+    while not stop.wait(settings.ingest_interval_seconds):
+        if not election.is_leader:
+            continue
+        try:
+            app.state.provenance_graph_observer = _run_ingestion(
+                settings=settings, repo=repo, observer=app.state.provenance_graph_observer
+            )
+        except Exception:
+            logger.exception("periodic ingestion failed")
+
+
+def _run_ingestion(
+    *,
+    settings: Settings,
+    repo: FeedRepository,
+    observer: ProvenanceGraphObserver | None = None,
+) -> ProvenanceGraphObserver:
+    # Ingestion-only dependencies (feedparser, the RSS sources, the observer) are imported
+    # here rather than at module level, so read-only API processes never load them.
+    from provenance_feed.ingestion.cycle import make_observer, run_ingestion
+
+    observer = observer or make_observer(settings)
+    run_ingestion(settings=settings, repo=repo, observer=observer, report=logger.info)
+    return observer
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Hashable
+
+try:
+    import brotli
+except ImportError:  # optional dependency: `pip install provenance-feed[brotli]`
+    brotli = None
+
+# Server preference order; brotli only when the optional package is installed.
+SUPPORTED_ENCODINGS: tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Below this, compression overhead outweighs the savings.
+MIN_COMPRESS_BYTES = 512
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+class GzipStream:
+    """Incremental gzip for streamed bodies. Each `compress` call ends with a sync flush,
+    so a client can decode everything sent so far; `finish` writes the trailer."""
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def negotiate_encoding(
+    accept_encoding: str | None, supported: tuple[str, ...] = SUPPORTED_ENCODINGS
+) -> str | None:
+    """Pick the best of `supported` content-codings from an Accept-Encoding header."""
+
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+
+    best: str | None = None
+    best_q = 0.0
+    for encoding in supported:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CachedBody:
+    """An encoded response body plus its compressed variants, each built at most once."""
+
+    def __init__(self, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.body = body
+        self.headers = headers or {}
+        self._variants: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str | None) -> tuple[bytes, str | None]:
+        """Return (bytes, content-encoding) for the negotiated encoding."""
+
+        if encoding is None or len(self.body) < MIN_COMPRESS_BYTES:
+            return self.body, None
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is None:
+                    variant = compress(self.body, encoding)
+                    self._variants[encoding] = variant
+        return variant, encoding
+
+
+class ResponseCache:
+    """Small LRU of `CachedBody` keyed by (data generation, request key).
+
+    Entries from older generations are dropped as soon as a newer generation is seen, so
+    each distinct response is encoded and compressed once per ingest, not per request.
+    """
+
+    def __init__(self, *, max_entries: int = 256) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Hashable, CachedBody] = OrderedDict()
+        self._generation: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self, generation: int, key: Hashable) -> CachedBody | None:
+        with self._lock:
+            if generation != self._generation:
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, generation: int, key: Hashable, entry: CachedBody) -> None:
+        with self._lock:
+            if self._generation is not None and generation < self._generation:
+                return
+            if generation != self._generation:
+                self._entries.clear()
+                self._generation = generation
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
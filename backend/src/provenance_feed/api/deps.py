@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from fastapi import Request
 
+from provenance_feed.api.compression import ResponseCache
+from provenance_feed.api.stream import FeedBroadcaster
 from provenance_feed.config import Settings
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+from provenance_feed.persistence.ingest_runs import SQLiteIngestRunStore
 from provenance_feed.persistence.repository import FeedRepository
 
 
@@ -12,3 +16,20 @@ def get_settings(request: Request) -> Settings:
 
 def get_repo(request: Request) -> FeedRepository:
     return request.app.state.repo
+
+
+# Async so FastAPI resolves it on the event loop rather than in the threadpool.
+async def get_reader(request: Request) -> AsyncFeedReader:
+    return request.app.state.reader
+
+
+async def get_response_cache(request: Request) -> ResponseCache:
+    return request.app.state.response_cache
+
+
+async def get_broadcaster(request: Request) -> FeedBroadcaster:
+    return request.app.state.broadcaster
+
+
+def get_ingest_runs(request: Request) -> SQLiteIngestRunStore:
+    return request.app.state.ingest_runs
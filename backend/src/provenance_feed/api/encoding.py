@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from pydantic import TypeAdapter
+
+from provenance_feed.api.schemas import FeedItemOut
+from provenance_feed.domain.models import FeedItem
+
+_FEED_PAGE = TypeAdapter(list[FeedItemOut])
+_FEED_ITEM = TypeAdapter(FeedItemOut)
+
+
+def encode_feed_page(items: Sequence[FeedItem]) -> bytes:
+    """Serialise a feed page exactly as `/api/feed` returns it.
+
+    Shared by the route and the static export so both produce identical bytes. This is
+    where internal `FeedItem` records become validated API models.
+    """
+
+    return _FEED_PAGE.dump_json(_FEED_PAGE.validate_python(items, from_attributes=True))
+
+
+def encode_feed_item(item: FeedItem) -> bytes:
+    """Serialise one item as it appears in a `/api/feed` page."""
+
+    return _FEED_ITEM.dump_json(_FEED_ITEM.validate_python(item, from_attributes=True))
+
+
+def encode_ndjson(items: Sequence[FeedItem]) -> bytes:
+    """Serialise items as newline-delimited JSON, one `encode_feed_item` per line."""
+
+    return b"".join(
+        _FEED_ITEM.dump_json(out) + b"\n"
+        for out in _FEED_PAGE.validate_python(items, from_attributes=True)
+    )
@@ -0,0 +1,86 @@
+"""Per-request profiling, enabled by setting `BACKEND_PROFILE_TOKEN`.
+
+A request carrying `X-Profile: <token>` is run under cProfile (including its reader-pool
+queries) and the report is written to `BACKEND_PROFILE_DIR`; the response names the file
+in `X-Profile-Report`. Only one request is profiled at a time, since cProfile on the
+event-loop thread also sees whatever else runs on the loop meanwhile; a second request
+asking for a profile while one is running is served unprofiled. So are streaming routes
+(`skip_paths`): they would hold that one slot, with cProfile running on the loop, for as
+long as the client stays connected.
+
+The middleware is only installed when a token is configured.
+"""
+
+from __future__ import annotations
+
+import hmac
+import logging
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from provenance_feed.profiling import StageProfiler, active_stage
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_REPORT_HEADER = "X-Profile-Report"
+
+
+class ProfileRequests:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        token: str,
+        out_dir: Path,
+        skip_paths: frozenset[str] = frozenset(),
+    ) -> None:
+        self.app = app
+        self._token = token.encode()
+        self._out_dir = out_dir
+        self._skip_paths = skip_paths
+        self._busy = False
+
+    def _requested(self, scope: Scope) -> bool:
+        header = PROFILE_HEADER.lower().encode()
+        for name, value in scope["headers"]:
+            if name == header:
+                return hmac.compare_digest(value, self._token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self._busy
+            or scope["path"] in self._skip_paths
+            or not self._requested(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        stamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%S")
+        prefix = f"{stamp}-{uuid.uuid4().hex[:8]}-"
+        report = f"{prefix}request.pstats"
+
+        async def send_with_report(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_REPORT_HEADER.lower().encode(), report.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = StageProfiler(self._out_dir)
+        token = active_stage.set((profiler, "request"))
+        try:
+            with profiler.stage("request"):
+                await self.app(scope, receive, send_with_report)
+        finally:
+            active_stage.reset(token)
+            self._busy = False
+            for path in await run_in_threadpool(profiler.write, prefix=prefix):
+                logger.info("profiled %s %s: %s", scope["method"], scope["path"], path)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from provenance_feed.api.deps import get_reader
+from provenance_feed.api.schemas import ChangesOut, FeedItemOut
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+
+router = APIRouter(prefix="/api", tags=["changes"])
+
+
+@router.get("/changes", response_model=ChangesOut)
+async def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    reader: AsyncFeedReader = Depends(get_reader),
+) -> ChangesOut:
+    """Items inserted or changed after change sequence `since`, for incremental sync.
+
+    Start from `since=0` and keep passing back `next_since`; a page shorter than `limit`
+    means the caller is up to date. An item changed several times since `since` is
+    returned once, in its latest state. Deleted (pruned) items are not reported."""
+
+    changes = await reader.list_changes(since=since, limit=limit)
+    return ChangesOut(
+        items=[FeedItemOut.model_validate(item, from_attributes=True) for _, item in changes],
+        next_since=changes[-1][0] if changes else since,
+    )
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from provenance_feed.api.compression import GzipStream, negotiate_encoding
+from provenance_feed.api.deps import get_reader, get_settings
+from provenance_feed.config import Settings
+from provenance_feed.export.ndjson import ndjson_chunks
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+from provenance_feed.persistence.repository import FeedCursor
+
+router = APIRouter(prefix="/api", tags=["export"])
+
+
+async def _export_stream(
+    reader: AsyncFeedReader, *, gzip_stream: GzipStream | None, **filters
+) -> AsyncIterator[bytes]:
+    # One chunk in flight at a time: the next is only read once the server has taken the
+    # previous one, so a slow client holds back the export instead of buffering it.
+    async for body in reader.iterate(ndjson_chunks, **filters):
+        yield await run_in_threadpool(gzip_stream.compress, body) if gzip_stream else body
+    if gzip_stream:
+        yield gzip_stream.finish()
+
+
+@router.get("/export.ndjson", response_class=StreamingResponse)
+async def export_ndjson(
+    request: Request,
+    source: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: str | None = None,
+    reader: AsyncFeedReader = Depends(get_reader),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """Every stored item, newest first, as newline-delimited JSON (one `FeedItemOut` per
+    line), optionally for one source and published in `[since, until)`. Rows are read and
+    sent in chunks, so memory use does not grow with the export.
+
+    To resume an interrupted export, repeat the request with `after` set to the
+    `content_id` of the last complete line received. gzip is applied when accepted."""
+
+    start = None
+    if after:
+        item = (await reader.get_many([after])).get(after)
+        if item is None:
+            raise HTTPException(status_code=400, detail=f"unknown item: {after}")
+        start = FeedCursor.after(item)
+
+    content_encoding = negotiate_encoding(
+        request.headers.get("accept-encoding"), supported=("gzip",)
+    )
+    headers = {"Vary": "Accept-Encoding", "X-Accel-Buffering": "no"}
+    if content_encoding is not None:
+        headers["Content-Encoding"] = content_encoding
+    return StreamingResponse(
+        _export_stream(
+            reader,
+            source=source,
+            since=since,
+            until=until,
+            after=start,
+            chunk_size=settings.export_chunk_size,
+            gzip_stream=GzipStream() if content_encoding else None,
+        ),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
@@ -1,18 +1,89 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
-from provenance_feed.api.deps import get_repo
+from provenance_feed.api.compression import CachedBody, ResponseCache, negotiate_encoding
+from provenance_feed.api.deps import get_broadcaster, get_reader, get_response_cache, get_settings
+from provenance_feed.api.encoding import encode_feed_page
 from provenance_feed.api.schemas import FeedItemOut
-from provenance_feed.persistence.repository import FeedRepository
+from provenance_feed.api.stream import FeedBroadcaster, sse_stream
+from provenance_feed.config import Settings
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+from provenance_feed.persistence.repository import FeedCursor
 
 router = APIRouter(prefix="/api", tags=["feed"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/feed", response_model=list[FeedItemOut])
-def list_feed(
+async def list_feed(
+    request: Request,
     limit: int = 50,
-    repo: FeedRepository = Depends(get_repo),
-) -> list[FeedItemOut]:
-    items = repo.list_latest(limit=limit)
-    return [FeedItemOut.model_validate(i.model_dump()) for i in items]
+    cursor: str | None = None,
+    source: str | None = None,
+    collapse: bool = False,
+    reader: AsyncFeedReader = Depends(get_reader),
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    """Latest items first, optionally for one source. With `collapse=true`, only the
+    newest item of each near-duplicate cluster (the same story from several sources) is
+    returned. Pass the `X-Next-Cursor` response
+    header back as `cursor` to fetch the following page; it is absent on the last page.
+
+    Bodies are cached per data generation and compressed (gzip, or brotli if installed)
+    at most once per generation, as negotiated from `Accept-Encoding`."""
+
+    try:
+        before = FeedCursor.decode(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    generation = await reader.generation()
+    key = (limit, cursor, source, collapse)
+    entry = cache.get(generation, key)
+    if entry is None:
+        items = await reader.list_latest(
+            limit=limit, before=before, source=source, collapse=collapse
+        )
+        headers = {}
+        if items and len(items) == limit:
+            headers[NEXT_CURSOR_HEADER] = FeedCursor.after(items[-1]).encode()
+        entry = CachedBody(encode_feed_page(items), headers)
+        cache.put(generation, key, entry)
+
+    body, content_encoding = entry.encoded(
+        negotiate_encoding(request.headers.get("accept-encoding"))
+    )
+    response = Response(content=body, media_type="application/json", headers=entry.headers)
+    response.headers["Vary"] = "Accept-Encoding"
+    if content_encoding is not None:
+        response.headers["Content-Encoding"] = content_encoding
+    return response
+
+
+@router.get("/feed/stream", response_class=StreamingResponse)
+async def stream_feed(
+    last_event_id: str | None = Header(None),
+    broadcaster: FeedBroadcaster = Depends(get_broadcaster),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """Server-Sent Events: one `item` event (a `FeedItemOut`) per newly inserted item,
+    as soon as the ingest that inserted it has committed. Event ids are insert sequence
+    numbers; reconnecting with `Last-Event-ID` resumes after that item, otherwise the
+    stream starts with the next insert. Comment lines are sent as heartbeats while idle."""
+
+    await broadcaster.start()
+    if last_event_id is None or not last_event_id.strip():
+        after = broadcaster.head
+    else:
+        try:
+            after = int(last_event_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="invalid Last-Event-ID") from e
+    return StreamingResponse(
+        sse_stream(broadcaster, after=after, heartbeat_seconds=settings.stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from provenance_feed.api.deps import get_ingest_runs, get_settings
+from provenance_feed.api.schemas import (
+    IngestRunOut,
+    IngestRunSourceOut,
+    IngestRunsOut,
+    MetricComparisonOut,
+)
+from provenance_feed.config import Settings
+from provenance_feed.persistence.ingest_runs import (
+    SOURCE_TOTALS,
+    IngestRun,
+    SQLiteIngestRunStore,
+    compare_to_baseline,
+)
+
+router = APIRouter(prefix="/api/ingest", tags=["ingest"])
+
+
+def _run_out(run: IngestRun, previous: list[IngestRun], settings: Settings) -> IngestRunOut:
+    comparisons = compare_to_baseline(
+        run,
+        previous[: settings.ingest_baseline_runs],
+        threshold=settings.ingest_regression_threshold,
+    )
+    return IngestRunOut(
+        run_id=run.run_id,
+        started_at=run.started_at,
+        finished_at=run.finished_at,
+        seconds=run.seconds,
+        errors=run.errors,
+        persist_seconds=run.persist_seconds,
+        totals={name: run.total(name) for name in SOURCE_TOTALS},
+        sources=[IngestRunSourceOut.model_validate(s, from_attributes=True) for s in run.sources],
+        baseline=[MetricComparisonOut.model_validate(c, from_attributes=True) for c in comparisons],
+    )
+
+
+# Sync: FastAPI runs it on its threadpool (ledger reads are rare and small).
+@router.get("/runs", response_model=IngestRunsOut)
+def list_ingest_runs(
+    limit: int = Query(20, ge=1, le=200),
+    store: SQLiteIngestRunStore = Depends(get_ingest_runs),
+    settings: Settings = Depends(get_settings),
+) -> IngestRunsOut:
+    """Recorded ingestion CLI runs, newest first, each compared with the median of the
+    runs before it. A metric is flagged `regressed` when it is more than
+    `BACKEND_INGEST_REGRESSION_THRESHOLD` worse than that baseline."""
+
+    runs = store.list_runs(limit=limit + settings.ingest_baseline_runs)
+    out = [_run_out(run, runs[i + 1 :], settings) for i, run in enumerate(runs[:limit])]
+    return IngestRunsOut(
+        runs=out, regressed=bool(out) and any(c.regressed for c in out[0].baseline)
+    )
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from provenance_feed.api.deps import get_reader
+from provenance_feed.api.schemas import BatchGetIn, BatchGetOut, FeedItemOut
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+
+router = APIRouter(prefix="/api", tags=["items"])
+
+
+@router.post("/items:batchGet", response_model=BatchGetOut)
+async def batch_get_items(
+    body: BatchGetIn,
+    reader: AsyncFeedReader = Depends(get_reader),
+) -> BatchGetOut:
+    """Fetch items by `content_id` (at most 500 per request) in a single query.
+
+    Items come back in request order (repeated ids once); ids with no stored item, or
+    that are not valid content ids, are listed in `missing`."""
+
+    requested = list(dict.fromkeys(body.content_ids))
+    found = await reader.get_many(requested)
+    return BatchGetOut(
+        items=[
+            FeedItemOut.model_validate(found[content_id], from_attributes=True)
+            for content_id in requested
+            if content_id in found
+        ],
+        missing=[content_id for content_id in requested if content_id not in found],
+    )
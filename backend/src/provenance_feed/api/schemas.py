@@ -15,3 +15,72 @@ class FeedItemOut(BaseModel):
     image_url: str | None = None
     image_source: str | None = None
     image_last_checked: datetime | None = None
+
+    cluster_id: str | None = Field(
+        None, description="Near-duplicate cluster; items of the same story share it"
+    )
+
+
+class ChangesOut(BaseModel):
+    items: list[FeedItemOut] = Field(
+        ..., description="Items inserted or changed after `since`, oldest change first"
+    )
+    next_since: int = Field(
+        ..., description="Pass back as `since` for the following changes; unchanged if none"
+    )
+
+
+# Largest `content_ids` list accepted by /api/items:batchGet.
+MAX_BATCH_GET_IDS = 500
+
+
+class BatchGetIn(BaseModel):
+    content_ids: list[str] = Field(..., max_length=MAX_BATCH_GET_IDS)
+
+
+class BatchGetOut(BaseModel):
+    items: list[FeedItemOut] = Field(..., description="Found items, in request order")
+    missing: list[str] = Field(..., description="Requested ids with no stored item")
+
+
+class IngestRunSourceOut(BaseModel):
+    source_id: str
+    fetch_seconds: float
+    parse_seconds: float
+    enrich_seconds: float
+    bytes: int = Field(..., description="Bytes on the wire for the feed and its article pages")
+    entries: int
+    kept: int = Field(..., description="Valid, de-duplicated entries")
+    skipped: int = Field(..., description="Entries missing a title, link or timestamp")
+    written: int = Field(..., description="Kept entries handed on for persistence")
+    inserted: int
+    updated: int
+    unchanged: int = Field(..., description="Kept entries already stored as they were")
+    error: str | None = None
+
+
+class MetricComparisonOut(BaseModel):
+    metric: str
+    latest: float
+    baseline: float = Field(..., description="Median over the previous runs")
+    regression: float = Field(..., description="Relative change; positive is worse")
+    regressed: bool
+
+
+class IngestRunOut(BaseModel):
+    run_id: int
+    started_at: datetime
+    finished_at: datetime
+    seconds: float
+    errors: int
+    persist_seconds: float
+    totals: dict[str, float] = Field(..., description="Per-source fields summed over sources")
+    sources: list[IngestRunSourceOut]
+    baseline: list[MetricComparisonOut] = Field(
+        ..., description="Throughput against the runs before this one; empty without enough"
+    )
+
+
+class IngestRunsOut(BaseModel):
+    runs: list[IngestRunOut] = Field(..., description="Newest first")
+    regressed: bool = Field(..., description="Whether the newest run regressed")
@@ -0,0 +1,160 @@
+"""Live feed stream (Server-Sent Events).
+
+One `FeedBroadcaster` per process watches for newly inserted items and fans them out to
+every open stream. It polls the repository's data generation (one cheap read per
+interval, however many clients are connected); when it changes, the new items are
+fetched once, encoded once, and kept in a bounded in-memory buffer. Idle connections
+cost only a wait on a shared event.
+
+Event ids are insert sequence numbers, so a client reconnecting with `Last-Event-ID`
+resumes where it left off: from the buffer if it is recent enough, otherwise from the
+database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+
+from provenance_feed.api.encoding import encode_feed_item
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = b": heartbeat\n\n"
+
+# Event = (insert sequence, encoded SSE message).
+Event = tuple[int, bytes]
+
+
+def format_event(seq: int, item: FeedItem) -> bytes:
+    return b"id: %d\nevent: item\ndata: %s\n\n" % (seq, encode_feed_item(item))
+
+
+class FeedBroadcaster:
+    """Fans newly inserted items out to any number of stream subscribers."""
+
+    def __init__(
+        self,
+        *,
+        reader: AsyncFeedReader,
+        poll_seconds: float = 1.0,
+        buffer_size: int = 1000,
+        batch_size: int = 200,
+    ) -> None:
+        self._reader = reader
+        self._poll_seconds = poll_seconds
+        self._batch_size = max(1, batch_size)
+        self._buffer: deque[Event] = deque(maxlen=max(1, buffer_size))
+        # The buffer holds every event with floor < seq <= head.
+        self._floor = 0
+        self._head = 0
+        self._generation: int | None = None
+        # Replaced (after being set) on every publish; waiters grab the current one.
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def head(self) -> int:
+        """Insert sequence of the newest item published so far."""
+
+        return self._head
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._task is not None:
+                return
+            self._generation = await self._reader.generation()
+            self._head = self._floor = await self._reader.last_inserted()
+            self._task = asyncio.create_task(self._run(), name="feed-broadcaster")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_seconds)
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning("feed stream poll failed (%s)", type(e).__name__)
+
+    async def poll(self) -> int:
+        """Publish items inserted since the last poll. Returns how many."""
+
+        generation = await self._reader.generation()
+        if generation == self._generation:
+            return 0
+        self._generation = generation
+        published = 0
+        while rows := await self._reader.inserted_since(after=self._head, limit=self._batch_size):
+            for seq, item in rows:
+                if len(self._buffer) == self._buffer.maxlen:
+                    self._floor = self._buffer[0][0]
+                self._buffer.append((seq, format_event(seq, item)))
+            self._head = rows[-1][0]
+            published += len(rows)
+        if published:
+            changed, self._changed = self._changed, asyncio.Event()
+            changed.set()
+        return published
+
+    async def events_after(self, seq: int) -> list[Event]:
+        """Events with sequence > `seq`, up to one batch."""
+
+        if seq < self._floor:
+            # Too far behind for the buffer: catch up from the database first.
+            rows = await self._reader.inserted_since(after=seq, limit=self._batch_size)
+            if rows:
+                return [(s, format_event(s, item)) for s, item in rows]
+            seq = self._floor
+        if seq >= self._head:
+            return []
+        buffer = self._buffer
+        start = bisect.bisect_right(buffer, seq, key=lambda e: e[0])
+        return [buffer[i] for i in range(start, min(len(buffer), start + self._batch_size))]
+
+    async def next_events(self, seq: int, *, timeout: float) -> list[Event]:
+        """Events after `seq`, waiting up to `timeout` seconds for some to be published.
+        An empty list means the wait timed out."""
+
+        changed = self._changed
+        events = await self.events_after(seq)
+        if events:
+            return events
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(timeout):
+                await changed.wait()
+            return await self.events_after(seq)
+        return []
+
+
+async def sse_stream(
+    broadcaster: FeedBroadcaster,
+    *,
+    after: int,
+    heartbeat_seconds: float,
+    retry_ms: int = 5000,
+) -> AsyncIterator[bytes]:
+    """SSE body: items inserted after `after`, then live ones, with heartbeat comments
+    while idle."""
+
+    await broadcaster.start()
+    yield b"retry: %d\n\n" % retry_ms
+    while True:
+        events = await broadcaster.next_events(after, timeout=heartbeat_seconds)
+        if not events:
+            yield HEARTBEAT
+            continue
+        yield b"".join(message for _, message in events)
+        after = events[-1][0]
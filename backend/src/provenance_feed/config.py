@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from provenance_feed.persistence.retention import RetentionPolicy
+
+if TYPE_CHECKING:
+    from provenance_feed.ingestion.circuit_breaker import CircuitBreakers
+    from provenance_feed.ingestion.http_client import HTTPClient
+    from provenance_feed.ingestion.parse_pool import ParsePool
+    from provenance_feed.ingestion.precheck import KnownItemCheck
+    from provenance_feed.leader import LeaderElection
+    from provenance_feed.persistence.repository import FeedRepository
+
 
 class Settings(BaseSettings):
     """Backend configuration.
@@ -22,6 +34,92 @@ class Settings(BaseSettings):
     auto_ingest_on_startup: bool = True
     cors_allow_origins: str = "http://localhost:5173,http://127.0.0.1:5173"
 
+    # Feed reads run on a dedicated thread pool of this size (not Starlette's threadpool).
+    reader_max_workers: int = 4
+    # Encoded (and compressed) /api/feed responses kept per data generation.
+    response_cache_max_entries: int = 256
+    # Live stream (/api/feed/stream): how often new inserts are checked for, the idle
+    # heartbeat interval, and how many recent events are kept in memory for resuming.
+    stream_poll_seconds: float = 1.0
+    stream_heartbeat_seconds: float = 15.0
+    stream_buffer_size: int = 1000
+    # Bulk export (/api/export.ndjson and its CLI): rows read and encoded per chunk.
+    export_chunk_size: int = 1000
+    # Opt-in profiling: with a token set, a request carrying `X-Profile: <token>` is
+    # profiled and its report written under `profile_dir`. SQLite statements slower than
+    # `slow_query_seconds` are logged (unset = off).
+    profile_token: str | None = None
+    profile_dir: Path = Path("backend/data/profiles")
+    slow_query_seconds: float | None = None
+
+    # Optional in-memory snapshot of the newest items for serving reads. Changes made by
+    # other processes (e.g. the ingestion CLI) are picked up by polling the database.
+    snapshot_enabled: bool = False
+    snapshot_max_items: int = 5000
+    snapshot_poll_seconds: float = 1.0
+
+    # Of all processes sharing the database that would ingest (API workers and replicas,
+    # the CLI), only the holder of the ingestion lease does; it renews the lease every
+    # heartbeat, and another process takes over once it expires. With an interval set,
+    # the API leader also ingests periodically (unset = at startup only).
+    ingest_interval_seconds: float | None = None
+    ingest_lease_ttl_seconds: float = 30.0
+    ingest_lease_heartbeat_seconds: float = 10.0
+
+    # Ingestion pipeline: sources fetched concurrently, records queued (bounded) for the
+    # writer, and written per SQLite transaction in batches.
+    ingest_fetch_concurrency: int = 4
+    ingest_queue_size: int = 256
+    ingest_batch_size: int = 200
+    # Skip feed entries already stored unchanged (one batched lookup per feed); their
+    # images are still re-resolved once the stored check is older than this.
+    ingest_precheck_enabled: bool = True
+    ingest_image_recheck_seconds: float = 86400.0
+    # Parse feeds in this many worker processes instead of on the fetch threads (0 = off).
+    # A parse running past the timeout is killed; workers are capped at this much address
+    # space (unset = uncapped) and replaced after this many parses.
+    ingest_parse_processes: int = 0
+    ingest_parse_timeout_seconds: float = 30.0
+    ingest_parse_memory_mb: int | None = 512
+    ingest_parse_max_tasks_per_child: int = 100
+    # Run ledger: each CLI run is compared with the median of this many previous runs, and
+    # a throughput metric more than this much (relative) worse is flagged as a regression.
+    ingest_baseline_runs: int = 10
+    ingest_regression_threshold: float = 0.25
+
+    # Optional static export of the first feed pages after each ingestion, for serving
+    # anonymous reads from a CDN or nginx. Disabled when no directory is set.
+    static_export_dir: Path | None = None
+    static_export_pages: int = 3
+    static_export_page_size: int = 50
+
+    # Per-host circuit breakers for feed and page fetches: a host is skipped after this
+    # many consecutive failures, for a cool-down that doubles on each further trip.
+    breaker_failure_threshold: int = 3
+    breaker_cooldown_seconds: float = 300.0
+    breaker_max_cooldown_seconds: float = 21600.0
+
+    # Shared HTTP client for feed/page fetches: idle keep-alive connections kept per host,
+    # how long they may sit idle before being dropped, and how long DNS results are reused.
+    # Responses are requested compressed and abandoned past `http_max_body_bytes` decoded.
+    http_timeout_seconds: float = 10.0
+    http_max_body_bytes: int = 16 * 1024 * 1024
+    http_max_idle_per_host: int = 4
+    http_idle_timeout_seconds: float = 30.0
+    http_dns_ttl_seconds: float = 300.0
+
+    # Retention: pruning runs after each ingestion. Unset limits are not applied.
+    retention_max_age_days: float | None = None
+    retention_max_items_per_source: int | None = None
+    retention_max_items: int | None = None
+    retention_batch_size: int = 500
+
+    # Optional time-partitioned storage for long history: after each ingestion, items
+    # published before the current month and the `partition_hot_months` before it are moved
+    # into one SQLite file per month under this directory (unset = all in one table).
+    partition_dir: Path | None = None
+    partition_hot_months: int = 3
+
     # Optional: best-effort observation hook into provenance-graph.
     # The feed must remain sovereign: observation failures are non-fatal.
     provenance_graph_observe_enabled: bool = False
@@ -31,5 +129,82 @@ class Settings(BaseSettings):
     provenance_graph_observe_queue_size: int = 200
 
 
+def retention_policy(settings: Settings) -> RetentionPolicy:
+    return RetentionPolicy(
+        max_age=(
+            timedelta(days=settings.retention_max_age_days)
+            if settings.retention_max_age_days is not None
+            else None
+        ),
+        max_items_per_source=settings.retention_max_items_per_source,
+        max_items=settings.retention_max_items,
+        batch_size=settings.retention_batch_size,
+    )
+
+
+def circuit_breakers(settings: Settings) -> CircuitBreakers:
+    """Per-host breakers restored from the feed database (imported lazily: ingestion only)."""
+
+    from provenance_feed.ingestion.circuit_breaker import CircuitBreakers
+    from provenance_feed.persistence.breakers import SQLiteBreakerStore
+
+    store = SQLiteBreakerStore(settings.database_path)
+    store.init_schema()
+    return CircuitBreakers.load(
+        store,
+        failure_threshold=settings.breaker_failure_threshold,
+        cooldown=timedelta(seconds=settings.breaker_cooldown_seconds),
+        max_cooldown=timedelta(seconds=settings.breaker_max_cooldown_seconds),
+    )
+
+
+def http_client(settings: Settings) -> HTTPClient:
+    from provenance_feed.ingestion.http_client import HTTPClient
+
+    return HTTPClient(
+        max_idle_per_host=settings.http_max_idle_per_host,
+        timeout_seconds=settings.http_timeout_seconds,
+        idle_timeout_seconds=settings.http_idle_timeout_seconds,
+        dns_ttl_seconds=settings.http_dns_ttl_seconds,
+        max_body_bytes=settings.http_max_body_bytes,
+    )
+
+
+def known_item_check(settings: Settings, repo: FeedRepository) -> KnownItemCheck | None:
+    from provenance_feed.ingestion.precheck import KnownItemCheck
+
+    if not settings.ingest_precheck_enabled:
+        return None
+    return KnownItemCheck(
+        repo, image_recheck_after=timedelta(seconds=settings.ingest_image_recheck_seconds)
+    )
+
+
+def parse_pool(settings: Settings) -> ParsePool | None:
+    from provenance_feed.ingestion.parse_pool import ParsePool
+
+    if settings.ingest_parse_processes <= 0:
+        return None
+    return ParsePool(
+        processes=settings.ingest_parse_processes,
+        timeout_seconds=settings.ingest_parse_timeout_seconds,
+        memory_limit_mb=settings.ingest_parse_memory_mb,
+        max_tasks_per_child=settings.ingest_parse_max_tasks_per_child,
+    )
+
+
+def leader_election(settings: Settings) -> LeaderElection:
+    from provenance_feed.leader import LeaderElection
+    from provenance_feed.persistence.leases import SQLiteLeaseStore
+
+    store = SQLiteLeaseStore(settings.database_path)
+    store.init_schema()
+    return LeaderElection(
+        store,
+        ttl_seconds=settings.ingest_lease_ttl_seconds,
+        heartbeat_seconds=settings.ingest_lease_heartbeat_seconds,
+    )
+
+
 def get_settings() -> Settings:
     return Settings()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import hashlib
+from datetime import datetime
+
 
 def make_content_id(*, source: str, source_item_id: str) -> str:
     """Create a stable, opaque identifier for content.
@@ -13,3 +16,15 @@ def make_content_id(*, source: str, source_item_id: str) -> str:
     if not source_norm or not source_item_norm:
         raise ValueError("source and source_item_id must be non-empty")
     return f"{source_norm}:{source_item_norm}"
+
+
+def make_fingerprint(
+    *, title: str, source_name: str, source_url: str, published_at: datetime
+) -> bytes:
+    """Digest of the stored fields of an item, used to tell whether an upstream entry changed.
+
+    `published_at` must be timezone-aware; it is compared as an instant.
+    """
+
+    fields = (title, source_name, source_url, published_at.timestamp().hex())
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8"), digest_size=16).digest()
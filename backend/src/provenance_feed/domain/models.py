@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
-from pydantic import BaseModel, Field
 
+@dataclass(frozen=True, slots=True)
+class FeedItem:
+    """Canonical internal model for an item in the feed.
 
-class FeedItem(BaseModel):
-    """Canonical internal model for an item in the feed."""
+    A plain immutable record: validation and serialisation happen at the API boundary
+    (`provenance_feed.api.schemas`), not on every item moving through ingestion.
+    """
 
-    content_id: str = Field(..., description="Stable identifier used for provenance lookups")
+    # Stable identifier used for provenance lookups.
+    content_id: str
     title: str
     source_name: str
     source_url: str
@@ -19,6 +24,9 @@ class FeedItem(BaseModel):
     image_source: str | None = None  # e.g. "rss", "page_meta", "none"
     image_last_checked: datetime | None = None
 
+    # Near-duplicate cluster (the same story from several sources); assigned on persist.
+    cluster_id: str | None = None
+
     @staticmethod
     def ensure_utc(dt: datetime) -> datetime:
         if dt.tzinfo is None:
@@ -0,0 +1,89 @@
+"""Near-duplicate title signatures (MinHash + LSH banding).
+
+Pure functions only; storage and lookup live in the persistence layer. Clustering is a
+presentation aid (collapsing the same story from several outlets) and carries no trust
+or provenance meaning.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+import unicodedata
+
+NUM_HASHES = 16
+BANDS = 8
+ROWS_PER_BAND = NUM_HASHES // BANDS
+
+# Estimated Jaccard similarity of title token sets at or above which two titles are
+# treated as the same story.
+SIMILARITY_THRESHOLD = 0.6
+
+# Titles with fewer distinct tokens than this are too short to compare reliably.
+MIN_TOKENS = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE = struct.Struct(f"<{NUM_HASHES}I")
+
+# Fixed (a, b) pairs for the universal hash family; changing them invalidates stored data.
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest()) | 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest()),
+    )
+    for i in range(NUM_HASHES)
+]
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or says that the to "
+    "was were will with".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def title_tokens(title: str) -> frozenset[str]:
+    """Normalised token set: case/accents folded, punctuation and stopwords dropped."""
+
+    folded = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii")
+    return frozenset(t for t in _TOKEN_RE.findall(folded.lower()) if t not in _STOPWORDS)
+
+
+def title_signature(title: str) -> bytes | None:
+    """MinHash signature of a title, or None if the title is too short to compare."""
+
+    tokens = title_tokens(title)
+    if len(tokens) < MIN_TOKENS:
+        return None
+    hashes = [
+        int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest()) for t in tokens
+    ]
+    mins = [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in _PERMUTATIONS
+    ]
+    return _SIGNATURE.pack(*mins)
+
+
+def band_keys(signature: bytes) -> list[int]:
+    """LSH band keys (signed 64-bit, SQLite INTEGER-safe) for a signature.
+
+    Two signatures that agree on every row of at least one band share a key, which is
+    how candidates are found without comparing against every stored title.
+    """
+
+    width = ROWS_PER_BAND * 4
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * width : (band + 1) * width]
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, signed=True))
+    return keys
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the token sets behind two signatures."""
+
+    left = _SIGNATURE.unpack(a)
+    right = _SIGNATURE.unpack(b)
+    return sum(x == y for x, y in zip(left, right, strict=True)) / NUM_HASHES
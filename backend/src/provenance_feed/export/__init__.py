@@ -0,0 +1 @@
+"""Exports of feed data for consumers outside the API process."""
@@ -0,0 +1,199 @@
+"""Bulk export of feed items as newline-delimited JSON.
+
+Every stored item (including archived month partitions), newest first, one
+`/api/feed`-shaped JSON object per line, optionally for one source and a `published_at`
+range. Rows are read in keyset-paginated chunks of `BACKEND_EXPORT_CHUNK_SIZE`, each a
+short query of its own, so memory stays flat however many rows there are and no read
+transaction is held open against ingestion for the length of the export.
+
+An interrupted export to a file is resumed with `--append` (and the same filters): the
+file is cut back to its last complete line and the export continues after that item.
+Gzipped output is written as one gzip member per chunk, so the cut is made at the end of
+the last complete member and the file stays a valid (multi-member) gzip file:
+
+    python -m provenance_feed.export.ndjson -o feed.ndjson.gz --gzip
+    python -m provenance_feed.export.ndjson -o feed.ndjson.gz --gzip --append
+
+Elsewhere, `--after ID` starts after the item with `content_id` ID.
+
+The same stream is served by `GET /api/export.ndjson`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+from provenance_feed.api.encoding import encode_ndjson
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.repository import FeedCursor, FeedRepository
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_SCAN_BLOCK = 1 << 16
+
+
+def export_chunks(
+    repo: FeedRepository,
+    *,
+    source: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: FeedCursor | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[list[FeedItem]]:
+    """Items in feed order, `chunk_size` at a time, starting after `after`."""
+
+    before = after
+    while True:
+        items = repo.list_latest(
+            limit=chunk_size, before=before, source=source, since=since, until=until
+        )
+        if items:
+            yield items
+        if len(items) < chunk_size:
+            return
+        before = FeedCursor.after(items[-1])
+
+
+def ndjson_chunks(
+    repo: FeedRepository,
+    *,
+    source: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: FeedCursor | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[bytes]:
+    """`export_chunks`, each encoded as NDJSON lines: the export as both the CLI and
+    `GET /api/export.ndjson` write it."""
+
+    for items in export_chunks(
+        repo, source=source, since=since, until=until, after=after, chunk_size=chunk_size
+    ):
+        yield encode_ndjson(items)
+
+
+def _complete_prefix(path: Path, *, gzipped: bool) -> tuple[int, bytes | None]:
+    """How many bytes at the start of the export file `path` hold only complete lines (for
+    a gzipped file, complete gzip members), and the last of those lines."""
+
+    with path.open("rb") as f:
+        if not gzipped:
+            # Read back from the end until the last two line ends are in hand.
+            pos = f.seek(0, os.SEEK_END)
+            tail = b""
+            while pos and tail.count(b"\n") < 2:
+                step = min(_SCAN_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+            cut = tail.rfind(b"\n")
+            if cut < 0:
+                return 0, None
+            return pos + cut + 1, tail[:cut].rsplit(b"\n", 1)[-1]
+
+        end = consumed = 0
+        last_line = line = None
+        rest = b""
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            while data := f.read(_SCAN_BLOCK):
+                while data:
+                    *lines, rest = (rest + decoder.decompress(data)).split(b"\n")
+                    if lines:
+                        line = lines[-1]
+                    if not decoder.eof:
+                        consumed += len(data)
+                        break
+                    consumed += len(data) - len(decoder.unused_data)
+                    end, last_line = consumed, line
+                    data = decoder.unused_data
+                    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    line, rest = None, b""
+        except zlib.error:
+            # Garbage after the last complete member is cut off with the rest.
+            pass
+        return end, last_line
+
+
+def _resume_point(parser: argparse.ArgumentParser, args: argparse.Namespace) -> str | None:
+    # Cut an interrupted export back to its last complete line; returns that item's id.
+    if args.after is not None:
+        parser.error("--append resumes after the last complete line of the output file")
+    if args.output is None:
+        parser.error("--append needs -o/--output")
+    if not args.output.exists():
+        return None
+    with args.output.open("rb") as f:
+        magic = f.read(len(_GZIP_MAGIC))
+    if magic and (magic == _GZIP_MAGIC) != args.gzip:
+        parser.error(f"{args.output} is {'not ' if args.gzip else ''}gzipped")
+    end, last_line = _complete_prefix(args.output, gzipped=args.gzip)
+    os.truncate(args.output, end)
+    return json.loads(last_line)["content_id"] if last_line else None
+
+
+def main(argv: list[str] | None = None) -> None:
+    from provenance_feed.config import get_settings
+    from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+    parser = argparse.ArgumentParser(
+        description="Export feed items as newline-delimited JSON, newest first."
+    )
+    parser.add_argument("-o", "--output", type=Path, help="file to write (default: stdout)")
+    parser.add_argument("--source", help="only items from this source")
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, help="published at or after (ISO 8601)"
+    )
+    parser.add_argument("--until", type=datetime.fromisoformat, help="published before (ISO 8601)")
+    parser.add_argument("--after", metavar="CONTENT_ID", help="start after this item")
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="resume an interrupted export into the output file, after its last complete line",
+    )
+    args = parser.parse_args(argv)
+    after_id = _resume_point(parser, args) if args.append else args.after
+
+    settings = get_settings()
+    repo = SQLiteFeedRepository(
+        database_path=settings.database_path, partition_dir=settings.partition_dir
+    )
+    repo.init_schema()
+    after = None
+    if after_id is not None:
+        item = repo.get_many([after_id]).get(after_id)
+        if item is None:
+            parser.error(f"unknown item: {after_id}")
+        after = FeedCursor.after(item)
+
+    out = open(args.output, "ab" if args.append else "wb") if args.output else sys.stdout.buffer
+    exported = 0
+    try:
+        for body in ndjson_chunks(
+            repo,
+            source=args.source,
+            since=args.since,
+            until=args.until,
+            after=after,
+            chunk_size=settings.export_chunk_size,
+        ):
+            # A complete gzip member per chunk: an interrupted file can be cut back to one.
+            out.write(gzip.compress(body, compresslevel=6) if args.gzip else body)
+            exported += body.count(b"\n")
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"Exported {exported} items", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
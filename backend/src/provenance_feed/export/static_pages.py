@@ -0,0 +1,166 @@
+"""Static, pre-rendered feed pages.
+
+After ingestion commits, the first pages of `/api/feed` (overall and per source) are
+rendered to JSON files that a CDN or nginx can serve without touching Python. The
+bytes are produced by the same encoder as the API route, so they are identical to
+what `/api/feed?limit=<page_size>&cursor=...` returns.
+
+Layout under the export directory:
+
+    manifest.json                         # points at the current version
+    versions/<version>/feed/<n>.json      # page n of the whole feed (1-based)
+    versions/<version>/sources/<source>/<n>.json
+
+Every JSON file has pre-compressed `.gz` and (with the optional `brotli` package)
+`.br` siblings. A version directory is fully written before it is renamed into place,
+and the manifest is replaced atomically afterwards, so readers never see a partial
+export.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from provenance_feed.api.compression import SUPPORTED_ENCODINGS, compress
+from provenance_feed.api.encoding import encode_feed_page
+from provenance_feed.persistence.repository import FeedCursor, FeedRepository
+
+MANIFEST_NAME = "manifest.json"
+
+_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+@dataclass(frozen=True)
+class StaticExportReport:
+    version: str
+    changed: bool
+    files: int
+    bytes_written: int
+
+
+def _render_pages(
+    repo: FeedRepository, *, page_size: int, pages: int, source: str | None
+) -> list[tuple[bytes, str | None]]:
+    """Render up to `pages` pages; returns (body, next_cursor) per non-empty page."""
+
+    out: list[tuple[bytes, str | None]] = []
+    before: FeedCursor | None = None
+    for _ in range(pages):
+        items = repo.list_latest(limit=page_size, before=before, source=source)
+        if not items:
+            break
+        next_cursor = FeedCursor.after(items[-1]).encode() if len(items) == page_size else None
+        out.append((encode_feed_page(items), next_cursor))
+        if next_cursor is None:
+            break
+        before = FeedCursor.after(items[-1])
+    return out
+
+
+def _write_variants(path: Path, body: bytes) -> tuple[int, int]:
+    """Write `path` plus compressed siblings. Returns (files, bytes)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    variants = [(path, body)]
+    for encoding in SUPPORTED_ENCODINGS:
+        variants.append((path.with_name(path.name + _SUFFIXES[encoding]), compress(body, encoding)))
+    for p, data in variants:
+        p.write_bytes(data)
+    return len(variants), sum(len(data) for _, data in variants)
+
+
+def _read_manifest(out_dir: Path) -> dict | None:
+    try:
+        return json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def export_static_feed(
+    *,
+    repo: FeedRepository,
+    out_dir: Path,
+    page_size: int = 50,
+    pages: int = 3,
+    sources: Sequence[str] = (),
+    keep_versions: int = 3,
+    now: datetime | None = None,
+) -> StaticExportReport:
+    """Render the first pages of the feed (and of each source) to `out_dir`.
+
+    If the rendered pages are unchanged since the current version, nothing is written.
+    Only the newest `keep_versions` version directories are kept, so clients holding
+    a slightly older manifest can still fetch its pages.
+    """
+
+    page_size = max(1, page_size)
+    rendered: dict[str, list[tuple[bytes, str | None]]] = {
+        "feed": _render_pages(repo, page_size=page_size, pages=pages, source=None)
+    }
+    for source in sources:
+        rendered[f"sources/{source}"] = _render_pages(
+            repo, page_size=page_size, pages=pages, source=source
+        )
+
+    digest = hashlib.sha256()
+    for prefix, bodies in rendered.items():
+        digest.update(prefix.encode("utf-8"))
+        for body, _ in bodies:
+            digest.update(body)
+    content_hash = digest.hexdigest()[:16]
+
+    current = _read_manifest(out_dir)
+    if current and current.get("content_hash") == content_hash:
+        return StaticExportReport(
+            version=current["version"], changed=False, files=0, bytes_written=0
+        )
+
+    generated_at = (now or datetime.now(tz=UTC)).astimezone(UTC)
+    version = f"{generated_at:%Y%m%dT%H%M%SZ}-{content_hash}"
+    versions_dir = out_dir / "versions"
+    tmp_dir = versions_dir / f".tmp-{version}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    files = 0
+    written = 0
+    manifest_pages: dict[str, list[dict]] = {}
+    for prefix, bodies in rendered.items():
+        entries = []
+        for n, (body, next_cursor) in enumerate(bodies, start=1):
+            rel = f"{prefix}/{n}.json"
+            f, b = _write_variants(tmp_dir / rel, body)
+            files += f
+            written += b
+            entries.append({"path": f"versions/{version}/{rel}", "next_cursor": next_cursor})
+        manifest_pages[prefix] = entries
+
+    final_dir = versions_dir / version
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+
+    manifest = {
+        "version": version,
+        "content_hash": content_hash,
+        "generated_at": generated_at.isoformat(),
+        "page_size": page_size,
+        "feed": manifest_pages.pop("feed"),
+        "sources": {k.removeprefix("sources/"): v for k, v in manifest_pages.items()},
+    }
+    manifest_tmp = out_dir / f".{MANIFEST_NAME}.tmp"
+    manifest_tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(manifest_tmp, out_dir / MANIFEST_NAME)
+
+    old_versions = sorted(
+        p for p in versions_dir.iterdir() if p.is_dir() and not p.name.startswith(".")
+    )
+    for p in old_versions[: max(0, len(old_versions) - max(1, keep_versions))]:
+        shutil.rmtree(p, ignore_errors=True)
+
+    return StaticExportReport(version=version, changed=True, files=files, bytes_written=written)
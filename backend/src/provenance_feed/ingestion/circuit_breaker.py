@@ -0,0 +1,187 @@
+"""Per-host circuit breakers for feed and page fetches.
+
+A host that keeps failing (errors, timeouts, 5xx/429) is skipped for a cool-down that
+doubles each time it trips again, instead of costing a full timeout on every request
+of every run. When the cool-down expires a single half-open probe is let through: success
+closes the breaker, failure re-opens it for longer. State is persisted between runs by a
+`SQLiteBreakerStore`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import Any, TypeVar
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+from provenance_feed.persistence.breakers import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    HostBreaker,
+    SQLiteBreakerStore,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose breaker is open."""
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _counts_as_failure(e: Exception) -> bool:
+    # A 4xx means the host answered; only outages and overload should trip the breaker.
+    if isinstance(e, HTTPError):
+        return e.code >= 500 or e.code == 429
+    return True
+
+
+class CircuitBreakers:
+    """Thread-safe registry of per-host breakers."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        cooldown: timedelta = timedelta(minutes=5),
+        max_cooldown: timedelta = timedelta(hours=6),
+        breakers: Iterable[HostBreaker] = (),
+        store: SQLiteBreakerStore | None = None,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._store = store
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: dict[str, HostBreaker] = {b.host: b for b in breakers}
+        self._probing: set[str] = set()
+        self._skipped: dict[str, int] = {}
+
+    @classmethod
+    def load(cls, store: SQLiteBreakerStore, **options: Any) -> CircuitBreakers:
+        """Restore persisted state; `save()` writes it back to the same store."""
+
+        return cls(breakers=store.load_breakers(), store=store, **options)
+
+    def save(self) -> None:
+        if self._store is not None:
+            self._store.save_breakers(self.breakers())
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Sent to ingestion worker processes: carries the options and breaker state, but
+        # no lock, store or per-run counters.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state.update(_store=None, _probing=set(), _skipped={})
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _now(self) -> datetime:
+        return self._clock() if self._clock is not None else datetime.now(tz=UTC)
+
+    def allow(self, url: str) -> bool:
+        host = host_of(url)
+        with self._lock:
+            b = self._breakers.get(host)
+            if b is None or b.state == CLOSED:
+                return True
+            if b.state == OPEN and b.open_until is not None and self._now() >= b.open_until:
+                self._breakers[host] = b = replace(b, state=HALF_OPEN)
+                logger.info("circuit half-open for host=%s; probing", host)
+            if b.state == HALF_OPEN and host not in self._probing:
+                self._probing.add(host)
+                return True
+            self._skipped[host] = self._skipped.get(host, 0) + 1
+            return False
+
+    def record_success(self, url: str) -> None:
+        host = host_of(url)
+        with self._lock:
+            self._probing.discard(host)
+            b = self._breakers.get(host)
+            if b is None:
+                return
+            if b.state != CLOSED:
+                logger.info("circuit closed for host=%s", host)
+            self._breakers[host] = HostBreaker(host=host)
+
+    def record_failure(self, url: str) -> None:
+        host = host_of(url)
+        with self._lock:
+            self._probing.discard(host)
+            b = self._breakers.get(host) or HostBreaker(host=host)
+            failures = b.failures + 1
+            if b.state == CLOSED and failures < self._failure_threshold:
+                self._breakers[host] = replace(b, failures=failures)
+                return
+            trips = b.trips + 1
+            cooldown = min(self._cooldown * (2 ** (trips - 1)), self._max_cooldown)
+            self._breakers[host] = HostBreaker(
+                host=host,
+                state=OPEN,
+                failures=failures,
+                trips=trips,
+                open_until=self._now() + cooldown,
+            )
+            logger.warning(
+                "circuit open for host=%s after %s failures; skipping for %ss",
+                host,
+                failures,
+                int(cooldown.total_seconds()),
+            )
+
+    def call(self, url: str, fn: Callable[[], T]) -> T:
+        """Run `fn` (a request to `url`) through the breaker for its host."""
+
+        if not self.allow(url):
+            raise CircuitOpenError(f"circuit open for host {host_of(url)}")
+        try:
+            result = fn()
+        except Exception as e:
+            if _counts_as_failure(e):
+                self.record_failure(url)
+            else:
+                self.record_success(url)
+            raise
+        self.record_success(url)
+        return result
+
+    def breakers(self) -> list[HostBreaker]:
+        with self._lock:
+            return sorted(self._breakers.values(), key=lambda b: b.host)
+
+    def skipped(self) -> dict[str, int]:
+        """Calls skipped per host since this registry was created."""
+
+        with self._lock:
+            return dict(self._skipped)
+
+    def changed_since(self, breakers: Iterable[HostBreaker]) -> list[HostBreaker]:
+        """Breakers whose state differs from `breakers` (e.g. the state a worker started with)."""
+
+        before = {b.host: b for b in breakers}
+        return [b for b in self.breakers() if before.get(b.host) != b]
+
+    def merge(self, breakers: Iterable[HostBreaker], skipped: dict[str, int]) -> None:
+        """Fold in state reported by another registry (e.g. a worker process)."""
+
+        with self._lock:
+            for b in breakers:
+                self._breakers[b.host] = b
+            for host, n in skipped.items():
+                self._skipped[host] = self._skipped.get(host, 0) + n
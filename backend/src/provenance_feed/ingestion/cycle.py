@@ -0,0 +1,232 @@
+"""One ingestion run, as both the CLI and the API's leader process perform it.
+
+Fetch and persist every source, record the run in the `ingest_runs` ledger (compared with
+its baseline), then apply retention, archive old months and write the static export. Only
+the caller differs: the CLI reports to stdout, the API process to its log.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from provenance_feed.config import (
+    Settings,
+    circuit_breakers,
+    http_client,
+    known_item_check,
+    parse_pool,
+    retention_policy,
+)
+from provenance_feed.export.static_pages import export_static_feed
+from provenance_feed.ingestion.parallel import ingest_sharded
+from provenance_feed.ingestion.real_sources import SOURCES, iter_all_records
+from provenance_feed.ingestion.rss_common import parse_feed
+from provenance_feed.ingestion.run_stats import RunStats
+from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.persistence.breakers import CLOSED
+from provenance_feed.persistence.ingest_runs import (
+    IngestRun,
+    SQLiteIngestRunStore,
+    compare_to_baseline,
+)
+from provenance_feed.persistence.repository import FeedRepository
+from provenance_feed.profiling import StageProfiler
+from provenance_feed.provenance_graph.observer import ProvenanceGraphObserver
+
+
+@dataclass(frozen=True)
+class IngestOutcome:
+    upserted: int
+    run: IngestRun
+    # Whether any throughput metric was flagged against the baseline.
+    regressed: bool
+
+
+def make_observer(settings: Settings) -> ProvenanceGraphObserver:
+    return ProvenanceGraphObserver(
+        enabled=settings.provenance_graph_observe_enabled,
+        observe_url=settings.provenance_graph_observe_url,
+        api_key=settings.provenance_graph_write_api_key,
+        timeout_seconds=settings.provenance_graph_observe_timeout_seconds,
+        queue_size=settings.provenance_graph_observe_queue_size,
+    )
+
+
+def run_ingestion(
+    *,
+    settings: Settings,
+    repo: FeedRepository,
+    observer: ProvenanceGraphObserver,
+    workers: int = 0,
+    profiler: StageProfiler | None = None,
+    report: Callable[[str], None] = print,
+) -> IngestOutcome:
+    """Ingest every source once and do the upkeep that follows a run.
+
+    With `workers > 0`, sources are sharded across that many fetch/parse processes. With a
+    `profiler`, each stage is profiled into it and the reports are written at the end.
+    Progress and results go to `report`, one line at a time.
+    """
+
+    def stage(name: str, fn, /, **kwargs):
+        call = functools.partial(fn, **kwargs)
+        return call() if profiler is None else profiler.call(name, call)
+
+    breakers = circuit_breakers(settings)
+    client = http_client(settings)
+    known = known_item_check(settings, repo)
+    # Sharded workers are processes already and parse in-process.
+    pool = parse_pool(settings) if workers <= 0 else None
+    stats = RunStats()
+    marks = repo.write_marks()
+    started_at = datetime.now(tz=UTC)
+    try:
+        if workers > 0:
+            summaries = ingest_sharded(
+                repo=repo,
+                sources=SOURCES,
+                workers=workers,
+                observer=observer,
+                timeout_seconds=settings.http_timeout_seconds,
+                batch_size=settings.ingest_batch_size,
+                breakers=breakers,
+                client=client,
+                known=known,
+                profiler=profiler,
+                stats=stats,
+            )
+            for s in summaries:
+                status = f"crashed (exitcode={s.exitcode})" if s.crashed else "ok"
+                report(
+                    f"worker {s.worker} pid={s.pid} {status}: sources={','.join(s.sources)} "
+                    f"records={s.records} upserted={s.upserted} errors={len(s.errors)} "
+                    f"seconds={s.seconds:.2f}"
+                )
+                for source_id, error in s.errors.items():
+                    report(f"  {source_id}: {error}")
+            count = sum(s.upserted for s in summaries)
+        else:
+            records = iter_all_records(
+                timeout_seconds=settings.http_timeout_seconds,
+                max_workers=settings.ingest_fetch_concurrency,
+                queue_size=settings.ingest_queue_size,
+                breakers=breakers,
+                client=client,
+                known=known,
+                profiler=profiler,
+                stats=stats,
+                parser=pool.parse if pool is not None else parse_feed,
+            )
+            # In a single process, "persist" also includes waiting on the fetch threads.
+            count = stage(
+                "persist",
+                ingest_once,
+                repo=repo,
+                records=records,
+                observer=observer,
+                batch_size=settings.ingest_batch_size,
+                stats=stats,
+            )
+    finally:
+        breakers.save()
+        client.close()
+        if pool is not None:
+            pool.close()
+    run = stats.to_run(
+        started_at=started_at,
+        finished_at=datetime.now(tz=UTC),
+        writes=repo.writes_since(marks),
+    )
+    report(f"Ingested {count} items")
+    regressed = record_run(
+        SQLiteIngestRunStore(settings.database_path),
+        run,
+        baseline_runs=settings.ingest_baseline_runs,
+        threshold=settings.ingest_regression_threshold,
+        report=report,
+    )
+
+    if known is not None:
+        r = known.report()
+        report(
+            f"Pre-check skipped {r.skipped} of {r.candidates} entries as unchanged "
+            f"(new={r.new} changed={r.changed} stale_images={r.stale_images} "
+            f"failed_lookups={r.failed_lookups})"
+        )
+
+    skipped = breakers.skipped()
+    for b in breakers.breakers():
+        if b.state != CLOSED or skipped.get(b.host):
+            until = f" until {b.open_until.isoformat()}" if b.open_until else ""
+            report(
+                f"circuit {b.host}: {b.state}{until} trips={b.trips} "
+                f"skipped={skipped.get(b.host, 0)}"
+            )
+
+    policy = retention_policy(settings)
+    if policy.enabled:
+        pruned = stage("retention", repo.prune, policy=policy)
+        report(f"Pruned {pruned.rows_deleted} items (freed {pruned.bytes_freed} bytes)")
+
+    if settings.partition_dir is not None:
+        archived = stage("archive", repo.archive, hot_months=settings.partition_hot_months)
+        if archived.rows_moved:
+            report(f"Archived {archived.rows_moved} items into {', '.join(archived.months)}")
+
+    if settings.static_export_dir is not None:
+        export = stage(
+            "export",
+            export_static_feed,
+            repo=repo,
+            out_dir=settings.static_export_dir,
+            page_size=settings.static_export_page_size,
+            pages=settings.static_export_pages,
+            sources=[s.source_id for s in SOURCES],
+        )
+        state = "written" if export.changed else "unchanged"
+        report(f"Static export {export.version} {state} ({export.files} files)")
+
+    if profiler is not None:
+        for path in profiler.write():
+            report(f"Profile written to {path}")
+    return IngestOutcome(upserted=count, run=run, regressed=regressed)
+
+
+def record_run(
+    store: SQLiteIngestRunStore,
+    run: IngestRun,
+    *,
+    baseline_runs: int,
+    threshold: float,
+    report: Callable[[str], None] = print,
+) -> bool:
+    """Record `run` in the ledger and report it against the baseline of the runs before
+    it. Returns whether any throughput metric regressed."""
+
+    previous = store.list_runs(limit=baseline_runs)
+    run_id = store.record(run)
+    t = run.total
+    report(
+        f"Run {run_id}: {run.seconds:.2f}s, {len(run.sources)} sources, errors={run.errors}, "
+        f"entries={t('entries')} kept={t('kept')} skipped={t('skipped')} "
+        f"written={t('written')} inserted={t('inserted')} updated={t('updated')} "
+        f"unchanged={t('unchanged')} bytes={t('bytes')}"
+    )
+    report(
+        f"  fetch={t('fetch_seconds'):.2f}s parse={t('parse_seconds'):.2f}s "
+        f"enrich={t('enrich_seconds'):.2f}s persist={run.persist_seconds:.2f}s "
+        "(fetch/parse/enrich summed over sources)"
+    )
+    comparisons = compare_to_baseline(run, previous, threshold=threshold)
+    if not comparisons:
+        report(f"  no baseline yet ({len(previous)} previous runs)")
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed else ""
+        report(
+            f"  {c.metric}: {c.latest:.4g} vs baseline {c.baseline:.4g} "
+            f"({(c.latest - c.baseline) / c.baseline:+.0%}){flag}"
+        )
+    return any(c.regressed for c in comparisons)
@@ -0,0 +1,406 @@
+"""Shared HTTP client for feed and page fetches.
+
+`urlopen` opens a new TCP (and TLS) connection for every request. Ingestion fetches dozens
+of article pages from the same few publisher hosts per run, so this client keeps idle
+keep-alive connections per host and reuses resolved addresses, paying the handshake once
+per connection instead of once per request. Stdlib only (`http.client`).
+
+Like `urlopen`, it honours `HTTP_PROXY`/`HTTPS_PROXY`/`NO_PROXY` from the environment
+(`urllib.request.getproxies`): plain HTTP goes to the proxy with the absolute URL, HTTPS is
+tunnelled through it with CONNECT. The proxy itself is spoken to over plain HTTP.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import socket
+import ssl
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.message import Message
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.parse import SplitResult, unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass_environment
+
+try:
+    import brotli
+except ImportError:  # optional dependency: `pip install provenance-feed[brotli]`
+    brotli = None
+
+USER_AGENT = "provenance-feed/0.1 (https://github.com/trickl/provenance-feed)"
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+# brotli is only negotiated when its decoder can cap its output (brotli >= 1.2), so a
+# small compressed bomb cannot expand past `max_body_bytes`.
+_BROTLI_CAPPED = brotli is not None and hasattr(brotli.Decompressor, "can_accept_more_data")
+
+ACCEPT_ENCODING = "gzip, deflate, br" if _BROTLI_CAPPED else "gzip, deflate"
+
+# Default cap on a decoded response body; feeds and article pages are far smaller.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+# Errors that mean a reused keep-alive connection had been closed by the server.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+_PoolKey = tuple[str, str, int]
+
+
+class ResponseTooLargeError(URLError):
+    """The (decoded) response body exceeded the configured maximum size."""
+
+
+@dataclass(frozen=True)
+class FetchResponse:
+    url: str
+    status: int
+    headers: Message
+    body: bytes
+    # Body bytes as transferred, before any Content-Encoding was decoded.
+    wire_bytes: int = 0
+
+
+class _Decoder:
+    """Incremental Content-Encoding decoder that never produces more than `limit` bytes."""
+
+    def __init__(self, encoding: str) -> None:
+        self._encoding = encoding
+        if encoding == "gzip":
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._zlib = zlib.decompressobj()
+            self._first = True
+        elif encoding == "br" and _BROTLI_CAPPED:
+            self._brotli = brotli.Decompressor()
+        else:
+            raise URLError(f"unsupported Content-Encoding: {encoding}")
+
+    @property
+    def finished(self) -> bool:
+        """Whether the end of the compressed stream has been seen."""
+
+        if self._encoding == "br":
+            return self._brotli.is_finished()
+        return self._zlib.eof
+
+    def decode(self, data: bytes, limit: int) -> bytes:
+        if self._encoding == "br":
+            # Output stops growing past the limit; the caller then gives up on the body.
+            try:
+                return self._brotli.process(data, output_buffer_limit=limit + 1)
+            except brotli.error as e:
+                raise URLError(f"corrupt br response: {e}") from e
+        if self._encoding == "deflate" and self._first:
+            self._first = False
+            try:
+                return self._zlib.decompress(data, limit + 1)
+            except zlib.error:
+                # Some servers send raw deflate without the zlib wrapper.
+                self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+        try:
+            return self._zlib.decompress(data, limit + 1)
+        except zlib.error as e:
+            raise URLError(f"corrupt {self._encoding} response: {e}") from e
+
+
+@dataclass(frozen=True)
+class _RawResponse:
+    status: int
+    reason: str
+    headers: Message
+    body: bytes
+    wire_bytes: int
+
+
+class HTTPClient:
+    """Thread-safe GET client with per-host keep-alive pools and a DNS cache.
+
+    - `max_idle_per_host`: idle connections kept per host (extra ones are closed).
+    - `idle_timeout_seconds`: idle connections older than this are not reused, since
+      servers drop keep-alives on their own schedule.
+    - `dns_ttl_seconds`: how long resolved addresses are reused.
+    - `accept_compressed`: negotiate gzip/deflate (and brotli if installed); bodies are
+      decoded as they stream in.
+    - `max_body_bytes`: cap on the decoded body; larger responses are abandoned with
+      `ResponseTooLargeError` as soon as the cap is crossed, without buffering the rest.
+
+    Responses with status >= 400 raise `urllib.error.HTTPError` and connection failures
+    raise `URLError`/`OSError`, as `urlopen` did. Redirects are followed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle_per_host: int = 4,
+        timeout_seconds: float = 10.0,
+        idle_timeout_seconds: float = 30.0,
+        dns_ttl_seconds: float = 300.0,
+        max_redirects: int = 5,
+        max_body_bytes: int = MAX_BODY_BYTES,
+        accept_compressed: bool = True,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self._max_idle_per_host = max(0, max_idle_per_host)
+        self._timeout_seconds = timeout_seconds
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._dns_ttl_seconds = dns_ttl_seconds
+        self._max_redirects = max_redirects
+        self._max_body_bytes = max_body_bytes
+        self._accept_compressed = accept_compressed
+        self._ssl_context = ssl_context
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[_PoolKey, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._dns: dict[tuple[str, int], tuple[float, list[tuple[Any, ...]]]] = {}
+        self.connections_opened = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        # Loading the CA bundle is slow: one default context, built on first use, serves
+        # every HTTPS connection of this client.
+        self._default_ssl_context: ssl.SSLContext | None = None
+        self._proxies = getproxies()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Sent to ingestion worker processes: options only, no live connections.
+        state = {k: v for k, v in self.__dict__.items() if k.startswith("_")}
+        for k in ("_lock", "_idle", "_dns", "_default_ssl_context", "_proxies"):
+            del state[k]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_state()
+
+    def get(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout_seconds: float | None = None,
+    ) -> FetchResponse:
+        timeout = self._timeout_seconds if timeout_seconds is None else timeout_seconds
+        request_headers = {"User-Agent": USER_AGENT}
+        if self._accept_compressed:
+            request_headers["Accept-Encoding"] = ACCEPT_ENCODING
+        request_headers.update(headers or {})
+        for _ in range(self._max_redirects + 1):
+            resp = self._request(url, request_headers, timeout)
+            location = resp.headers.get("Location")
+            if resp.status in _REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+            return FetchResponse(
+                url=url,
+                status=resp.status,
+                headers=resp.headers,
+                body=resp.body,
+                wire_bytes=resp.wire_bytes,
+            )
+        raise URLError(f"too many redirects fetching {url}")
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for pool in pools.values():
+            for conn, _ in pool:
+                conn.close()
+
+    def _request(self, url: str, headers: dict[str, str], timeout: float) -> _RawResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise URLError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key: _PoolKey = (parts.scheme, parts.hostname.lower(), port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        proxy = self._proxy_for(parts.scheme, key[1])
+        if proxy is not None and parts.scheme == "http":
+            # A forward proxy takes the absolute URL (HTTPS is tunnelled instead).
+            path = f"http://{parts.netloc.rpartition('@')[2]}{path}"
+            headers = {**headers, **_proxy_auth(proxy)}
+
+        conn = self._checkout(key)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._open(key, timeout, proxy)
+            elif conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection; retry once on a fresh one.
+                conn, reused = None, False
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        try:
+            # Only successful bodies are decoded; redirect and error bodies are drained so
+            # the connection can be reused.
+            encoding = resp.headers.get("Content-Encoding", "").strip().lower()
+            decode = 200 <= resp.status < 300 and encoding not in ("", "identity")
+            body, wire_bytes = self._read_body(resp, url, encoding if decode else None)
+        except BaseException:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        return _RawResponse(resp.status, resp.reason, resp.headers, body, wire_bytes)
+
+    def _read_body(
+        self, resp: http.client.HTTPResponse, url: str, encoding: str | None
+    ) -> tuple[bytes, int]:
+        limit = self._max_body_bytes
+        decoder = _Decoder(encoding) if encoding is not None else None
+        parts: list[bytes] = []
+        size = wire_bytes = 0
+        while chunk := resp.read(_READ_CHUNK_BYTES):
+            wire_bytes += len(chunk)
+            data = decoder.decode(chunk, limit - size) if decoder is not None else chunk
+            size += len(data)
+            if size > limit:
+                raise ResponseTooLargeError(f"response from {url} exceeds {limit} bytes")
+            parts.append(data)
+        if decoder is not None and wire_bytes and not decoder.finished:
+            raise URLError(f"truncated {encoding} response from {url}")
+        with self._lock:
+            self.bytes_received += wire_bytes
+            self.bytes_decoded += size
+        return b"".join(parts), wire_bytes
+
+    def _checkout(self, key: _PoolKey) -> http.client.HTTPConnection | None:
+        now = time.monotonic()
+        with self._lock:
+            pool = self._idle.get(key)
+            while pool:
+                conn, idle_since = pool.pop()
+                if now - idle_since < self._idle_timeout_seconds:
+                    return conn
+                conn.close()
+        return None
+
+    def _checkin(self, key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self._max_idle_per_host:
+                pool.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _proxy_for(self, scheme: str, host: str) -> SplitResult | None:
+        proxy = self._proxies.get(scheme)
+        if not proxy or proxy_bypass_environment(host, self._proxies):
+            return None
+        return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    def _ssl_context_for_connections(self) -> ssl.SSLContext:
+        if self._ssl_context is not None:
+            return self._ssl_context
+        with self._lock:
+            if self._default_ssl_context is None:
+                self._default_ssl_context = ssl.create_default_context()
+            return self._default_ssl_context
+
+    def _open(
+        self, key: _PoolKey, timeout: float, proxy: SplitResult | None = None
+    ) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        # Connections go to the proxy when there is one; pools stay keyed by the target.
+        connect_host, connect_port = host, port
+        if proxy is not None:
+            connect_host, connect_port = proxy.hostname or "", proxy.port or 80
+        addresses = self._resolve(connect_host, connect_port)
+
+        def create_connection(
+            _address: tuple[str, int], timeout: float = timeout, source_address: Any = None
+        ) -> socket.socket:
+            last_error: OSError | None = None
+            for family, socktype, proto, _canon, sockaddr in addresses:
+                sock = socket.socket(family, socktype, proto)
+                try:
+                    sock.settimeout(timeout)
+                    sock.connect(sockaddr)
+                    return sock
+                except OSError as e:
+                    sock.close()
+                    last_error = e
+            raise last_error or OSError(f"no addresses for {connect_host}")
+
+        conn: http.client.HTTPConnection
+        if scheme == "https":
+            context = self._ssl_context_for_connections()
+            # SNI and certificate checks still use the hostname, not the cached address
+            # (nor the proxy's, when tunnelling).
+            conn = http.client.HTTPSConnection(
+                connect_host, connect_port, timeout=timeout, context=context
+            )
+            if proxy is not None:
+                conn.set_tunnel(host, port, headers=_proxy_auth(proxy))
+        else:
+            conn = http.client.HTTPConnection(connect_host, connect_port, timeout=timeout)
+        conn._create_connection = create_connection  # type: ignore[attr-defined]
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _resolve(self, host: str, port: int) -> list[tuple[Any, ...]]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._dns.get((host, port))
+            if cached is not None and now - cached[0] < self._dns_ttl_seconds:
+                return cached[1]
+        try:
+            addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise URLError(e) from e
+        with self._lock:
+            self._dns[(host, port)] = (now, addresses)
+        return addresses
+
+
+def _proxy_auth(proxy: SplitResult) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    return {"Proxy-Authorization": f"Basic {base64.b64encode(credentials.encode()).decode()}"}
+
+
+_default_client: HTTPClient | None = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HTTPClient:
+    """The process-wide client used when none is injected."""
+
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
@@ -0,0 +1,247 @@
+"""Multi-process ingestion.
+
+Sources are sharded across worker processes, which only fetch and parse (the
+CPU-heavy part, limited by the GIL when run in one process). Records stream back
+in chunks over a queue to the parent, which is the single writer: it does the
+batched upserts and observer calls, so SQLite sees exactly one writer.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+from provenance_feed.ingestion.circuit_breaker import CircuitBreakers
+from provenance_feed.ingestion.http_client import HTTPClient
+from provenance_feed.ingestion.precheck import KnownItemCheck
+from provenance_feed.ingestion.records import Record
+from provenance_feed.ingestion.rss_common import RSSSource, iter_source_records
+from provenance_feed.ingestion.run_stats import RunStats
+from provenance_feed.ingestion.service import ContentObserver, ingest_once
+from provenance_feed.persistence.repository import FeedRepository
+from provenance_feed.profiling import StageProfiler
+
+logger = logging.getLogger(__name__)
+
+SourceFetcher = Callable[..., Iterable[Record]]
+
+# How often the writer checks for workers that died without reporting.
+_POLL_SECONDS = 0.5
+
+
+@dataclass
+class WorkerSummary:
+    worker: int
+    sources: list[str]
+    pid: int | None = None
+    records: int = 0
+    upserted: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    crashed: bool = False
+    exitcode: int | None = None
+
+
+def shard_sources(sources: Sequence[RSSSource], workers: int) -> list[list[RSSSource]]:
+    """Round-robin sources into at most `workers` non-empty shards."""
+
+    n = max(1, min(workers, len(sources)))
+    shards: list[list[RSSSource]] = [[] for _ in range(n)]
+    for i, source in enumerate(sources):
+        shards[i % n].append(source)
+    return [s for s in shards if s]
+
+
+def _shard_worker(
+    worker: int,
+    sources: list[RSSSource],
+    timeout_seconds: float,
+    fetch_source: SourceFetcher,
+    chunk_size: int,
+    out: multiprocessing.Queue,
+    breakers: CircuitBreakers | None = None,
+    client: HTTPClient | None = None,
+    known: KnownItemCheck | None = None,
+    profiler: StageProfiler | None = None,
+    stats: RunStats | None = None,
+) -> None:
+    # Runs in a child process: fetch + parse only, never touches the database.
+    pid = os.getpid()
+    started = time.perf_counter()
+    extra: dict[str, object] = {}
+    if breakers is not None:
+        extra["breakers"] = breakers
+    if client is not None:
+        extra["client"] = client
+    if known is not None:
+        extra["known"] = known
+    if stats is not None:
+        extra["stats"] = stats
+    initial = [] if breakers is None else breakers.breakers()
+    if profiler is not None:
+        fetch_source = profiler.iterate("fetch", fetch_source)
+    for source in sources:
+        try:
+            records = iter(fetch_source(source=source, timeout_seconds=timeout_seconds, **extra))
+            while chunk := list(itertools.islice(records, chunk_size)):
+                out.put(("records", worker, source.source_id, chunk))
+        except Exception as e:
+            out.put(("error", worker, source.source_id, f"{type(e).__name__}: {e}"))
+    if breakers is not None:
+        out.put(("breakers", worker, breakers.changed_since(initial), breakers.skipped()))
+    if known is not None:
+        out.put(("precheck", worker, None, known.report()))
+    if stats is not None:
+        out.put(("stats", worker, None, stats.sources()))
+    if profiler is not None:
+        profiler.write(prefix=f"worker{worker}-")
+    out.put(("done", worker, pid, time.perf_counter() - started))
+
+
+def ingest_sharded(
+    *,
+    repo: FeedRepository,
+    sources: Sequence[RSSSource],
+    workers: int,
+    observer: ContentObserver | None = None,
+    timeout_seconds: float = 10.0,
+    batch_size: int | None = None,
+    fetch_source: SourceFetcher = iter_source_records,
+    chunk_size: int = 100,
+    breakers: CircuitBreakers | None = None,
+    client: HTTPClient | None = None,
+    known: KnownItemCheck | None = None,
+    profiler: StageProfiler | None = None,
+    stats: RunStats | None = None,
+) -> list[WorkerSummary]:
+    """Fetch/parse sources on `workers` processes and persist from this process.
+
+    Records streamed back by any worker are pooled and written `batch_size` per
+    transaction, exactly as `ingest_once` writes a single stream; only the final write may
+    be smaller. A worker that crashes loses only the records it had not streamed back yet;
+    everything it already streamed back is persisted. Returns one summary per worker.
+
+    With `breakers`, each worker starts from a copy of the breaker state and reports the
+    hosts it changed back; they are merged into `breakers` (the caller saves them).
+    `client` is copied to each worker with its options but its own connection pools.
+    `known` is copied likewise (workers only read the database through it); its report
+    totals are merged back into `known`.
+
+    With `profiler`, each worker writes its own `worker<N>-fetch.pstats`, and upserts in
+    this process are profiled into the "persist" stage. `stats` is copied to each
+    worker likewise and their per-source stats are merged back; upsert time is added
+    here.
+    """
+
+    ctx = multiprocessing.get_context("spawn")
+    out: multiprocessing.Queue = ctx.Queue()
+    summaries: list[WorkerSummary] = []
+    procs = []
+    for i, shard in enumerate(shard_sources(sources, workers)):
+        summaries.append(WorkerSummary(worker=i, sources=[s.source_id for s in shard]))
+        p = ctx.Process(
+            target=_shard_worker,
+            args=(
+                i,
+                shard,
+                timeout_seconds,
+                fetch_source,
+                max(1, chunk_size),
+                out,
+                breakers,
+                client,
+                known,
+                profiler,
+                stats,
+            ),
+            name=f"ingest-worker-{i}",
+            daemon=True,
+        )
+        p.start()
+        procs.append(p)
+
+    # Streamed-back records not written yet, with the worker each came from.
+    buffered: list[tuple[int, Record]] = []
+    step = max(1, batch_size) if batch_size is not None else 1
+
+    def persist(n: int) -> None:
+        chunk = buffered[:n]
+        del buffered[:n]
+        write = functools.partial(
+            ingest_once,
+            repo=repo,
+            records=[record for _, record in chunk],
+            observer=observer,
+            batch_size=batch_size,
+            stats=stats,
+        )
+        if profiler is None:
+            write()
+        else:
+            profiler.call("persist", write)
+        for worker, _ in chunk:
+            summaries[worker].upserted += 1
+
+    pending = set(range(len(procs)))
+    # Workers seen dead on an empty poll; declared crashed only if still unaccounted for
+    # on the next one, so messages already in the pipe are never mistaken for a crash.
+    seen_dead: set[int] = set()
+    try:
+        while pending:
+            try:
+                kind, worker, key, payload = out.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                for i in sorted(pending):
+                    if procs[i].is_alive():
+                        continue
+                    if i not in seen_dead:
+                        seen_dead.add(i)
+                        continue
+                    summaries[i].crashed = True
+                    pending.discard(i)
+                    logger.error("ingest worker=%s crashed (exitcode=%s)", i, procs[i].exitcode)
+                continue
+
+            summary = summaries[worker]
+            if kind == "records":
+                summary.records += len(payload)
+                buffered += ((worker, record) for record in payload)
+                if len(buffered) >= step:
+                    persist(len(buffered) - len(buffered) % step)
+            elif kind == "error":
+                summary.errors[key] = payload
+                if stats is not None:
+                    stats.error(key, payload)
+                logger.warning("ingest worker=%s source=%s failed: %s", worker, key, payload)
+            elif kind == "breakers":
+                if breakers is not None:
+                    breakers.merge(key, payload)
+            elif kind == "precheck":
+                if known is not None:
+                    known.merge(payload)
+            elif kind == "stats":
+                if stats is not None:
+                    stats.merge(payload)
+            elif kind == "done":
+                summary.pid = key
+                summary.seconds = payload
+                pending.discard(worker)
+        if buffered:
+            persist(len(buffered))
+    finally:
+        for p in procs:
+            p.join(timeout=_POLL_SECONDS)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+    for summary, p in zip(summaries, procs, strict=True):
+        summary.exitcode = p.exitcode
+    return summaries
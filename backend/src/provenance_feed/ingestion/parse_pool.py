@@ -0,0 +1,176 @@
+"""Feed parsing in worker processes.
+
+feedparser is pure Python and CPU-bound, so parsing on the fetch threads serialises them
+on the GIL, and one pathological payload can stall a fetch thread or balloon the
+ingestion process. A `ParsePool` ships raw feed payloads to worker processes and gets
+compact `ParsedFeed`s back. Each parse has a wall-clock timeout and each worker an
+address-space cap; a worker that times out or dies is killed and replaced, and workers
+are recycled after a number of parses so slow leaks cannot accumulate.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext
+
+from provenance_feed.ingestion.rss_common import ParsedFeed, RSSSource, parse_feed
+
+logger = logging.getLogger(__name__)
+
+
+class ParseError(RuntimeError):
+    """A feed could not be parsed in a worker (it raised, or the worker died)."""
+
+
+class ParseTimeoutError(ParseError, TimeoutError):
+    """A parse ran past the pool's timeout; its worker was killed."""
+
+
+def _limit_memory(memory_bytes: int) -> None:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        logger.warning("parse worker memory cap not supported on this platform")
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def _serve(conn: Connection, memory_bytes: int | None) -> None:
+    # Runs in a worker process: parse payloads until told to stop (None) or orphaned.
+    if memory_bytes:
+        _limit_memory(memory_bytes)
+    conn.send("ready")
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        xml, source = task
+        try:
+            reply = ("ok", parse_feed(xml, source))
+        except Exception as e:  # includes MemoryError from hitting the cap
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+class _Worker:
+    def __init__(self, context: SpawnContext, memory_bytes: int | None) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_serve, args=(child, memory_bytes), name="feed-parse", daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.tasks = 0
+        # Wait out the interpreter start-up, so it does not count against parse timeouts.
+        try:
+            self.conn.recv()
+        except EOFError as e:
+            self.process.join()
+            self.conn.close()
+            raise ParseError(
+                f"parse worker failed to start (exitcode={self.process.exitcode})"
+            ) from e
+
+    def stop(self, *, kill: bool = False) -> None:
+        if not kill:
+            try:
+                self.conn.send(None)
+            except OSError:
+                kill = True
+        if kill:
+            self.process.kill()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """Parses feeds in up to `processes` worker processes.
+
+    `parse` has the `FeedParser` signature and blocks the calling (fetch) thread until a
+    worker is free and has answered. Workers are started on first use. Use as a context
+    manager, or call `close()` when done.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes: int = 2,
+        timeout_seconds: float = 30.0,
+        memory_limit_mb: int | None = 512,
+        max_tasks_per_child: int = 100,
+    ) -> None:
+        self._timeout_seconds = timeout_seconds
+        self._memory_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self._max_tasks_per_child = max(1, max_tasks_per_child)
+        self._context = multiprocessing.get_context("spawn")
+        # One slot per process; None until the slot's worker is first started.
+        self._slots: queue.Queue[_Worker | None] = queue.Queue()
+        for _ in range(max(1, processes)):
+            self._slots.put(None)
+
+    def __enter__(self) -> ParsePool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def parse(self, xml: bytes, source: RSSSource) -> ParsedFeed:
+        worker = self._slots.get()
+        try:
+            if worker is None:
+                worker = _Worker(self._context, self._memory_bytes)
+            status, payload = self._run(worker, xml, source)
+            worker.tasks += 1
+            # A worker that raised (e.g. MemoryError at its cap) may be in a bad state.
+            if status == "error" or worker.tasks >= self._max_tasks_per_child:
+                worker.stop()
+                worker = None
+        except BaseException:
+            if worker is not None:
+                worker.stop(kill=True)
+            worker = None
+            raise
+        finally:
+            self._slots.put(worker)
+        if status == "error":
+            raise ParseError(f"parse of {source.source_id} failed: {payload}")
+        return payload
+
+    def _run(self, worker: _Worker, xml: bytes, source: RSSSource) -> tuple[str, object]:
+        try:
+            worker.conn.send((xml, source))
+            if worker.conn.poll(self._timeout_seconds):
+                return worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker.process.join(timeout=1)
+            raise ParseError(
+                f"parse worker for {source.source_id} died (exitcode={worker.process.exitcode})"
+            ) from e
+        raise ParseTimeoutError(
+            f"parse of {source.source_id} exceeded {self._timeout_seconds:g}s ({len(xml)} bytes)"
+        )
+
+    def close(self) -> None:
+        """Stop idle workers; any still parsing are left to finish (they are daemons).
+        Workers are started again if the pool is used after closing."""
+
+        stopped = 0
+        while True:
+            try:
+                worker = self._slots.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+            stopped += 1
+        for _ in range(stopped):
+            self._slots.put(None)
@@ -0,0 +1,92 @@
+"""Streaming fetch stage.
+
+Sources are fetched and parsed concurrently on a small thread pool. Each producer
+pushes records into one bounded queue as soon as they are parsed, and the consumer
+(normally `ingest_once`) pulls from it, so items from fast sources are committed
+while slow sources are still downloading. The queue bound caps how far fetching can
+run ahead of persistence.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from provenance_feed.ingestion.records import Record
+from provenance_feed.ingestion.rss_common import RSSSource, iter_source_records
+
+logger = logging.getLogger(__name__)
+
+SourceStream = Callable[..., Iterable[Record]]
+
+_DONE = object()
+_PUT_POLL_SECONDS = 0.1
+
+
+def stream_sources(
+    sources: Iterable[RSSSource],
+    *,
+    timeout_seconds: float = 10.0,
+    max_workers: int = 4,
+    queue_size: int = 256,
+    fetch_source: SourceStream = iter_source_records,
+) -> Iterator[Record]:
+    """Yield records from all sources in arrival order.
+
+    A failing source is logged and skipped; the other sources are unaffected. Closing
+    the iterator early stops the producers at their next record.
+    """
+
+    sources = list(sources)
+    if not sources:
+        return
+
+    q: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+
+    def put(obj: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(obj, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(source: RSSSource) -> None:
+        try:
+            for record in fetch_source(source=source, timeout_seconds=timeout_seconds):
+                if not put(record):
+                    return
+        except Exception as e:
+            logger.warning(
+                "ingestion source=%s failed (%s): %s", source.source_id, type(e).__name__, e
+            )
+        finally:
+            put(_DONE)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(sources))),
+        thread_name_prefix="ingest-fetch",
+    )
+    for source in sources:
+        executor.submit(produce, source)
+
+    total = 0
+    remaining = len(sources)
+    try:
+        while remaining:
+            obj = q.get()
+            if obj is _DONE:
+                remaining -= 1
+                continue
+            total += 1
+            yield obj
+    finally:
+        stop.set()
+        # Producers blocked on the network finish in the background; don't wait for them.
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("ingestion streamed total=%s records", total)
@@ -0,0 +1,110 @@
+"""Skip feed entries that are already stored unchanged.
+
+Most entries in a feed were ingested on earlier runs. Before any per-entry work, the
+candidate `content_id`s of a feed are looked up in the repository in one batch; entries
+whose fingerprint (see `make_fingerprint`) matches the stored one, and whose image was
+checked recently, are dropped before image resolution (which may fetch the article page)
+and normalisation. Anything else, including every entry when the lookup fails, takes the
+normal path.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from typing import Any
+
+from provenance_feed.persistence.repository import FeedRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrecheckReport:
+    candidates: int = 0
+    # Entries dropped before image resolution and normalisation.
+    skipped: int = 0
+    new: int = 0
+    changed: int = 0
+    # Unchanged entries re-processed because their image check was too old.
+    stale_images: int = 0
+    lookups: int = 0
+    failed_lookups: int = 0
+
+    def add(self, other: PrecheckReport) -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+class KnownItemCheck:
+    """Thread-safe pre-check against the items already stored in `repo`."""
+
+    def __init__(
+        self,
+        repo: FeedRepository,
+        *,
+        image_recheck_after: timedelta = timedelta(days=1),
+    ) -> None:
+        self._repo = repo
+        self._image_recheck_after = image_recheck_after
+        self._lock = threading.Lock()
+        self._report = PrecheckReport()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Sent to ingestion worker processes: no lock or per-run counters.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_report"] = PrecheckReport()
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def unchanged(self, fingerprints: Mapping[str, bytes], *, now: datetime) -> set[str]:
+        """The `content_id`s among `fingerprints` that can be skipped, from one lookup."""
+
+        run = PrecheckReport(candidates=len(fingerprints), lookups=1)
+        skip: set[str] = set()
+        try:
+            stored = self._repo.known_items(list(fingerprints))
+        except Exception as e:
+            logger.warning("known-item pre-check failed (%s); processing all entries", e)
+            stored = {}
+            run.failed_lookups = 1
+
+        for content_id, fingerprint in fingerprints.items():
+            known = stored.get(content_id)
+            if known is None:
+                run.new += 1
+            elif known.fingerprint != fingerprint:
+                run.changed += 1
+            elif (
+                known.image_last_checked is None
+                or now - known.image_last_checked >= self._image_recheck_after
+            ):
+                run.stale_images += 1
+            else:
+                skip.add(content_id)
+        run.skipped = len(skip)
+
+        with self._lock:
+            self._report.add(run)
+        return skip
+
+    def report(self) -> PrecheckReport:
+        """Totals since this check was created."""
+
+        with self._lock:
+            total = PrecheckReport()
+            total.add(self._report)
+            return total
+
+    def merge(self, report: PrecheckReport) -> None:
+        """Fold in totals reported by another check (e.g. a worker process)."""
+
+        with self._lock:
+            self._report.add(report)
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
-import logging
+import functools
+from collections.abc import Iterator
 
-from provenance_feed.ingestion.rss_common import flatten
+from provenance_feed.ingestion.circuit_breaker import CircuitBreakers
+from provenance_feed.ingestion.http_client import HTTPClient
+from provenance_feed.ingestion.pipeline import stream_sources
+from provenance_feed.ingestion.precheck import KnownItemCheck
+from provenance_feed.ingestion.records import RawRecord
+from provenance_feed.ingestion.rss_common import (
+    FeedParser,
+    RSSSource,
+    iter_source_records,
+    parse_feed,
+)
 from provenance_feed.ingestion.rss_sources import (
     bbc,
     brookings,
@@ -12,26 +23,61 @@ from provenance_feed.ingestion.rss_sources import (
     npr,
     reliefweb,
 )
+from provenance_feed.ingestion.run_stats import RunStats
+from provenance_feed.profiling import StageProfiler
+
+SOURCES: tuple[RSSSource, ...] = (
+    bbc.BBC_WORLD,
+    npr.NPR_NEWS,
+    guardian.GUARDIAN_WORLD,
+    nasa.NASA_BREAKING,
+    # Legitimate but thinner/indirect sourcing (included to surface messiness; not endorsement).
+    brookings.BROOKINGS_FEED,
+    eff.EFF_UPDATES,
+    reliefweb.RELIEFWEB_UPDATES,
+)
 
-logger = logging.getLogger(__name__)
 
+def iter_all_records(
+    *,
+    timeout_seconds: float = 10.0,
+    max_workers: int = 4,
+    queue_size: int = 256,
+    breakers: CircuitBreakers | None = None,
+    client: HTTPClient | None = None,
+    known: KnownItemCheck | None = None,
+    profiler: StageProfiler | None = None,
+    stats: RunStats | None = None,
+    parser: FeedParser = parse_feed,
+) -> Iterator[RawRecord]:
+    """Fetch and parse all curated sources, streaming records as they arrive.
 
-def fetch_all_records(*, timeout_seconds: float = 10.0) -> list[dict]:
-    """Fetch and parse all curated sources.
+    With `profiler`, each fetch thread is profiled into its "fetch" stage. With a
+    `ParsePool`'s `parse` as `parser`, feeds are parsed in its worker processes.
 
     Coverage is intentionally incomplete: we ingest a small, curated set of sources.
     """
 
-    batches = [
-        bbc.ingest(timeout_seconds=timeout_seconds),
-        npr.ingest(timeout_seconds=timeout_seconds),
-        guardian.ingest(timeout_seconds=timeout_seconds),
-        nasa.ingest(timeout_seconds=timeout_seconds),
-        # Legitimate but thinner/indirect sourcing (included to surface messiness; not endorsement).
-        brookings.ingest(timeout_seconds=timeout_seconds),
-        eff.ingest(timeout_seconds=timeout_seconds),
-        reliefweb.ingest(timeout_seconds=timeout_seconds),
-    ]
-    records = flatten(batches)
-    logger.info("ingestion fetched total=%s records", len(records))
-    return records
+    fetch_source = functools.partial(
+        iter_source_records,
+        breakers=breakers,
+        client=client,
+        known=known,
+        stats=stats,
+        parser=parser,
+    )
+    if profiler is not None:
+        fetch_source = profiler.iterate("fetch", fetch_source)
+    return stream_sources(
+        SOURCES,
+        timeout_seconds=timeout_seconds,
+        max_workers=max_workers,
+        queue_size=queue_size,
+        fetch_source=fetch_source,
+    )
+
+
+def fetch_all_records(*, timeout_seconds: float = 10.0) -> list[RawRecord]:
+    """Fetch and parse all curated sources into one list."""
+
+    return list(iter_all_records(timeout_seconds=timeout_seconds))
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class RawRecord:
+    """One parsed upstream entry, before normalisation into a `FeedItem`.
+
+    Timestamps stay native datetimes from parsing through persistence. Fields can also
+    be read as `record["title"]`, like the plain dict records older sources produce;
+    `normalise_record` accepts either.
+    """
+
+    source: str
+    source_item_id: str
+    title: str
+    source_name: str
+    source_url: str
+    published_at: datetime
+    image_url: str | None = None
+    image_source: str | None = None
+    image_last_checked: datetime | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+# What sources yield: parsed RSS records, or plain dicts (mock data, tests).
+Record = RawRecord | dict[str, Any]
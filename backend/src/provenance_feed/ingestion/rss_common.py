@@ -2,15 +2,24 @@ from __future__ import annotations
 
 import hashlib
 import html.parser
+import itertools
 import logging
-from collections.abc import Callable, Iterable
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
-from urllib.request import Request, urlopen
 
 import feedparser
 
+from provenance_feed.domain.identifiers import make_fingerprint
+from provenance_feed.ingestion.circuit_breaker import CircuitBreakers
+from provenance_feed.ingestion.http_client import FetchResponse, HTTPClient, default_client
+from provenance_feed.ingestion.precheck import KnownItemCheck
+from provenance_feed.ingestion.records import RawRecord, Record
+from provenance_feed.ingestion.run_stats import RunStats
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,33 +95,46 @@ def _best_effort_published_at(entry: feedparser.FeedParserDict) -> datetime | No
     return datetime(*ts[:6], tzinfo=UTC)
 
 
-def fetch_feed_xml(*, url: str, timeout_seconds: float = 10.0) -> bytes:
-    req = Request(
+def fetch_feed(
+    *, url: str, timeout_seconds: float = 10.0, client: HTTPClient | None = None
+) -> FetchResponse:
+    return (client or default_client()).get(
         url,
         headers={
-            "User-Agent": "provenance-feed/0.1 (https://github.com/trickl/provenance-feed)",
             "Accept": (
                 "application/rss+xml, application/atom+xml, application/xml, "
                 "text/xml;q=0.9, */*;q=0.1"
             ),
         },
-        method="GET",
+        timeout_seconds=timeout_seconds,
     )
-    with urlopen(req, timeout=timeout_seconds) as resp:
-        return resp.read()
 
 
-def fetch_page_html(*, url: str, timeout_seconds: float = 10.0) -> bytes:
-    req = Request(
+def fetch_page(
+    *, url: str, timeout_seconds: float = 10.0, client: HTTPClient | None = None
+) -> FetchResponse:
+    return (client or default_client()).get(
         url,
-        headers={
-            "User-Agent": "provenance-feed/0.1 (https://github.com/trickl/provenance-feed)",
-            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
-        },
-        method="GET",
+        headers={"Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1"},
+        timeout_seconds=timeout_seconds,
     )
-    with urlopen(req, timeout=timeout_seconds) as resp:
-        return resp.read()
+
+
+def fetch_feed_xml(
+    *, url: str, timeout_seconds: float = 10.0, client: HTTPClient | None = None
+) -> bytes:
+    return fetch_feed(url=url, timeout_seconds=timeout_seconds, client=client).body
+
+
+def fetch_page_html(
+    *, url: str, timeout_seconds: float = 10.0, client: HTTPClient | None = None
+) -> bytes:
+    return fetch_page(url=url, timeout_seconds=timeout_seconds, client=client).body
+
+
+def _fetch_page(url: str, timeout_seconds: float) -> bytes:
+    # Positional adapter matching the `page_fetcher(url, timeout)` call signature.
+    return fetch_page_html(url=url, timeout_seconds=timeout_seconds)
 
 
 def _is_http_url(url: str | None) -> bool:
@@ -205,22 +227,22 @@ def extract_image_from_html_meta(*, html_bytes: bytes, base_url: str) -> str | N
 
 def resolve_image_for_entry(
     *,
-    entry: feedparser.FeedParserDict,
+    rss_image_url: str | None,
     canonical_url: str,
     now: datetime,
     timeout_seconds: float,
     page_fetcher: Callable[[str, float], bytes] | None,
-) -> tuple[str | None, str, str]:
+) -> tuple[str | None, str, datetime]:
     """Resolve image using RSS first, then page metadata.
 
-    Returns (image_url, image_source, image_last_checked_iso).
+    `rss_image_url` is the entry's own image, as found by `extract_image_from_rss_entry`.
+    Returns (image_url, image_source, image_last_checked).
     """
 
-    checked = now.astimezone(UTC).isoformat()
+    checked = now.astimezone(UTC)
 
-    rss_url = extract_image_from_rss_entry(entry)
-    if rss_url:
-        return rss_url, "rss", checked
+    if rss_image_url:
+        return rss_image_url, "rss", checked
 
     if page_fetcher is None:
         return None, "none", checked
@@ -237,33 +259,49 @@ def resolve_image_for_entry(
     return None, "none", checked
 
 
-def parse_rss_xml(
-    *,
-    xml: bytes,
-    source: RSSSource,
-    timeout_seconds: float = 10.0,
-    page_fetcher: Callable[[str, float], bytes] | None = fetch_page_html,
-    now: datetime | None = None,
-) -> list[dict]:
-    """Parse an RSS/Atom payload and return normalisation-ready raw records.
+@dataclass(frozen=True, slots=True)
+class ParsedEntry:
+    """A valid feed entry, reduced to the fields ingestion uses."""
+
+    title: str
+    canonical_url: str
+    source_item_id: str
+    published_at: datetime
+    rss_image_url: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedFeed:
+    """The outcome of parsing one feed payload; small enough to send between processes."""
+
+    entries: int
+    skipped: int
+    # content_id -> entry, valid and de-duplicated.
+    kept: dict[str, ParsedEntry]
+    # Type name of feedparser's bozo exception, if the payload was malformed.
+    bozo: str | None = None
+
+
+# Turns a raw feed payload into a `ParsedFeed`; `parse_feed`, or a `ParsePool`'s `parse`.
+FeedParser = Callable[[bytes, RSSSource], ParsedFeed]
 
-    Returns dicts compatible with `normalise_record()`.
+
+def parse_feed(xml: bytes, source: RSSSource) -> ParsedFeed:
+    """Parse an RSS/Atom payload, validating and de-duplicating its entries.
+
+    Pure and CPU-bound (no network), so it can run in a worker process; see
+    `provenance_feed.ingestion.parse_pool`.
     """
 
     parsed = feedparser.parse(xml)
 
+    bozo = None
     if parsed.bozo:
-        # bozo_exception is helpful but can contain huge reprs; log the type.
+        # bozo_exception is helpful but can contain huge reprs; keep the type.
         ex = getattr(parsed, "bozo_exception", None)
-        logger.warning(
-            "RSS parse bozo=%s for source=%s (%s): %s",
-            parsed.bozo,
-            source.source_id,
-            source.feed_url,
-            type(ex).__name__ if ex else "unknown",
-        )
+        bozo = type(ex).__name__ if ex else "unknown"
 
-    raw_by_content_id: dict[str, dict] = {}
+    kept: dict[str, ParsedEntry] = {}
     skipped = 0
 
     for entry in parsed.entries or []:
@@ -289,62 +327,211 @@ def parse_rss_xml(
         source_item_id = source_item_id_from_canonical_url(canonical_url)
         content_id = f"{source.source_id}:{source_item_id}"
 
-        n = now or datetime.now(tz=UTC)
-        image_url, image_source, image_last_checked = resolve_image_for_entry(
-            entry=entry,
-            canonical_url=canonical_url,
-            now=n,
-            timeout_seconds=timeout_seconds,
-            page_fetcher=page_fetcher,
-        )
+        # Duplicate handling: keep the most recent timestamp for the same content_id.
+        existing = kept.get(content_id)
+        if existing is None or published_at >= existing.published_at:
+            kept[content_id] = ParsedEntry(
+                title=title,
+                canonical_url=canonical_url,
+                source_item_id=source_item_id,
+                published_at=published_at,
+                rss_image_url=extract_image_from_rss_entry(entry),
+            )
 
-        record = {
-            "source": source.source_id,
-            "source_item_id": source_item_id,
-            "title": title,
-            "source_name": source.source_name,
-            "source_url": canonical_url,
-            "published_at": published_at.isoformat(),
-            "image_url": image_url,
-            "image_source": image_source,
-            "image_last_checked": image_last_checked,
-        }
+    return ParsedFeed(entries=len(parsed.entries or []), skipped=skipped, kept=kept, bozo=bozo)
 
-        # Duplicate handling: keep the most recent timestamp for the same content_id.
-        existing = raw_by_content_id.get(content_id)
-        if existing is None:
-            raw_by_content_id[content_id] = record
-        else:
-            try:
-                existing_dt = datetime.fromisoformat(existing["published_at"]).astimezone(UTC)
-                new_dt = datetime.fromisoformat(record["published_at"]).astimezone(UTC)
-            except Exception:
-                # If parsing fails, prefer the latest seen record.
-                raw_by_content_id[content_id] = record
-            else:
-                if new_dt >= existing_dt:
-                    raw_by_content_id[content_id] = record
 
+def iter_rss_records(
+    *,
+    xml: bytes,
+    source: RSSSource,
+    timeout_seconds: float = 10.0,
+    page_fetcher: Callable[[str, float], bytes] | None = _fetch_page,
+    now: datetime | None = None,
+    known: KnownItemCheck | None = None,
+    stats: RunStats | None = None,
+    parser: FeedParser = parse_feed,
+) -> Iterator[RawRecord]:
+    """Parse an RSS/Atom payload and lazily yield normalisation-ready raw records.
+
+    Entries are validated and de-duplicated up front by `parser` (cheap); the per-entry
+    image resolution, which may fetch the article page, happens only as records are
+    consumed. With `known`, entries already stored unchanged are dropped before that
+    point. With `stats`, entry counts and parse/enrich times are added to the source's
+    run stats.
+    """
+
+    started = time.perf_counter()
+    parsed = parser(xml, source)
+
+    if parsed.bozo:
+        logger.warning(
+            "RSS parse bozo=True for source=%s (%s): %s",
+            source.source_id,
+            source.feed_url,
+            parsed.bozo,
+        )
+
+    kept = dict(parsed.kept)
     logger.info(
         "parsed source=%s entries=%s kept=%s skipped=%s",
         source.source_id,
-        len(parsed.entries or []),
-        len(raw_by_content_id),
-        skipped,
+        parsed.entries,
+        len(kept),
+        parsed.skipped,
+    )
+
+    valid = len(kept)
+    unchanged: set[str] = set()
+    if known is not None and kept:
+        fingerprints = {
+            content_id: make_fingerprint(
+                title=e.title,
+                source_name=source.source_name,
+                source_url=e.canonical_url,
+                published_at=e.published_at,
+            )
+            for content_id, e in kept.items()
+        }
+        unchanged = known.unchanged(fingerprints, now=now or datetime.now(tz=UTC))
+        for content_id in unchanged:
+            del kept[content_id]
+        if unchanged:
+            logger.info("pre-check source=%s unchanged=%s", source.source_id, len(unchanged))
+
+    if stats is not None:
+        stats.add(
+            source.source_id,
+            parse_seconds=time.perf_counter() - started,
+            entries=parsed.entries,
+            kept=valid,
+            skipped=parsed.skipped,
+            precheck_unchanged=len(unchanged),
+        )
+    written = 0
+    enrich_seconds = 0.0
+    try:
+        for e in kept.values():
+            enrich_started = time.perf_counter()
+            image_url, image_source, image_last_checked = resolve_image_for_entry(
+                rss_image_url=e.rss_image_url,
+                canonical_url=e.canonical_url,
+                now=now or datetime.now(tz=UTC),
+                timeout_seconds=timeout_seconds,
+                page_fetcher=page_fetcher,
+            )
+            enrich_seconds += time.perf_counter() - enrich_started
+            written += 1
+            yield RawRecord(
+                source=source.source_id,
+                source_item_id=e.source_item_id,
+                title=e.title,
+                source_name=source.source_name,
+                source_url=e.canonical_url,
+                published_at=e.published_at,
+                image_url=image_url,
+                image_source=image_source,
+                image_last_checked=image_last_checked,
+            )
+    finally:
+        if stats is not None:
+            stats.add(source.source_id, written=written, enrich_seconds=enrich_seconds)
+
+
+def parse_rss_xml(
+    *,
+    xml: bytes,
+    source: RSSSource,
+    timeout_seconds: float = 10.0,
+    page_fetcher: Callable[[str, float], bytes] | None = _fetch_page,
+    now: datetime | None = None,
+    known: KnownItemCheck | None = None,
+    stats: RunStats | None = None,
+    parser: FeedParser = parse_feed,
+) -> list[RawRecord]:
+    """Parse an RSS/Atom payload and return normalisation-ready raw records."""
+
+    return list(
+        iter_rss_records(
+            xml=xml,
+            source=source,
+            timeout_seconds=timeout_seconds,
+            page_fetcher=page_fetcher,
+            now=now,
+            known=known,
+            stats=stats,
+            parser=parser,
+        )
     )
 
-    return list(raw_by_content_id.values())
+
+def iter_source_records(
+    *,
+    source: RSSSource,
+    timeout_seconds: float = 10.0,
+    breakers: CircuitBreakers | None = None,
+    client: HTTPClient | None = None,
+    known: KnownItemCheck | None = None,
+    stats: RunStats | None = None,
+    parser: FeedParser = parse_feed,
+) -> Iterator[RawRecord]:
+    """Fetch one RSS source and lazily yield raw normalisation records.
+
+    The feed and its article pages share `client` (the process-wide default if unset), so
+    page fetches to the publisher reuse its keep-alive connections.
+
+    With `breakers`, the feed and every article page go through the per-host circuit
+    breaker: a feed whose host is open raises `CircuitOpenError`, and article pages on an
+    open host are skipped (no page-meta image) without waiting for a timeout.
+
+    With `stats`, the feed's fetch time, bytes transferred (feed and pages) and any error
+    are recorded too.
+
+    `parser` turns the fetched payload into entries; pass a `ParsePool`'s `parse` to run
+    that in a worker process instead of on the calling thread.
+    """
+
+    def fetch_xml() -> bytes:
+        resp = fetch_feed(url=source.feed_url, timeout_seconds=timeout_seconds, client=client)
+        if stats is not None:
+            stats.add(source.source_id, bytes=resp.wire_bytes)
+        return resp.body
+
+    def page_fetcher(url: str, timeout: float) -> bytes:
+        def fetch() -> bytes:
+            resp = fetch_page(url=url, timeout_seconds=timeout, client=client)
+            if stats is not None:
+                stats.add(source.source_id, bytes=resp.wire_bytes)
+            return resp.body
+
+        return fetch() if breakers is None else breakers.call(url, fetch)
+
+    fetching = stats.timed(source.source_id, "fetch") if stats is not None else nullcontext()
+    try:
+        with fetching:
+            xml = fetch_xml() if breakers is None else breakers.call(source.feed_url, fetch_xml)
+        yield from iter_rss_records(
+            xml=xml,
+            source=source,
+            timeout_seconds=timeout_seconds,
+            page_fetcher=page_fetcher,
+            known=known,
+            stats=stats,
+            parser=parser,
+        )
+    except Exception as e:
+        if stats is not None:
+            stats.error(source.source_id, f"{type(e).__name__}: {e}")
+        raise
 
 
-def ingest_source(*, source: RSSSource, timeout_seconds: float = 10.0) -> list[dict]:
+def ingest_source(*, source: RSSSource, timeout_seconds: float = 10.0) -> list[RawRecord]:
     """Fetch and parse one RSS source into raw normalisation records."""
 
-    xml = fetch_feed_xml(url=source.feed_url, timeout_seconds=timeout_seconds)
-    return parse_rss_xml(xml=xml, source=source, timeout_seconds=timeout_seconds)
+    return list(iter_source_records(source=source, timeout_seconds=timeout_seconds))
+
 
+def flatten(batches: Iterable[Iterable[Record]]) -> Iterator[Record]:
+    """Lazily chain record batches (nothing is materialised)."""
 
-def flatten(records: Iterable[list[dict]]) -> list[dict]:
-    out: list[dict] = []
-    for batch in records:
-        out.extend(batch)
-    return out
+    return itertools.chain.from_iterable(batches)
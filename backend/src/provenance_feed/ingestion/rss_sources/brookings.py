@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from provenance_feed.ingestion.records import RawRecord
 from provenance_feed.ingestion.rss_common import RSSSource, ingest_source
 
 BROOKINGS_FEED = RSSSource(
@@ -9,5 +10,5 @@ BROOKINGS_FEED = RSSSource(
 )
 
 
-def ingest(timeout_seconds: float = 10.0) -> list[dict]:
+def ingest(timeout_seconds: float = 10.0) -> list[RawRecord]:
     return ingest_source(source=BROOKINGS_FEED, timeout_seconds=timeout_seconds)
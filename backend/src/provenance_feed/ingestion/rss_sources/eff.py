@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from provenance_feed.ingestion.records import RawRecord
 from provenance_feed.ingestion.rss_common import RSSSource, ingest_source
 
 EFF_UPDATES = RSSSource(
@@ -9,5 +10,5 @@ EFF_UPDATES = RSSSource(
 )
 
 
-def ingest(timeout_seconds: float = 10.0) -> list[dict]:
+def ingest(timeout_seconds: float = 10.0) -> list[RawRecord]:
     return ingest_source(source=EFF_UPDATES, timeout_seconds=timeout_seconds)
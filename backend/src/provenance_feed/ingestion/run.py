@@ -1,29 +1,69 @@
 from __future__ import annotations
 
+import argparse
 import logging
+import sys
+from pathlib import Path
 
-from provenance_feed.config import get_settings
-from provenance_feed.ingestion.real_sources import fetch_all_records
-from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.config import Settings, get_settings, leader_election
+from provenance_feed.ingestion.cycle import make_observer, run_ingestion
 from provenance_feed.persistence.sqlite import SQLiteFeedRepository
-from provenance_feed.provenance_graph.observer import ProvenanceGraphObserver
+from provenance_feed.profiling import StageProfiler
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingest the curated RSS sources once.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="shard sources across N fetch/parse processes (0 = single process)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="write cProfile stats per stage (fetch, persist, retention, archive, export) to DIR",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit with status 2 if the run is flagged as a throughput regression",
+    )
+    args = parser.parse_args(argv)
+
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     settings = get_settings()
-    repo = SQLiteFeedRepository(database_path=settings.database_path)
+
+    # Only one process sharing the database ingests at a time (see provenance_feed.leader).
+    with leader_election(settings) as election:
+        if not election.is_leader:
+            holder = getattr(election.lease(), "holder", "another process")
+            print(f"Not ingesting: the ingestion lease is held by {holder}")
+            return
+        regressed = _ingest(args, settings)
+
+    if regressed and args.fail_on_regression:
+        sys.exit(2)
+
+
+def _ingest(args: argparse.Namespace, settings: Settings) -> bool:
+    """One ingestion run; returns whether it was flagged as a throughput regression."""
+
+    repo = SQLiteFeedRepository(
+        database_path=settings.database_path,
+        slow_query_seconds=settings.slow_query_seconds,
+        partition_dir=settings.partition_dir,
+    )
     repo.init_schema()
-    observer = ProvenanceGraphObserver(
-        enabled=settings.provenance_graph_observe_enabled,
-        observe_url=settings.provenance_graph_observe_url,
-        api_key=settings.provenance_graph_write_api_key,
-        timeout_seconds=settings.provenance_graph_observe_timeout_seconds,
-        queue_size=settings.provenance_graph_observe_queue_size,
+    outcome = run_ingestion(
+        settings=settings,
+        repo=repo,
+        observer=make_observer(settings),
+        workers=args.workers,
+        profiler=StageProfiler(args.profile) if args.profile is not None else None,
     )
-    records = fetch_all_records()
-    count = ingest_once(repo=repo, records=records, observer=observer)
-    print(f"Ingested {count} items")
+    return outcome.regressed
 
 
 if __name__ == "__main__":
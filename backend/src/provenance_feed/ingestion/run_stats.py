@@ -0,0 +1,126 @@
+"""Per-source counters and stage timings for one ingestion run.
+
+Collected while the run streams (from the fetch threads, or from worker processes that
+report theirs back) and recorded in the run ledger at the end; see
+`provenance_feed.persistence.ingest_runs`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+from provenance_feed.persistence.ingest_runs import IngestRun, IngestRunSource
+
+
+@dataclass
+class SourceStats:
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    enrich_seconds: float = 0.0
+    bytes: int = 0
+    entries: int = 0
+    kept: int = 0
+    skipped: int = 0
+    # Kept entries dropped by the pre-check as already stored unchanged.
+    precheck_unchanged: int = 0
+    written: int = 0
+    error: str | None = None
+
+    def add(self, other: SourceStats) -> None:
+        for f in dataclasses.fields(self):
+            if f.name != "error":
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        self.error = self.error or other.error
+
+
+class RunStats:
+    """Thread-safe run statistics. Copies sent to worker processes start empty; their
+    `sources()` are merged back into the parent's."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sources: dict[str, SourceStats] = {}
+        self.persist_seconds = 0.0
+
+    def __getstate__(self) -> dict[str, object]:
+        return {}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__()
+
+    def add(self, source_id: str, **counts: float) -> None:
+        with self._lock:
+            stats = self._sources.setdefault(source_id, SourceStats())
+            for name, value in counts.items():
+                setattr(stats, name, getattr(stats, name) + value)
+
+    @contextmanager
+    def timed(self, source_id: str, stage: str) -> Iterator[None]:
+        """Add the time spent in the block to `<stage>_seconds` of `source_id`."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(source_id, **{f"{stage}_seconds": time.perf_counter() - started})
+
+    def error(self, source_id: str, message: str) -> None:
+        with self._lock:
+            self._sources.setdefault(source_id, SourceStats()).error = message
+
+    def add_persist_seconds(self, seconds: float) -> None:
+        with self._lock:
+            self.persist_seconds += seconds
+
+    def sources(self) -> dict[str, SourceStats]:
+        with self._lock:
+            return {k: dataclasses.replace(v) for k, v in self._sources.items()}
+
+    def merge(self, sources: Mapping[str, SourceStats]) -> None:
+        with self._lock:
+            for source_id, stats in sources.items():
+                self._sources.setdefault(source_id, SourceStats()).add(stats)
+
+    def to_run(
+        self,
+        *,
+        started_at: datetime,
+        finished_at: datetime,
+        writes: Mapping[str, tuple[int, int]],
+    ) -> IngestRun:
+        """The ledger entry for this run; `writes` is (inserted, updated) per source as
+        counted by the repository."""
+
+        sources = []
+        for source_id, s in sorted(self.sources().items()):
+            inserted, updated = writes.get(source_id, (0, 0))
+            sources.append(
+                IngestRunSource(
+                    source_id=source_id,
+                    fetch_seconds=s.fetch_seconds,
+                    parse_seconds=s.parse_seconds,
+                    enrich_seconds=s.enrich_seconds,
+                    bytes=s.bytes,
+                    entries=s.entries,
+                    kept=s.kept,
+                    skipped=s.skipped,
+                    written=s.written,
+                    inserted=inserted,
+                    updated=updated,
+                    unchanged=s.precheck_unchanged + max(0, s.written - inserted - updated),
+                    error=s.error,
+                )
+            )
+        return IngestRun(
+            run_id=None,
+            started_at=started_at,
+            finished_at=finished_at,
+            persist_seconds=self.persist_seconds,
+            sources=tuple(sources),
+        )
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import itertools
+import time
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Protocol
 
 from provenance_feed.domain.identifiers import make_content_id
 from provenance_feed.domain.models import FeedItem
+from provenance_feed.ingestion.records import RawRecord, Record
+from provenance_feed.ingestion.run_stats import RunStats
 from provenance_feed.persistence.repository import FeedRepository
 from provenance_feed.provenance_graph.observer import safe_observe
 
@@ -22,10 +27,28 @@ This boundary helps prevent ingestion from quietly turning into a data warehouse
 """
 
 
-def normalise_record(raw: dict) -> FeedItem:
-    """Normalise a raw ingestion record into the canonical FeedItem model."""
+def normalise_record(raw: Record) -> FeedItem:
+    """Normalise a raw ingestion record into the canonical FeedItem model.
+
+    `RawRecord`s carry native datetimes; plain dict records carry ISO-8601 strings.
+    """
 
     content_id = make_content_id(source=raw["source"], source_item_id=raw["source_item_id"])
+    if isinstance(raw, RawRecord):
+        published_at = FeedItem.ensure_utc(raw.published_at)
+        checked = raw.image_last_checked
+        image_last_checked_dt = FeedItem.ensure_utc(checked) if checked is not None else None
+        return FeedItem(
+            content_id=content_id,
+            title=raw.title.strip(),
+            source_name=raw.source_name.strip(),
+            source_url=raw.source_url.strip(),
+            published_at=published_at,
+            image_url=raw.image_url or None,
+            image_source=raw.image_source or None,
+            image_last_checked=image_last_checked_dt,
+        )
+
     published_at = datetime.fromisoformat(raw["published_at"])
     published_at = FeedItem.ensure_utc(published_at)
 
@@ -57,15 +80,42 @@ class ContentObserver(Protocol):
 def ingest_once(
     *,
     repo: FeedRepository,
-    records: list[dict],
+    records: Iterable[Record],
     observer: ContentObserver | None = None,
+    batch_size: int | None = None,
+    stats: RunStats | None = None,
 ) -> int:
-    """Ingest and persist records. Returns number of items upserted."""
-
-    items = [normalise_record(r) for r in records]
-    for item in items:
-        repo.upsert(item)
-        # Best-effort, non-blocking observational hook.
+    """Ingest and persist records. Returns number of items upserted.
+
+    `records` is consumed lazily, so a streaming source is persisted as it arrives and
+    memory is bounded by the batch rather than by the run. By default each item is
+    upserted on its own. With `batch_size`, items are written with `repo.upsert_many`
+    in transactions of that size; a batch is observed only after it has been committed.
+    With `stats`, the time spent writing is added to its `persist_seconds`.
+    """
+
+    items = (normalise_record(r) for r in records)
+    count = 0
+    if batch_size is None:
+        for item in items:
+            started = time.perf_counter()
+            repo.upsert(item)
+            if stats is not None:
+                stats.add_persist_seconds(time.perf_counter() - started)
+            count += 1
+            # Best-effort, non-blocking observational hook.
+            if observer is not None:
+                safe_observe(observer, item=item)
+        return count
+
+    step = max(1, batch_size)
+    while batch := list(itertools.islice(items, step)):
+        started = time.perf_counter()
+        repo.upsert_many(batch)
+        if stats is not None:
+            stats.add_persist_seconds(time.perf_counter() - started)
+        count += len(batch)
         if observer is not None:
-            safe_observe(observer, item=item)
-    return len(items)
+            for item in batch:
+                safe_observe(observer, item=item)
+    return count
@@ -0,0 +1,133 @@
+"""Leader election for ingestion.
+
+Several processes may be configured to ingest (uvicorn `--workers`, replicas sharing the
+database volume, the CLI run from cron), but only the holder of the "ingestion" lease
+does. The leader renews its lease on a heartbeat; if it dies, the lease expires and the
+next process to try takes over.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from provenance_feed.persistence.leases import Lease, SQLiteLeaseStore
+
+logger = logging.getLogger(__name__)
+
+INGESTION_LEASE = "ingestion"
+
+
+def default_holder_id() -> str:
+    """Unique per process, and readable enough to tell who holds a lease."""
+
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderElection:
+    """Holds (or keeps trying to take) a lease from a background heartbeat thread.
+
+    `is_leader` is judged locally: it turns false once the last successful renewal is
+    `ttl_seconds` old, which is no later than other processes see the lease expire, so
+    two processes never both consider themselves leader (given synchronised clocks).
+    """
+
+    def __init__(
+        self,
+        store: SQLiteLeaseStore,
+        *,
+        name: str = INGESTION_LEASE,
+        holder: str | None = None,
+        ttl_seconds: float = 30.0,
+        heartbeat_seconds: float = 10.0,
+    ) -> None:
+        self.name = name
+        self.holder = holder or default_holder_id()
+        self._store = store
+        self._ttl_seconds = ttl_seconds
+        self._heartbeat_seconds = heartbeat_seconds
+        self._lock = threading.Lock()
+        # Monotonic time the held lease runs out; None while not leader.
+        self._valid_until: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> LeaderElection:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    @property
+    def is_leader(self) -> bool:
+        with self._lock:
+            return self._holds_lease()
+
+    def _holds_lease(self) -> bool:
+        return self._valid_until is not None and time.monotonic() < self._valid_until
+
+    def lease(self) -> Lease | None:
+        """The lease as stored, whoever holds it."""
+
+        return self._store.get(self.name)
+
+    def start(self) -> bool:
+        """Try for the lease once, then keep heartbeating in the background. Returns
+        whether this process is leader now."""
+
+        self.heartbeat()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{self.name}", daemon=True)
+        self._thread.start()
+        return self.is_leader
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._heartbeat_seconds):
+            self.heartbeat()
+
+    def heartbeat(self) -> None:
+        """Take or renew the lease."""
+
+        started = time.monotonic()
+        try:
+            acquired = self._store.try_acquire(
+                self.name, self.holder, ttl_seconds=self._ttl_seconds
+            )
+        except sqlite3.Error as e:
+            # Keep any lease held so far; it simply runs out if renewals keep failing.
+            logger.warning("lease %s heartbeat failed: %s", self.name, e)
+            acquired = None
+        with self._lock:
+            was_leader = self._holds_lease()
+            if acquired:
+                self._valid_until = started + self._ttl_seconds
+            elif acquired is False:
+                self._valid_until = None
+            is_leader = self._holds_lease()
+        if is_leader and not was_leader:
+            logger.info("acquired lease %s (holder=%s)", self.name, self.holder)
+        elif was_leader and not is_leader:
+            logger.warning("lost lease %s (holder=%s)", self.name, self.holder)
+
+    def stop(self, *, release: bool = True) -> None:
+        """Stop heartbeating. With `release`, give the lease up so another process can
+        take over at once; otherwise it is left to expire."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            was_leader = self._holds_lease()
+            self._valid_until = None
+        if was_leader and release:
+            try:
+                self._store.release(self.name, self.holder)
+            except sqlite3.Error as e:
+                logger.warning("lease %s release failed: %s", self.name, e)
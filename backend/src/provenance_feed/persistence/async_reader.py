@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, TypeVar
+
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.repository import FeedCursor, FeedRepository
+from provenance_feed.profiling import in_active_stage
+
+T = TypeVar("T")
+
+
+class AsyncFeedReader:
+    """Async read path over a (blocking) FeedRepository.
+
+    Reads run on a dedicated, bounded thread pool rather than Starlette's shared
+    threadpool, so bursty read traffic queues for the database instead of for threads,
+    and read concurrency is limited independently of everything else in the process.
+
+    With `profiled=True`, reads made while a request is being profiled are profiled on
+    the pool thread too (see `provenance_feed.profiling`).
+    """
+
+    def __init__(
+        self, *, repo: FeedRepository, max_workers: int = 4, profiled: bool = False
+    ) -> None:
+        self._repo = repo
+        self._profiled = profiled
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="feed-reader",
+        )
+
+    async def _run(self, fn, /, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, **kwargs)
+        if self._profiled:
+            call = in_active_stage(call)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def list_latest(
+        self,
+        *,
+        limit: int = 50,
+        before: FeedCursor | None = None,
+        source: str | None = None,
+        collapse: bool = False,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[FeedItem]:
+        return await self._run(
+            self._repo.list_latest,
+            limit=limit,
+            before=before,
+            source=source,
+            collapse=collapse,
+            since=since,
+            until=until,
+        )
+
+    async def iterate(
+        self, chunks: Callable[..., Iterator[T]], /, **kwargs: Any
+    ) -> AsyncIterator[T]:
+        """Run `chunks(repo, **kwargs)`, a blocking generator over the repository, on the
+        reader pool, one step at a time (e.g. `export.ndjson.ndjson_chunks`)."""
+
+        done = object()
+        iterator = chunks(self._repo, **kwargs)
+        while (chunk := await self._run(functools.partial(next, iterator, done))) is not done:
+            yield chunk
+
+    async def get_many(self, content_ids: Sequence[str]) -> dict[str, FeedItem]:
+        return await self._run(self._repo.get_many, content_ids=content_ids)
+
+    async def generation(self) -> int:
+        return await self._run(self._repo.generation)
+
+    async def inserted_since(self, *, after: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        return await self._run(self._repo.inserted_since, after=after, limit=limit)
+
+    async def list_changes(self, *, since: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        return await self._run(self._repo.list_changes, since=since, limit=limit)
+
+    async def last_inserted(self) -> int:
+        return await self._run(self._repo.last_inserted)
+
+    def close(self) -> None:
+        # Queued reads are dropped; running ones finish, so the repository's connections
+        # can be closed next.
+        self._executor.shutdown(wait=True, cancel_futures=True)
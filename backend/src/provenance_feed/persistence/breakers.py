@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from provenance_feed.persistence.sqlite import from_epoch_us, init_database, to_epoch_us
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class HostBreaker:
+    """Circuit-breaker state for one host."""
+
+    host: str
+    state: str = CLOSED
+    # Consecutive failures while closed.
+    failures: int = 0
+    # Consecutive trips without a successful probe; drives the growing cool-down.
+    trips: int = 0
+    open_until: datetime | None = None
+
+
+class SQLiteBreakerStore:
+    """Persists `HostBreaker` state in the feed database so cool-downs span runs."""
+
+    def __init__(self, database_path: Path) -> None:
+        self._database_path = database_path
+
+    def init_schema(self) -> None:
+        init_database(self._database_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._database_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def load_breakers(self) -> list[HostBreaker]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT host, state, failures, trips, open_until FROM host_breakers"
+            ).fetchall()
+        return [
+            HostBreaker(
+                host=r["host"],
+                state=r["state"],
+                failures=r["failures"],
+                trips=r["trips"],
+                open_until=from_epoch_us(r["open_until"]) if r["open_until"] is not None else None,
+            )
+            for r in rows
+        ]
+
+    def save_breakers(self, breakers: Iterable[HostBreaker]) -> None:
+        now = to_epoch_us(datetime.now(tz=UTC))
+        rows = []
+        for b in breakers:
+            # A probe interrupted by the end of the run is retried next run.
+            state = OPEN if b.state == HALF_OPEN else b.state
+            rows.append(
+                (
+                    b.host,
+                    state,
+                    b.failures,
+                    b.trips,
+                    to_epoch_us(b.open_until) if b.open_until else None,
+                    now,
+                )
+            )
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO host_breakers(host, state, failures, trips, open_until, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(host) DO UPDATE SET
+                  state=excluded.state,
+                  failures=excluded.failures,
+                  trips=excluded.trips,
+                  open_until=excluded.open_until,
+                  updated_at=excluded.updated_at
+                """,
+                rows,
+            )
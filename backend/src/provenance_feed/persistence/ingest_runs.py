@@ -0,0 +1,204 @@
+"""Ingestion run ledger.
+
+Every run of the ingestion CLI is recorded in `ingest_runs`, with one `ingest_run_sources`
+row per source, so throughput can be compared across runs. `compare_to_baseline` checks
+the latest run against the median of the runs before it.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import statistics
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime
+from pathlib import Path
+
+from provenance_feed.persistence.sqlite import init_database
+
+
+@dataclass(frozen=True)
+class IngestRunSource:
+    """One source's share of a run. Stage times are summed over fetch threads."""
+
+    source_id: str
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    enrich_seconds: float = 0.0
+    # Bytes on the wire for the feed and its article pages.
+    bytes: int = 0
+    # Entries in the feed; those valid and de-duplicated (`kept`) or invalid (`skipped`).
+    entries: int = 0
+    kept: int = 0
+    skipped: int = 0
+    # Kept entries handed on for persistence (the rest were unchanged per the pre-check),
+    # and what persisting them did.
+    written: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    error: str | None = None
+
+
+# Numeric `IngestRunSource` fields, which also make up the run's totals.
+SOURCE_TOTALS = tuple(
+    f.name for f in fields(IngestRunSource) if f.name not in ("source_id", "error")
+)
+
+
+@dataclass(frozen=True)
+class IngestRun:
+    run_id: int | None
+    started_at: datetime
+    finished_at: datetime
+    persist_seconds: float
+    sources: tuple[IngestRunSource, ...]
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished_at - self.started_at).total_seconds()
+
+    @property
+    def errors(self) -> int:
+        return sum(s.error is not None for s in self.sources)
+
+    def total(self, name: str) -> float:
+        """Sum of a per-source counter or stage time over all sources."""
+
+        return sum(getattr(s, name) for s in self.sources)
+
+
+def _per(numerator: float, denominator: float) -> float | None:
+    return numerator / denominator if denominator > 0 else None
+
+
+def run_metrics(run: IngestRun) -> dict[str, tuple[float | None, bool]]:
+    """Throughput metrics compared against the baseline, as name -> (value, whether
+    higher is better). A value is None when the run did no work of that kind."""
+
+    entries = run.total("entries")
+    written = run.total("written")
+    return {
+        "entries_per_second": (_per(entries, run.seconds), True),
+        "fetch_bytes_per_second": (_per(run.total("bytes"), run.total("fetch_seconds")), True),
+        "parse_ms_per_entry": (_per(run.total("parse_seconds") * 1000, entries), False),
+        "enrich_ms_per_written": (_per(run.total("enrich_seconds") * 1000, written), False),
+        "persist_ms_per_written": (_per(run.persist_seconds * 1000, written), False),
+    }
+
+
+@dataclass(frozen=True)
+class MetricComparison:
+    metric: str
+    latest: float
+    baseline: float
+    # Relative change, signed so that positive is always worse.
+    regression: float
+    regressed: bool
+
+
+def compare_to_baseline(
+    latest: IngestRun,
+    previous: Sequence[IngestRun],
+    *,
+    threshold: float = 0.25,
+    min_runs: int = 3,
+) -> list[MetricComparison]:
+    """Compare `latest` with the median of `previous` runs, metric by metric. A metric
+    regressed if it is more than `threshold` (relative) worse than its baseline. Runs
+    that had source errors are left out of the baseline; with fewer than `min_runs`
+    usable runs nothing is compared."""
+
+    baseline_runs = [run_metrics(r) for r in previous if not r.errors]
+    comparisons = []
+    for metric, (value, higher_is_better) in run_metrics(latest).items():
+        history = [m[metric][0] for m in baseline_runs if m[metric][0] is not None]
+        if value is None or len(history) < max(1, min_runs):
+            continue
+        baseline = statistics.median(history)
+        if baseline == 0:
+            continue
+        change = (value - baseline) / baseline
+        regression = -change if higher_is_better else change
+        comparisons.append(
+            MetricComparison(
+                metric=metric,
+                latest=value,
+                baseline=baseline,
+                regression=regression,
+                regressed=regression > threshold,
+            )
+        )
+    return comparisons
+
+
+_SOURCE_COLUMNS = tuple(f.name for f in fields(IngestRunSource))
+
+
+class SQLiteIngestRunStore:
+    """Records ingestion runs in the feed database."""
+
+    def __init__(self, database_path: Path) -> None:
+        self._database_path = database_path
+
+    def init_schema(self) -> None:
+        init_database(self._database_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._database_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def record(self, run: IngestRun) -> int:
+        """Store a run and its sources; returns the new `run_id`."""
+
+        with self._connect() as conn:
+            run_id = conn.execute(
+                """
+                INSERT INTO ingest_runs (started_at, finished_at, persist_seconds)
+                VALUES (?, ?, ?)
+                """,
+                (
+                    run.started_at.astimezone(UTC).isoformat(),
+                    run.finished_at.astimezone(UTC).isoformat(),
+                    run.persist_seconds,
+                ),
+            ).lastrowid
+            conn.executemany(
+                f"""
+                INSERT INTO ingest_run_sources (run_id, {", ".join(_SOURCE_COLUMNS)})
+                VALUES (?, {", ".join("?" for _ in _SOURCE_COLUMNS)})
+                """,
+                [(run_id, *(getattr(s, c) for c in _SOURCE_COLUMNS)) for s in run.sources],
+            )
+        return run_id
+
+    def list_runs(self, *, limit: int = 20) -> list[IngestRun]:
+        """Most recent runs first."""
+
+        with self._connect() as conn:
+            runs = conn.execute(
+                "SELECT * FROM ingest_runs ORDER BY run_id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            if not runs:
+                return []
+            sources: dict[int, list[IngestRunSource]] = {r["run_id"]: [] for r in runs}
+            for r in conn.execute(
+                f"""
+                SELECT run_id, {", ".join(_SOURCE_COLUMNS)} FROM ingest_run_sources
+                WHERE run_id >= ? ORDER BY run_id, source_id
+                """,
+                (runs[-1]["run_id"],),
+            ):
+                sources[r["run_id"]].append(IngestRunSource(**{c: r[c] for c in _SOURCE_COLUMNS}))
+        return [
+            IngestRun(
+                run_id=r["run_id"],
+                started_at=datetime.fromisoformat(r["started_at"]),
+                finished_at=datetime.fromisoformat(r["finished_at"]),
+                persist_seconds=r["persist_seconds"],
+                sources=tuple(sources[r["run_id"]]),
+            )
+            for r in runs
+        ]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from provenance_feed.persistence.sqlite import init_database
+
+
+@dataclass(frozen=True)
+class Lease:
+    name: str
+    holder: str
+    # Wall-clock (Unix) seconds; holders on different hosts must have synchronised clocks.
+    acquired_at: float
+    expires_at: float
+
+
+class SQLiteLeaseStore:
+    """Named, expiring leases in the feed database, for electing a single leader among
+    the processes (and hosts) sharing it."""
+
+    def __init__(self, database_path: Path) -> None:
+        self._database_path = database_path
+
+    def init_schema(self) -> None:
+        init_database(self._database_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._database_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def try_acquire(
+        self, name: str, holder: str, *, ttl_seconds: float, now: float | None = None
+    ) -> bool:
+        """Take the lease if it is free or expired, or renew it if `holder` has it.
+        Atomic: of several processes racing for an expired lease, exactly one wins."""
+
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO leases (name, holder, acquired_at, expires_at)
+                VALUES (:name, :holder, :now, :expires_at)
+                ON CONFLICT (name) DO UPDATE SET
+                  acquired_at = CASE WHEN leases.holder = excluded.holder
+                                     THEN leases.acquired_at ELSE excluded.acquired_at END,
+                  holder = excluded.holder,
+                  expires_at = excluded.expires_at
+                WHERE leases.holder = excluded.holder OR leases.expires_at <= :now
+                """,
+                {"name": name, "holder": holder, "now": now, "expires_at": now + ttl_seconds},
+            )
+            return cur.rowcount == 1
+
+    def release(self, name: str, holder: str) -> None:
+        """Give the lease up early, if `holder` still has it."""
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+
+    def get(self, name: str) -> Lease | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT name, holder, acquired_at, expires_at FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+        return Lease(**row) if row else None
@@ -0,0 +1,73 @@
+"""Offline maintenance of the feed database.
+
+    python -m provenance_feed.persistence.maintenance migrate
+    python -m provenance_feed.persistence.maintenance vacuum
+
+`migrate` applies pending schema migrations, as API startup and ingestion otherwise do on
+first use; run it ahead of a deploy to keep the upgrade out of the serving path.
+
+`vacuum` rebuilds the file, switching databases created before incremental auto-vacuum
+over to it. It rewrites every page and blocks writers while it runs, so it is an explicit
+step for a quiet moment, never something startup does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from provenance_feed.persistence.sqlite import init_database
+
+
+def migrate(database_path: Path) -> tuple[int, int]:
+    """Apply pending schema migrations. Returns the schema version before and after."""
+
+    before = _schema_version(database_path) if database_path.exists() else 0
+    init_database(database_path)
+    return before, _schema_version(database_path)
+
+
+def _schema_version(database_path: Path) -> int:
+    conn = sqlite3.connect(database_path)
+    try:
+        return conn.execute("PRAGMA user_version;").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def vacuum(database_path: Path) -> tuple[int, int]:
+    """Rebuild the database in incremental auto-vacuum mode. Returns the file size in
+    bytes before and after."""
+
+    init_database(database_path)
+    before = database_path.stat().st_size
+    conn = sqlite3.connect(database_path)
+    try:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        conn.execute("VACUUM;")
+    finally:
+        conn.close()
+    return before, database_path.stat().st_size
+
+
+def main(argv: list[str] | None = None) -> None:
+    from provenance_feed.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Maintain the feed database.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="apply pending schema migrations")
+    commands.add_parser("vacuum", help="rebuild the file (blocks writers while it runs)")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    if args.command == "migrate":
+        before, after = migrate(settings.database_path)
+        print(f"Migrated {settings.database_path}: schema version {before} -> {after}")
+        return
+    before, after = vacuum(settings.database_path)
+    print(f"Vacuumed {settings.database_path}: {before} -> {after} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Time-partitioned storage for long history.
+
+With a partition directory configured, `feed_items` holds only recent items (the hot
+partition). Older items are moved out a calendar month at a time (by `published_at`) into
+one SQLite file per month, `feed-YYYY-MM.db`, listed in the `feed_partitions` table.
+
+Reads that a page of hot items can satisfy never touch the month files, so recent-window
+latency does not depend on how much history is kept. Deep cursors merge the month files
+in, newest first, stopping as soon as no older month can contribute.
+
+A month file is self-contained (it carries the `sources` rows it references), so it can be
+detached, moved to cold storage and attached again as a whole:
+
+    python -m provenance_feed.persistence.partitions list|archive|detach MONTH|attach MONTH
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Columns of `feed_items` (schema version 3) copied into a month file, in order.
+FEED_ITEM_COLUMNS = (
+    "item_id",
+    "source_id",
+    "item_key",
+    "title",
+    "source_name",
+    "source_url",
+    "published_at",
+    "image_url",
+    "image_source",
+    "image_last_checked",
+    "created_at",
+    "cluster_id",
+    "title_signature",
+    "change_seq",
+)
+
+# A month file mirrors `feed_items` and the indexes reads use; it has no triggers, since
+# it is only ever written by archiving.
+_PARTITION_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS partition_meta (
+      id INTEGER PRIMARY KEY CHECK (id = 1),
+      month TEXT NOT NULL,
+      lower_us INTEGER NOT NULL,
+      upper_us INTEGER NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sources (
+      source_id INTEGER PRIMARY KEY,
+      source_key TEXT NOT NULL UNIQUE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feed_items (
+      item_id INTEGER PRIMARY KEY,
+      source_id INTEGER NOT NULL,
+      item_key BLOB NOT NULL,
+      title TEXT NOT NULL,
+      source_name TEXT NOT NULL,
+      source_url TEXT NOT NULL,
+      published_at INTEGER NOT NULL,
+      image_url TEXT,
+      image_source TEXT,
+      image_last_checked INTEGER,
+      created_at INTEGER NOT NULL,
+      cluster_id TEXT,
+      title_signature BLOB,
+      change_seq INTEGER NOT NULL,
+      UNIQUE (source_id, item_key)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_feed_items_feed_order "
+    "ON feed_items (published_at, source_id, item_key);",
+    "CREATE INDEX IF NOT EXISTS idx_feed_items_source_order "
+    "ON feed_items (source_id, published_at, item_key);",
+    "CREATE INDEX IF NOT EXISTS idx_feed_items_cluster ON feed_items (cluster_id, published_at);",
+    "CREATE INDEX IF NOT EXISTS idx_feed_items_change_seq ON feed_items (change_seq);",
+)
+
+
+@dataclass(frozen=True)
+class Partition:
+    """A month file holding items with `lower_us <= published_at < upper_us`."""
+
+    month: str
+    path: Path
+    lower_us: int
+    upper_us: int
+    rows: int
+    max_change_seq: int
+
+
+@dataclass(frozen=True)
+class ArchiveReport:
+    rows_moved: int
+    months: tuple[str, ...]
+
+
+def partition_file(month: str) -> str:
+    return f"feed-{month}.db"
+
+
+def month_start(dt: datetime) -> datetime:
+    return dt.astimezone(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    years, month = divmod(dt.month - 1 + months, 12)
+    return dt.replace(year=dt.year + years, month=month + 1)
+
+
+def month_name(dt: datetime) -> str:
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+
+def create_partition_file(path: Path, *, month: str, lower_us: int, upper_us: int) -> None:
+    """Create (or check) the month file at `path`."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            for statement in _PARTITION_SCHEMA:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT OR IGNORE INTO partition_meta (id, month, lower_us, upper_us) "
+                "VALUES (1, ?, ?, ?);",
+                (month, lower_us, upper_us),
+            )
+    finally:
+        conn.close()
+
+
+def read_partition_file(path: Path) -> Partition:
+    """Describe a month file from its own contents."""
+
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        month, lower_us, upper_us = conn.execute(
+            "SELECT month, lower_us, upper_us FROM partition_meta WHERE id = 1;"
+        ).fetchone()
+        rows, max_change_seq = conn.execute(
+            "SELECT count(*), coalesce(max(change_seq), 0) FROM feed_items;"
+        ).fetchone()
+    finally:
+        conn.close()
+    return Partition(
+        month=month,
+        path=path,
+        lower_us=lower_us,
+        upper_us=upper_us,
+        rows=rows,
+        max_change_seq=max_change_seq,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    from provenance_feed.config import get_settings
+    from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+    parser = argparse.ArgumentParser(description="Manage the feed's month partitions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list attached month partitions")
+    commands.add_parser("archive", help="move items older than the hot window out now")
+    for name, help in (
+        ("detach", "stop reading a month file (it is left in place)"),
+        ("attach", "read a month file (back) from the partition directory"),
+    ):
+        commands.add_parser(name, help=help).add_argument("month", help="YYYY-MM")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    if settings.partition_dir is None:
+        parser.error("BACKEND_PARTITION_DIR is not set")
+    repo = SQLiteFeedRepository(
+        database_path=settings.database_path, partition_dir=settings.partition_dir
+    )
+    repo.init_schema()
+
+    if args.command == "archive":
+        report = repo.archive(hot_months=settings.partition_hot_months)
+        print(f"Archived {report.rows_moved} items ({', '.join(report.months) or 'none due'})")
+    elif args.command == "detach":
+        print(f"Detached {repo.detach_partition(args.month)}")
+    elif args.command == "attach":
+        p = repo.attach_partition(args.month)
+        print(f"Attached {p.path} ({p.rows} items)")
+    for p in repo.partitions():
+        print(f"{p.month}  {p.rows:>8} items  {p.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,62 @@
 from __future__ import annotations
 
+import base64
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Protocol
 
 from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.retention import PruneReport, RetentionPolicy
+
+
+@dataclass(frozen=True)
+class FeedCursor:
+    """Keyset position in the feed order (`published_at` DESC, then a stable per-item
+    tie-break chosen by the repository).
+
+    A page "before" a cursor contains only items strictly after it in feed order.
+    """
+
+    published_at: datetime
+    content_id: str
+
+    @classmethod
+    def after(cls, item: FeedItem) -> FeedCursor:
+        return cls(
+            published_at=FeedItem.ensure_utc(item.published_at),
+            content_id=item.content_id,
+        )
+
+    def encode(self) -> str:
+        raw = f"{FeedItem.ensure_utc(self.published_at).isoformat()}|{self.content_id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> FeedCursor:
+        """Parse an opaque cursor token. Raises ValueError if it is malformed."""
+
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            published_at, sep, content_id = raw.partition("|")
+            source, colon, item = content_id.partition(":")
+            if not sep or not colon or not source or not item:
+                raise ValueError("content_id must be 'source:source_item_id'")
+            return cls(
+                published_at=FeedItem.ensure_utc(datetime.fromisoformat(published_at)),
+                content_id=content_id,
+            )
+        except (UnicodeError, ValueError) as e:
+            raise ValueError(f"invalid cursor: {token!r}") from e
+
+
+@dataclass(frozen=True, slots=True)
+class KnownItem:
+    """What ingestion needs to know about an already-stored item to skip re-processing it."""
+
+    fingerprint: bytes
+    image_last_checked: datetime | None
 
 
 class FeedRepository(Protocol):
@@ -10,4 +64,50 @@ class FeedRepository(Protocol):
 
     def upsert(self, item: FeedItem) -> None: ...
 
-    def list_latest(self, *, limit: int = 50) -> list[FeedItem]: ...
+    def upsert_many(self, items: Sequence[FeedItem]) -> None: ...
+
+    def list_latest(
+        self,
+        *,
+        limit: int = 50,
+        before: FeedCursor | None = None,
+        source: str | None = None,
+        collapse: bool = False,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[FeedItem]:
+        """Newest first. `since` (inclusive) and `until` (exclusive) bound `published_at`."""
+        ...
+
+    def inserted_since(self, *, after: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        """Items first inserted after insert sequence `after`, as (sequence, item) in
+        insert order. Sequence numbers only grow and are never reused."""
+        ...
+
+    def list_changes(self, *, since: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        """Items inserted or really updated after change sequence `since`, as
+        (sequence, item) in change order. Deletions are not reported."""
+        ...
+
+    def last_inserted(self) -> int:
+        """Insert sequence of the most recently inserted item (0 if none yet)."""
+        ...
+
+    def get_many(self, content_ids: Sequence[str]) -> dict[str, FeedItem]:
+        """Stored items among `content_ids`, keyed by `content_id`; unknown ids are absent."""
+        ...
+
+    def known_items(self, content_ids: Sequence[str]) -> dict[str, KnownItem]:
+        """Stored fingerprint (see `make_fingerprint`) and image check time of those of
+        `content_ids` that exist; unknown ids are absent from the result."""
+        ...
+
+    def prune(self, *, policy: RetentionPolicy) -> PruneReport: ...
+
+    def generation(self) -> int:
+        """Opaque counter that changes whenever `list_latest` results may have changed."""
+        ...
+
+    def close(self) -> None:
+        """Release open connections (the repository reconnects if used again)."""
+        ...
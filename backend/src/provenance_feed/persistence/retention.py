@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Bounds on how much history `feed_items` keeps.
+
+    Each limit is optional; unset limits are not applied. Pruning always removes the
+    oldest items (by `published_at`) first.
+    """
+
+    max_age: timedelta | None = None
+    max_items_per_source: int | None = None
+    max_items: int | None = None
+    batch_size: int = 500
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.max_age is not None
+            or self.max_items_per_source is not None
+            or self.max_items is not None
+        )
+
+
+@dataclass(frozen=True)
+class PruneReport:
+    rows_deleted: int
+    bytes_freed: int
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.partitions import ArchiveReport
+from provenance_feed.persistence.repository import FeedCursor, FeedRepository, KnownItem
+from provenance_feed.persistence.retention import PruneReport, RetentionPolicy
+from provenance_feed.persistence.sqlite import OrderKey, SQLiteFeedRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Rows read per `list_changes` call while catching up with other processes' writes.
+_CHANGES_PAGE = 500
+
+
+def _source(item: FeedItem) -> str:
+    return item.content_id.partition(":")[0]
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable, time-sorted view of the newest items.
+
+    `items` and `keys` are parallel and sorted ascending in feed order (the backing
+    repository's `order_key`), so feed pages are slices found with a binary search on
+    `keys`. `by_source` holds the same two arrays per source, for `source=` pages.
+    """
+
+    items: tuple[FeedItem, ...]
+    keys: tuple[OrderKey, ...]
+    by_source: Mapping[str, tuple[tuple[OrderKey, ...], tuple[FeedItem, ...]]]
+    # True when the snapshot holds every row, i.e. no page ever needs the database.
+    complete: bool
+
+    @classmethod
+    def empty(cls) -> _Snapshot:
+        return cls(items=(), keys=(), by_source={}, complete=True)
+
+    @classmethod
+    def _from_keyed(cls, keyed: list[tuple[OrderKey, FeedItem]], *, complete: bool) -> _Snapshot:
+        grouped: dict[str, list[tuple[OrderKey, FeedItem]]] = {}
+        for pair in keyed:
+            grouped.setdefault(_source(pair[1]), []).append(pair)
+        return cls(
+            items=tuple(i for _, i in keyed),
+            keys=tuple(k for k, _ in keyed),
+            by_source={
+                source: (tuple(k for k, _ in pairs), tuple(i for _, i in pairs))
+                for source, pairs in grouped.items()
+            },
+            complete=complete,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        items: Sequence[FeedItem],
+        *,
+        max_items: int,
+        key: Callable[[FeedItem], OrderKey],
+    ) -> _Snapshot:
+        keyed = sorted(((key(i), i) for i in items), key=lambda pair: pair[0])
+        complete = len(keyed) <= max_items
+        if not complete:
+            keyed = keyed[-max_items:]
+        return cls._from_keyed(keyed, complete=complete)
+
+    def with_items(
+        self,
+        items: Iterable[FeedItem],
+        *,
+        max_items: int,
+        key: Callable[[FeedItem], OrderKey],
+    ) -> _Snapshot:
+        """A copy with `items` put at their positions (replacing any copy of the same id)
+        by merging, without re-sorting the snapshot. An incomplete snapshot holds every row
+        from its oldest key up, so items older than that are left to the database."""
+
+        changed = {i.content_id: i for i in items}
+        floor = self.keys[0] if self.keys and not self.complete else None
+        added = sorted(
+            (
+                pair
+                for pair in ((key(i), i) for i in changed.values())
+                if floor is None or pair[0] > floor
+            ),
+            key=lambda pair: pair[0],
+        )
+        kept = (
+            (k, i)
+            for k, i in zip(self.keys, self.items, strict=True)
+            if i.content_id not in changed
+        )
+        keyed = list(heapq.merge(kept, added, key=lambda pair: pair[0]))
+        complete = self.complete and len(keyed) <= max_items
+        if len(keyed) > max_items:
+            keyed = keyed[-max_items:]
+        return _Snapshot._from_keyed(keyed, complete=complete)
+
+
+class SnapshotFeedRepository(FeedRepository):
+    """Read-optimised, in-memory FeedRepository over `SQLiteFeedRepository`.
+
+    Holds the newest `max_items` rows in memory and answers feed pages, overall or for one
+    source, with a binary search. Writes go to SQLite and the stored rows are merged into
+    the snapshot. Changes made by other processes are noticed by polling SQLite's
+    `data_version` on a background thread and merged in from `list_changes`; only bulk
+    removals (retention, detached months) rebuild the snapshot. Every update builds a new
+    immutable snapshot and swaps the reference, so reads never take a lock.
+
+    Cursor pages that reach past the oldest in-memory item fall back to SQLite.
+    """
+
+    def __init__(
+        self,
+        *,
+        backing: SQLiteFeedRepository,
+        database_path: Path,
+        max_items: int = 5000,
+        poll_seconds: float = 1.0,
+    ) -> None:
+        self._backing = backing
+        self._database_path = database_path
+        self._max_items = max(1, max_items)
+        self._poll_seconds = poll_seconds
+        self._snapshot = _Snapshot.empty()
+        # Bumped on every swap; caches in this process key on it.
+        self._generation = 0
+        # Serialises snapshot writers (deltas, reloads); readers never touch it.
+        self._write_lock = threading.Lock()
+        self._watch_conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        # The backing store's `sync_marks()` the snapshot reflects.
+        self._marks: tuple[int, int] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _key(self, item: FeedItem) -> OrderKey:
+        return self._backing.order_key(published_at=item.published_at, content_id=item.content_id)
+
+    def init_schema(self) -> None:
+        self._backing.init_schema()
+        self._watch_conn = sqlite3.connect(self._database_path, check_same_thread=False)
+        self.reload()
+        if self._poll_seconds > 0:
+            self._thread = threading.Thread(target=self._poll, name="feed-snapshot", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(1.0, self._poll_seconds * 2))
+        if self._watch_conn is not None:
+            self._watch_conn.close()
+            self._watch_conn = None
+        self._backing.close()
+
+    def _current_data_version(self) -> int | None:
+        if self._watch_conn is None:
+            return None
+        return self._watch_conn.execute("PRAGMA data_version;").fetchone()[0]
+
+    def reload(self) -> None:
+        """Rebuild the snapshot from SQLite."""
+
+        with self._write_lock:
+            self._reload()
+
+    def _reload(self) -> None:
+        version = self._current_data_version()
+        marks = self._backing.sync_marks()
+        # One extra row tells us whether the table is larger than the snapshot.
+        items = self._backing.list_latest(limit=self._max_items + 1)
+        self._snapshot = _Snapshot.build(items, max_items=self._max_items, key=self._key)
+        self._generation += 1
+        self._data_version = version
+        self._marks = marks
+
+    def refresh_if_changed(self) -> bool:
+        """Catch up if another connection committed since the last load. Returns whether
+        anything was read."""
+
+        if self._current_data_version() == self._data_version:
+            return False
+        with self._write_lock:
+            version = self._current_data_version()
+            change_seq, unsequenced = self._backing.sync_marks()
+            if self._marks is None or unsequenced != self._marks[1]:
+                self._reload()
+                return True
+            since = self._marks[0]
+            changed: list[FeedItem] = []
+            while since < change_seq:
+                page = self._backing.list_changes(since=since, limit=_CHANGES_PAGE)
+                if not page:
+                    break
+                if len(changed) + len(page) > self._max_items:
+                    # More changed than the snapshot holds: reading it afresh is cheaper.
+                    self._reload()
+                    return True
+                changed += (item for _, item in page)
+                since = page[-1][0]
+            if changed:
+                self._snapshot = self._snapshot.with_items(
+                    changed, max_items=self._max_items, key=self._key
+                )
+                self._generation += 1
+            self._data_version = version
+            self._marks = (since, unsequenced)
+        return True
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self._poll_seconds):
+            try:
+                self.refresh_if_changed()
+            except Exception as e:
+                logger.warning("feed snapshot refresh failed (%s)", type(e).__name__)
+
+    def upsert(self, item: FeedItem) -> None:
+        self.upsert_many([item])
+
+    def upsert_many(self, items: Sequence[FeedItem]) -> None:
+        if not items:
+            return
+        with self._write_lock:
+            # Our own commit moves data_version too. When nothing else was pending, record
+            # the version after it so the poller does not reload for it.
+            caught_up = self._current_data_version() == self._data_version
+            self._backing.upsert_many(items)
+            version = self._current_data_version()
+            marks = self._backing.sync_marks()
+            # The stored rows carry what the write derived, such as `cluster_id`.
+            stored = self._backing.get_many([i.content_id for i in items])
+            self._snapshot = self._snapshot.with_items(
+                stored.values(), max_items=self._max_items, key=self._key
+            )
+            self._generation += 1
+            if caught_up:
+                self._data_version = version
+                self._marks = marks
+
+    def inserted_since(self, *, after: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        return self._backing.inserted_since(after=after, limit=limit)
+
+    def list_changes(self, *, since: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        return self._backing.list_changes(since=since, limit=limit)
+
+    def last_inserted(self) -> int:
+        return self._backing.last_inserted()
+
+    def get_many(self, content_ids: Sequence[str]) -> dict[str, FeedItem]:
+        return self._backing.get_many(content_ids)
+
+    def known_items(self, content_ids: Sequence[str]) -> dict[str, KnownItem]:
+        return self._backing.known_items(content_ids)
+
+    def prune(self, *, policy: RetentionPolicy) -> PruneReport:
+        report = self._backing.prune(policy=policy)
+        if report.rows_deleted:
+            self.reload()
+        return report
+
+    def archive(self, *, hot_months: int) -> ArchiveReport:
+        report = self._backing.archive(hot_months=hot_months)
+        if report.rows_moved:
+            self.reload()
+        return report
+
+    def generation(self) -> int:
+        return self._generation
+
+    def list_latest(
+        self,
+        *,
+        limit: int = 50,
+        before: FeedCursor | None = None,
+        source: str | None = None,
+        collapse: bool = False,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[FeedItem]:
+        if limit <= 0:
+            return []
+        if collapse or since is not None or until is not None:
+            # Cluster membership lives in SQLite only, and time-bounded reads (exports)
+            # are rarely within the in-memory window anyway.
+            return self._backing.list_latest(
+                limit=limit,
+                before=before,
+                source=source,
+                collapse=collapse,
+                since=since,
+                until=until,
+            )
+        snap = self._snapshot  # one atomic read; the rest works on this immutable view
+        if source is None:
+            keys, items = snap.keys, snap.items
+        else:
+            keys, items = snap.by_source.get(source, ((), ()))
+        if before is None:
+            end = len(keys)
+        else:
+            end = bisect.bisect_left(
+                keys,
+                self._backing.order_key(
+                    published_at=before.published_at, content_id=before.content_id
+                ),
+            )
+        start = end - limit
+        # An incomplete snapshot holds every row newer than its oldest item, of every
+        # source, so a full page from it is exact.
+        if start >= 0 or snap.complete:
+            return list(reversed(items[max(0, start) : end]))
+
+        # The page reaches below the in-memory window.
+        return self._backing.list_latest(limit=limit, before=before, source=source)
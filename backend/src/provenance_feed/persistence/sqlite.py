@@ -1,128 +1,1677 @@
 from __future__ import annotations
 
+import heapq
+import logging
+import re
 import sqlite3
-from datetime import UTC, datetime
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+from provenance_feed.domain.identifiers import make_fingerprint
 from provenance_feed.domain.models import FeedItem
-from provenance_feed.persistence.repository import FeedRepository
+from provenance_feed.domain.near_duplicates import (
+    SIMILARITY_THRESHOLD,
+    band_keys,
+    similarity,
+    title_signature,
+)
+from provenance_feed.persistence.partitions import (
+    FEED_ITEM_COLUMNS,
+    ArchiveReport,
+    Partition,
+    add_months,
+    create_partition_file,
+    month_name,
+    month_start,
+    partition_file,
+    read_partition_file,
+)
+from provenance_feed.persistence.repository import FeedCursor, FeedRepository, KnownItem
+from provenance_feed.persistence.retention import PruneReport, RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+_BUMP_GENERATION_SQL = "UPDATE feed_meta SET generation = generation + 1 WHERE id = 1;"
+# For writes that change what the feed lists without stamping the change sequence
+# (retention deletes, detaching or attaching a month), so followers of `list_changes`
+# know to re-read instead.
+_BUMP_UNSEQUENCED_SQL = (
+    "UPDATE feed_meta SET generation = generation + 1, "
+    "unsequenced_writes = unsequenced_writes + 1 WHERE id = 1;"
+)
+
+# Near-duplicate clustering: only items published this close together can share a
+# cluster, and at most this many LSH candidates are verified per item, which keeps the
+# per-item ingest cost bounded regardless of table size.
+_CLUSTER_WINDOW = timedelta(days=2)
+_MAX_CLUSTER_CANDIDATES = 64
+
+# Item keys per `known_items` query; stays under SQLite's bound-parameter limit.
+_KNOWN_ITEMS_CHUNK = 500
+
+# Storage encoding (schema version 1):
+# - timestamps are integer microseconds since the Unix epoch (UTC);
+# - `content_id` ("{source}:{source_item_id}") is split into a `sources` row id and an
+#   `item_key`: the 32 raw bytes when `source_item_id` is a sha256 hex digest (as for
+#   real RSS sources), otherwise the original text. The public `content_id` is rebuilt
+#   on read, byte-for-byte.
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_HEX_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+ItemKey = bytes | str
+
+# Columns of `feed_items AS f` that make up a FeedItem, in `_items_from_rows` order.
+_ITEM_COLUMNS = """
+  f.source_id,
+  f.item_key,
+  f.title,
+  f.source_name,
+  f.source_url,
+  f.published_at,
+  f.image_url,
+  f.image_source,
+  f.image_last_checked,
+  f.cluster_id
+"""
+# Feed order key: (published_at µs, source row id, item key ordered as SQLite orders it,
+# TEXT before BLOB). The same in SQL and in memory, so cursors work across both.
+OrderKey = tuple[int, int, tuple[int, bytes]]
+
+_FEED_ITEMS_INDEXES = (
+    # Feed order index; also serves keyset (cursor) pagination.
+    "CREATE INDEX idx_feed_items_feed_order ON feed_items (published_at, source_id, item_key);",
+    # Per-source pages and per-source retention.
+    "CREATE INDEX idx_feed_items_source_order ON feed_items (source_id, published_at, item_key);",
+    # Near-duplicate index: LSH band buckets of each item's title signature, plus exact
+    # canonical-URL matches. Rows follow feed_items deletions via a trigger.
+    "CREATE INDEX idx_feed_items_cluster ON feed_items (cluster_id, published_at);",
+    "CREATE INDEX idx_feed_items_source_url ON feed_items (source_url);",
+)
+
+_NEAR_DUP_DELETE_TRIGGER = """
+    CREATE TRIGGER trg_feed_items_delete_near_dup
+    AFTER DELETE ON feed_items
+    BEGIN
+      DELETE FROM near_dup_bands WHERE item_id = old.item_id;
+    END;
+"""
+
+_SCHEMA_V1 = (
+    """
+    CREATE TABLE sources (
+      source_id INTEGER PRIMARY KEY,
+      source_key TEXT NOT NULL UNIQUE
+    );
+    """,
+    """
+    CREATE TABLE feed_items (
+      item_id INTEGER PRIMARY KEY,
+      source_id INTEGER NOT NULL REFERENCES sources (source_id),
+      item_key BLOB NOT NULL,
+      title TEXT NOT NULL,
+      source_name TEXT NOT NULL,
+      source_url TEXT NOT NULL,
+      published_at INTEGER NOT NULL,
+      image_url TEXT,
+      image_source TEXT,
+      image_last_checked INTEGER,
+      created_at INTEGER NOT NULL,
+      cluster_id TEXT,
+      title_signature BLOB,
+      UNIQUE (source_id, item_key)
+    );
+    """,
+    *_FEED_ITEMS_INDEXES,
+    """
+    CREATE TABLE near_dup_bands (
+      band_key INTEGER NOT NULL,
+      item_id INTEGER NOT NULL,
+      PRIMARY KEY (band_key, item_id)
+    ) WITHOUT ROWID;
+    """,
+    "CREATE INDEX idx_near_dup_bands_item_id ON near_dup_bands (item_id);",
+    _NEAR_DUP_DELETE_TRIGGER,
+)
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """A datetime as stored: integer microseconds since the Unix epoch, UTC."""
+
+    return (FeedItem.ensure_utc(dt) - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value: int) -> datetime:
+    """The UTC datetime of a stored `to_epoch_us` value."""
+
+    # Whole seconds via fromtimestamp (fast, exact); microseconds added separately.
+    seconds, micros = divmod(value, 1_000_000)
+    dt = datetime.fromtimestamp(seconds, UTC)
+    return dt.replace(microsecond=micros) if micros else dt
+
+
+def split_content_id(content_id: str) -> tuple[str, ItemKey]:
+    """Split a `content_id` into its source key and stored item key."""
+
+    source, sep, item = content_id.partition(":")
+    if not sep or not source or not item:
+        raise ValueError(f"content_id must be 'source:source_item_id': {content_id!r}")
+    return source, bytes.fromhex(item) if _HEX_DIGEST.fullmatch(item) else item
+
+
+def _item_order(key: ItemKey) -> tuple[int, bytes]:
+    # SQLite sorts TEXT before BLOB, and TEXT (BINARY collation) by its UTF-8 bytes.
+    return (1, key) if isinstance(key, bytes) else (0, key.encode("utf-8"))
+
+
+def _feed_order(row: Sequence) -> OrderKey:
+    # Feed order key of an `_ITEM_COLUMNS` row.
+    return (row[5], row[0], _item_order(row[1]))
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    """Integer timestamps, a sources lookup table and binary item keys.
+
+    Creates the schema on a new database. On a database from before schema versioning,
+    rows are copied across, converting ISO timestamps and splitting `content_id`.
+    """
+
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feed_items';"
+    ).fetchone()
+    if legacy is not None:
+        conn.execute("DROP TRIGGER IF EXISTS trg_feed_items_delete_near_dup;")
+        conn.execute("DROP TABLE IF EXISTS near_dup_bands;")
+        for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'feed_items' AND sql IS NOT NULL;"
+        ).fetchall():
+            conn.execute(f'DROP INDEX "{name}";')
+        conn.execute("ALTER TABLE feed_items RENAME TO feed_items_legacy;")
+
+    for statement in _SCHEMA_V1:
+        conn.execute(statement)
+    if legacy is None:
+        return
+
+    sources: dict[str, int] = {}
+    cur = conn.execute("SELECT * FROM feed_items_legacy ORDER BY rowid;")
+    while rows := cur.fetchmany(1000):
+        for r in rows:
+            # Columns added over time by the pre-versioning ALTER TABLE migrations.
+            row = dict(r)
+            for col in (
+                "image_url",
+                "image_source",
+                "image_last_checked",
+                "cluster_id",
+                "title_signature",
+            ):
+                row.setdefault(col, None)
+            source, item_key = split_content_id(row["content_id"])
+            if source not in sources:
+                sources[source] = conn.execute(
+                    "INSERT INTO sources (source_key) VALUES (?);", (source,)
+                ).lastrowid
+            checked = row["image_last_checked"]
+            item_id = conn.execute(
+                """
+                INSERT INTO feed_items (
+                  source_id, item_key, title, source_name, source_url, published_at,
+                  image_url, image_source, image_last_checked, created_at,
+                  cluster_id, title_signature
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    sources[source],
+                    item_key,
+                    row["title"],
+                    row["source_name"],
+                    row["source_url"],
+                    to_epoch_us(datetime.fromisoformat(row["published_at"])),
+                    row["image_url"],
+                    row["image_source"],
+                    to_epoch_us(datetime.fromisoformat(checked)) if checked else None,
+                    to_epoch_us(datetime.fromisoformat(row["created_at"])),
+                    row["cluster_id"],
+                    row["title_signature"],
+                ),
+            ).lastrowid
+            if row["title_signature"] is not None:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO near_dup_bands (band_key, item_id) VALUES (?, ?);",
+                    [(key, item_id) for key in band_keys(row["title_signature"])],
+                )
+    conn.execute("DROP TABLE feed_items_legacy;")
+
+
+def _migrate_v2(conn: sqlite3.Connection) -> None:
+    """`AUTOINCREMENT` item ids, so the id of a pruned row is never handed out again and
+    ids can serve as the insert sequence of the live feed stream (`inserted_since`)."""
+
+    conn.execute("DROP TRIGGER trg_feed_items_delete_near_dup;")
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = 'feed_items' AND sql IS NOT NULL;"
+    ).fetchall():
+        conn.execute(f'DROP INDEX "{name}";')
+    conn.execute("ALTER TABLE feed_items RENAME TO feed_items_v1;")
+    conn.execute(
+        """
+        CREATE TABLE feed_items (
+          item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+          source_id INTEGER NOT NULL REFERENCES sources (source_id),
+          item_key BLOB NOT NULL,
+          title TEXT NOT NULL,
+          source_name TEXT NOT NULL,
+          source_url TEXT NOT NULL,
+          published_at INTEGER NOT NULL,
+          image_url TEXT,
+          image_source TEXT,
+          image_last_checked INTEGER,
+          created_at INTEGER NOT NULL,
+          cluster_id TEXT,
+          title_signature BLOB,
+          UNIQUE (source_id, item_key)
+        );
+        """
+    )
+    conn.execute("INSERT INTO feed_items SELECT * FROM feed_items_v1 ORDER BY item_id;")
+    conn.execute("DROP TABLE feed_items_v1;")
+    for statement in _FEED_ITEMS_INDEXES:
+        conn.execute(statement)
+    conn.execute(_NEAR_DUP_DELETE_TRIGGER)
+
+
+# Columns whose change is a real update of an item, i.e. one reported by `list_changes`.
+# `image_last_checked` alone is bookkeeping and does not count.
+_CHANGE_TRACKED_COLUMNS = (
+    "title",
+    "source_name",
+    "source_url",
+    "published_at",
+    "image_url",
+    "image_source",
+    "cluster_id",
+)
+
+
+def _migrate_v3(conn: sqlite3.Connection) -> None:
+    """Change sequence: every insert and real update stamps the row with the next value of
+    a counter that never goes back, so `list_changes` can sync incrementally."""
+
+    conn.execute(
+        """
+        CREATE TABLE change_sequence (
+          id INTEGER PRIMARY KEY CHECK (id = 1),
+          value INTEGER NOT NULL
+        );
+        """
+    )
+    conn.execute("ALTER TABLE feed_items ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0;")
+    # Existing rows count as changed in insert order.
+    conn.execute("UPDATE feed_items SET change_seq = item_id;")
+    conn.execute(
+        "INSERT INTO change_sequence (id, value) "
+        "SELECT 1, coalesce(max(change_seq), 0) FROM feed_items;"
+    )
+    conn.execute("CREATE INDEX idx_feed_items_change_seq ON feed_items (change_seq);")
+
+    stamp = """
+      UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+      UPDATE feed_items SET change_seq = (SELECT value FROM change_sequence WHERE id = 1)
+      WHERE item_id = new.item_id;
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER trg_feed_items_change_insert
+        AFTER INSERT ON feed_items
+        BEGIN {stamp} END;
+        """
+    )
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in _CHANGE_TRACKED_COLUMNS)
+    conn.execute(
+        f"""
+        CREATE TRIGGER trg_feed_items_change_update
+        AFTER UPDATE OF {", ".join(_CHANGE_TRACKED_COLUMNS)} ON feed_items
+        WHEN {changed}
+        BEGIN {stamp} END;
+        """
+    )
+
+
+def _migrate_v4(conn: sqlite3.Connection) -> None:
+    """Registry of month partitions (see `provenance_feed.persistence.partitions`); each
+    holds the items with `lower_us <= published_at < upper_us`."""
+
+    conn.execute(
+        """
+        CREATE TABLE feed_partitions (
+          month TEXT PRIMARY KEY,
+          lower_us INTEGER NOT NULL,
+          upper_us INTEGER NOT NULL,
+          rows INTEGER NOT NULL,
+          max_change_seq INTEGER NOT NULL
+        );
+        """
+    )
+
+
+def _migrate_v5(conn: sqlite3.Connection) -> None:
+    """`published_at` in `near_dup_bands`, so clustering finds the band hits inside its
+    time window through the index before capping how many it compares."""
+
+    conn.execute("DROP TRIGGER trg_feed_items_delete_near_dup;")
+    conn.execute(
+        """
+        CREATE TABLE near_dup_bands_v5 (
+          band_key INTEGER NOT NULL,
+          published_at INTEGER NOT NULL,
+          item_id INTEGER NOT NULL,
+          PRIMARY KEY (band_key, published_at, item_id)
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO near_dup_bands_v5 (band_key, published_at, item_id)
+        SELECT b.band_key, f.published_at, b.item_id
+        FROM near_dup_bands AS b JOIN feed_items AS f ON f.item_id = b.item_id;
+        """
+    )
+    conn.execute("DROP TABLE near_dup_bands;")
+    conn.execute("ALTER TABLE near_dup_bands_v5 RENAME TO near_dup_bands;")
+    conn.execute("CREATE INDEX idx_near_dup_bands_item_id ON near_dup_bands (item_id);")
+    conn.execute(_NEAR_DUP_DELETE_TRIGGER)
+
+
+def _migrate_v6(conn: sqlite3.Connection) -> None:
+    """Tables other parts of the app used to create on first use: the data generation
+    (`feed_meta`), leader leases, circuit-breaker state and the ingestion run ledger.
+    `IF NOT EXISTS`, since older files already have whichever of them were used."""
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feed_meta (
+          id INTEGER PRIMARY KEY CHECK (id = 1),
+          generation INTEGER NOT NULL
+        );
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO feed_meta (id, generation) VALUES (1, 0);")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS leases (
+          name TEXT PRIMARY KEY,
+          holder TEXT NOT NULL,
+          acquired_at REAL NOT NULL,
+          expires_at REAL NOT NULL
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS host_breakers (
+          host TEXT PRIMARY KEY,
+          state TEXT NOT NULL,
+          failures INTEGER NOT NULL,
+          trips INTEGER NOT NULL,
+          open_until TEXT NULL,
+          updated_at TEXT NOT NULL
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+          run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+          started_at TEXT NOT NULL,
+          finished_at TEXT NOT NULL,
+          persist_seconds REAL NOT NULL
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_run_sources (
+          run_id INTEGER NOT NULL REFERENCES ingest_runs (run_id) ON DELETE CASCADE,
+          source_id TEXT NOT NULL,
+          fetch_seconds REAL NOT NULL,
+          parse_seconds REAL NOT NULL,
+          enrich_seconds REAL NOT NULL,
+          bytes INTEGER NOT NULL,
+          entries INTEGER NOT NULL,
+          kept INTEGER NOT NULL,
+          skipped INTEGER NOT NULL,
+          written INTEGER NOT NULL,
+          inserted INTEGER NOT NULL,
+          updated INTEGER NOT NULL,
+          unchanged INTEGER NOT NULL,
+          error TEXT NULL,
+          PRIMARY KEY (run_id, source_id)
+        );
+        """
+    )
+
+
+def _migrate_v7(conn: sqlite3.Connection) -> None:
+    """Index of archived item keys and the month partition holding each, so looking up an
+    id that is not among recent items reads at most the one month file that has it.
+    Existing partitions are indexed when the repository next opens with its partition
+    directory (`SQLiteFeedRepository.init_schema`)."""
+
+    conn.execute(
+        """
+        CREATE TABLE archived_items (
+          source_id INTEGER NOT NULL,
+          item_key BLOB NOT NULL,
+          month TEXT NOT NULL,
+          PRIMARY KEY (source_id, item_key)
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.execute("CREATE INDEX idx_archived_items_month ON archived_items (month);")
+
+
+def _migrate_v8(conn: sqlite3.Connection) -> None:
+    """Count of writes that bypass the change sequence (see `sync_marks`)."""
+
+    conn.execute("ALTER TABLE feed_meta ADD COLUMN unsequenced_writes INTEGER NOT NULL DEFAULT 0;")
+
+
+def _migrate_v9(conn: sqlite3.Connection) -> None:
+    """Circuit-breaker times as integer epoch microseconds, like every other timestamp in
+    the feed tables, instead of ISO text."""
+
+    conn.execute("ALTER TABLE host_breakers RENAME TO host_breakers_v8;")
+    conn.execute(
+        """
+        CREATE TABLE host_breakers (
+          host TEXT PRIMARY KEY,
+          state TEXT NOT NULL,
+          failures INTEGER NOT NULL,
+          trips INTEGER NOT NULL,
+          open_until INTEGER,
+          updated_at INTEGER NOT NULL
+        );
+        """
+    )
+    rows = conn.execute(
+        "SELECT host, state, failures, trips, open_until, updated_at FROM host_breakers_v8;"
+    ).fetchall()
+    conn.executemany(
+        "INSERT INTO host_breakers VALUES (?, ?, ?, ?, ?, ?);",
+        [
+            (
+                host,
+                state,
+                failures,
+                trips,
+                to_epoch_us(datetime.fromisoformat(open_until)) if open_until else None,
+                to_epoch_us(datetime.fromisoformat(updated_at)),
+            )
+            for host, state, failures, trips, open_until, updated_at in rows
+        ],
+    )
+    conn.execute("DROP TABLE host_breakers_v8;")
+
+
+class _SlowQueryCursor(sqlite3.Cursor):
+    # Times a statement from `execute` until its rows have been fetched (a SELECT does
+    # most of its work while rows are stepped through, not in `execute`) and logs it
+    # once if that took at least the connection's `slow_query_seconds`. A `fetchone`
+    # ends the timing: it is how single-row lookups read their result.
+    _started: float | None = None
+    _rows = 0
+
+    def _done(self) -> None:
+        if self._started is None:
+            return
+        elapsed = time.perf_counter() - self._started
+        self._started = None
+        if elapsed >= self.connection.slow_query_seconds:
+            logger.warning(
+                "slow query %.1f ms (rows=%s): %s",
+                elapsed * 1000,
+                self._rows if self.description is not None else self.rowcount,
+                " ".join(self._sql.split()),
+            )
+
+    def _start(self, sql: str) -> None:
+        self._sql = sql
+        self._rows = 0
+        self._started = time.perf_counter()
+
+    def execute(self, sql, parameters=(), /):
+        self._start(sql)
+        super().execute(sql, parameters)
+        if self.description is None:
+            self._done()
+        return self
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self._start(sql)
+        super().executemany(sql, seq_of_parameters)
+        self._done()
+        return self
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._rows += row is not None
+        self._done()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._rows += len(rows)
+        if not rows:
+            self._done()
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._rows += len(rows)
+        self._done()
+        return rows
+
+    def __next__(self):
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._done()
+            raise
+        self._rows += 1
+        return row
+
+
+class _SlowQueryConnection(sqlite3.Connection):
+    # Only used when a slow-query threshold is configured; otherwise connections are
+    # plain `sqlite3.Connection`s with no per-statement overhead.
+    slow_query_seconds: float = 0.0
+
+    def cursor(self, factory=_SlowQueryCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# Schema migrations in order; `PRAGMA user_version` is the number already applied.
+_MIGRATIONS: tuple[Callable[[sqlite3.Connection], None], ...] = (
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+    _migrate_v4,
+    _migrate_v5,
+    _migrate_v6,
+    _migrate_v7,
+    _migrate_v8,
+    _migrate_v9,
+)
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    """Bring the feed database's schema up to date. Every table in the file is created
+    here, so other stores sharing it (leases, breakers, the run ledger) rely on it too."""
+
+    # Incremental auto-vacuum lets pruning hand freed pages back to the filesystem. It can
+    # be set for free before the first table exists; older files are switched by an
+    # explicit `vacuum` (see `provenance_feed.persistence.maintenance`), never on startup.
+    if conn.execute("SELECT count(*) FROM sqlite_master;").fetchone()[0] == 0:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+    elif conn.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+        logger.info(
+            "database is not in incremental auto-vacuum mode; run "
+            "`python -m provenance_feed.persistence.maintenance vacuum` to switch it"
+        )
+
+    # Each migration commits together with its version bump, or not at all.
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        version = conn.execute("PRAGMA user_version;").fetchone()[0]
+        for number, migrate_to in enumerate(_MIGRATIONS[version:], start=version + 1):
+            conn.execute("BEGIN IMMEDIATE;")
+            try:
+                migrate_to(conn)
+                conn.execute(f"PRAGMA user_version = {number};")
+            except BaseException:
+                conn.execute("ROLLBACK;")
+                raise
+            conn.execute("COMMIT;")
+        if version < len(_MIGRATIONS):
+            conn.execute("PRAGMA incremental_vacuum;")
+    finally:
+        conn.isolation_level = isolation_level
+
+
+def init_database(database_path: Path) -> None:
+    """`migrate` the database file at `database_path`, creating it if needed."""
+
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(database_path)
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
 
 
 class SQLiteFeedRepository(FeedRepository):
-    def __init__(self, *, database_path: Path):
+    """Feed storage in one SQLite file.
+
+    With `slow_query_seconds` set, every statement taking at least that long (including
+    fetching its rows) is logged with its SQL. With `partition_dir` set, `archive` moves
+    old items into month files there, which reads merge in for deep cursors.
+    """
+
+    def __init__(
+        self,
+        *,
+        database_path: Path,
+        slow_query_seconds: float | None = None,
+        partition_dir: Path | None = None,
+    ):
         self._database_path = database_path
+        self._slow_query_seconds = slow_query_seconds
+        self._partition_dir = partition_dir
+        self._local = threading.local()
+        # Every per-thread connection, so `close` can reach those of other threads.
+        self._thread_conns: set[sqlite3.Connection] = set()
+        self._thread_conns_lock = threading.Lock()
+        # Committed sources rows, both ways; ids never change once assigned.
+        self._source_ids: dict[str, int] = {}
+        self._source_keys: dict[int, str] = {}
+
+    def __getstate__(self) -> dict[str, object]:
+        # Sent to ingestion worker processes (for `known_items`): no live connections.
+        return {
+            "_database_path": self._database_path,
+            "_slow_query_seconds": self._slow_query_seconds,
+            "_partition_dir": self._partition_dir,
+        }
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__(
+            database_path=state["_database_path"],
+            slow_query_seconds=state["_slow_query_seconds"],
+            partition_dir=state["_partition_dir"],
+        )
 
-    def _connect(self) -> sqlite3.Connection:
-        self._database_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self._database_path)
+    def _connect(
+        self, partition: Partition | None = None, *, check_same_thread: bool = True
+    ) -> sqlite3.Connection:
+        # The feed database, or read-only a month partition.
+        if partition is None:
+            self._database_path.parent.mkdir(parents=True, exist_ok=True)
+            target, uri = self._database_path, False
+        else:
+            target, uri = f"{partition.path.resolve().as_uri()}?mode=ro", True
+        if self._slow_query_seconds is None:
+            conn = sqlite3.connect(target, uri=uri, check_same_thread=check_same_thread)
+        else:
+            conn = sqlite3.connect(
+                target,
+                uri=uri,
+                check_same_thread=check_same_thread,
+                factory=_SlowQueryConnection,
+            )
+            conn.slow_query_seconds = self._slow_query_seconds
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys=ON")
         return conn
 
+    def _read_connection(self) -> sqlite3.Connection:
+        # Reads reuse one long-lived connection per thread (e.g. per reader-pool thread)
+        # instead of reconnecting on every request. Plain SELECTs never open a
+        # transaction, so each query sees the latest committed data.
+        conn = getattr(self._local, "read_conn", None)
+        if conn is None:
+            conn = self._local.read_conn = self._thread_connection()
+        return conn
+
+    def _partition_connection(self, partition: Partition) -> sqlite3.Connection:
+        # Like `_read_connection`, one long-lived connection per thread and month file.
+        conns = getattr(self._local, "partition_conns", None)
+        if conns is None:
+            conns = self._local.partition_conns = {}
+        conn = conns.get(partition.month)
+        if conn is None:
+            conn = conns[partition.month] = self._thread_connection(partition)
+        return conn
+
+    def _thread_connection(self, partition: Partition | None = None) -> sqlite3.Connection:
+        # Only ever used by the thread that opened it, but closed by `close` from any.
+        conn = self._connect(partition, check_same_thread=False)
+        with self._thread_conns_lock:
+            self._thread_conns.add(conn)
+        return conn
+
+    def _close_thread_connection(self, conn: sqlite3.Connection) -> None:
+        with self._thread_conns_lock:
+            self._thread_conns.discard(conn)
+        conn.close()
+
+    def close(self) -> None:
+        """Close every thread's read connections, including month-file ones. Call once
+        reads have stopped; the repository reconnects if used again."""
+
+        with self._thread_conns_lock:
+            conns, self._thread_conns = self._thread_conns, set()
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
+
     def init_schema(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS feed_items (
-                  content_id TEXT PRIMARY KEY,
-                  title TEXT NOT NULL,
-                  source_name TEXT NOT NULL,
-                  source_url TEXT NOT NULL,
-                  published_at TEXT NOT NULL,
-                  image_url TEXT,
-                  image_source TEXT,
-                  image_last_checked TEXT,
-                  created_at TEXT NOT NULL
-                );
-                """
+        conn = self._connect()
+        try:
+            migrate(conn)
+            for r in conn.execute("SELECT source_id, source_key FROM sources;"):
+                self._remember_source(r["source_key"], r["source_id"])
+            if self._partition_dir is not None:
+                # Partitions archived before the key index existed.
+                for (month,) in conn.execute(
+                    """
+                    SELECT month FROM feed_partitions AS p
+                    WHERE rows > 0
+                      AND NOT EXISTS (SELECT 1 FROM archived_items AS a WHERE a.month = p.month);
+                    """
+                ).fetchall():
+                    if (self._partition_dir / partition_file(month)).exists():
+                        self._index_partition(conn, month)
+        finally:
+            conn.close()
+
+    def _lookup_source_id(self, source: str) -> int | None:
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            row = (
+                self._read_connection()
+                .execute("SELECT source_id FROM sources WHERE source_key = ?;", (source,))
+                .fetchone()
+            )
+            if row is not None:
+                source_id = row["source_id"]
+                self._remember_source(source, source_id)
+        return source_id
+
+    def _content_id(self, source_id: int, item_key: ItemKey) -> str:
+        source = self._source_keys.get(source_id)
+        if source is None:
+            row = (
+                self._read_connection()
+                .execute("SELECT source_key FROM sources WHERE source_id = ?;", (source_id,))
+                .fetchone()
             )
+            source = row["source_key"]
+            self._remember_source(source, source_id)
+        key = item_key.hex() if isinstance(item_key, bytes) else item_key
+        return f"{source}:{key}"
+
+    def _remember_source(self, source: str, source_id: int) -> None:
+        self._source_ids[source] = source_id
+        self._source_keys[source_id] = source
+
+    def order_key(self, *, published_at: datetime, content_id: str) -> OrderKey:
+        """Position of an item (or cursor) in feed order, exactly as SQLite sorts it.
+
+        A source without rows sorts before every known source.
+        """
 
-            # Minimal schema migration for existing DBs (kept intentionally simple).
-            cols = {row["name"] for row in conn.execute("PRAGMA table_info(feed_items);")}
-            if "image_url" not in cols:
-                conn.execute("ALTER TABLE feed_items ADD COLUMN image_url TEXT;")
-            if "image_source" not in cols:
-                conn.execute("ALTER TABLE feed_items ADD COLUMN image_source TEXT;")
-            if "image_last_checked" not in cols:
-                conn.execute("ALTER TABLE feed_items ADD COLUMN image_last_checked TEXT;")
+        source, item_key = split_content_id(content_id)
+        source_id = self._lookup_source_id(source)
+        return (
+            to_epoch_us(published_at),
+            -1 if source_id is None else source_id,
+            _item_order(item_key),
+        )
 
     def upsert(self, item: FeedItem) -> None:
-        now = datetime.now(tz=UTC).isoformat()
+        self.upsert_many([item])
+
+    def upsert_many(self, items: Sequence[FeedItem]) -> None:
+        """Upsert a batch of items in a single transaction."""
+
+        if not items:
+            return
+        now = to_epoch_us(datetime.now(tz=UTC))
+        # Sources first seen in this transaction; cached only once it commits.
+        created: dict[str, int] = {}
         with self._connect() as conn:
-            conn.execute(
+            if self._partition_dir is not None:
+                self._unarchive(conn, items)
+            rows = []
+            for item in items:
+                source, item_key = split_content_id(item.content_id)
+                source_id = self._source_ids.get(source) or created.get(source)
+                if source_id is None:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO sources (source_key) VALUES (?);", (source,)
+                    )
+                    source_id = created[source] = conn.execute(
+                        "SELECT source_id FROM sources WHERE source_key = ?;", (source,)
+                    ).fetchone()["source_id"]
+                rows.append(
+                    (
+                        source_id,
+                        item_key,
+                        item.title,
+                        item.source_name,
+                        item.source_url,
+                        to_epoch_us(item.published_at),
+                        item.image_url,
+                        item.image_source,
+                        to_epoch_us(item.image_last_checked) if item.image_last_checked else None,
+                        now,
+                    )
+                )
+            conn.executemany(
                 """
                 INSERT INTO feed_items (
-                                    content_id,
-                                    title,
-                                    source_name,
-                                    source_url,
-                                    published_at,
-                                    image_url,
-                                    image_source,
-                                    image_last_checked,
-                                    created_at
+                  source_id,
+                  item_key,
+                  title,
+                  source_name,
+                  source_url,
+                  published_at,
+                  image_url,
+                  image_source,
+                  image_last_checked,
+                  created_at
                 )
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(content_id) DO UPDATE SET
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source_id, item_key) DO UPDATE SET
                   title=excluded.title,
                   source_name=excluded.source_name,
                   source_url=excluded.source_url,
-                                    published_at=excluded.published_at,
-                                    image_url=excluded.image_url,
-                                    image_source=excluded.image_source,
-                                    image_last_checked=excluded.image_last_checked;
+                  published_at=excluded.published_at,
+                  image_url=excluded.image_url,
+                  image_source=excluded.image_source,
+                  image_last_checked=excluded.image_last_checked;
                 """,
-                (
-                    item.content_id,
-                    item.title,
-                    item.source_name,
-                    item.source_url,
-                    FeedItem.ensure_utc(item.published_at).isoformat(),
-                    item.image_url,
-                    item.image_source,
-                    FeedItem.ensure_utc(item.image_last_checked).isoformat()
-                    if item.image_last_checked
-                    else None,
-                    now,
-                ),
+                rows,
             )
+            for item, row in zip(items, rows, strict=True):
+                self._assign_cluster(conn, item, source_id=row[0], item_key=row[1])
+            conn.execute(_BUMP_GENERATION_SQL)
+        for source, source_id in created.items():
+            self._remember_source(source, source_id)
+
+    def _unarchive(self, conn: sqlite3.Connection, items: Sequence[FeedItem]) -> None:
+        # An archived item that is upserted again moves back into `feed_items` first,
+        # keeping its item_id, so the upsert updates the one stored copy rather than adding
+        # a second beside the archived one. The next archive moves it out again.
+        keys: set[tuple[int, ItemKey]] = set()
+        for item in items:
+            source, item_key = split_content_id(item.content_id)
+            source_id = self._lookup_source_id(source)
+            if source_id is not None:
+                keys.add((source_id, item_key))
+        for month, archived in self._archived_months(conn, keys).items():
+            self._unarchive_from(conn, month, archived)
+
+    @staticmethod
+    def _archived_months(
+        conn: sqlite3.Connection, keys: Iterable[tuple[int, ItemKey]]
+    ) -> dict[str, list[tuple[int, ItemKey]]]:
+        # Which of `keys` are archived, by month, from the archived-key index.
+        keys = list(keys)
+        months: dict[str, list[tuple[int, ItemKey]]] = {}
+        for start in range(0, len(keys), _KNOWN_ITEMS_CHUNK):
+            chunk = keys[start : start + _KNOWN_ITEMS_CHUNK]
+            for source_id, item_key, month in conn.execute(
+                f"""
+                SELECT source_id, item_key, month FROM archived_items
+                WHERE (source_id, item_key) IN (VALUES {", ".join(["(?, ?)"] * len(chunk))});
+                """,
+                [param for key in chunk for param in key],
+            ):
+                months.setdefault(month, []).append((source_id, item_key))
+        return months
+
+    def _unarchive_from(
+        self, conn: sqlite3.Connection, month: str, keys: list[tuple[int, ItemKey]]
+    ) -> None:
+        # The reverse of `_archive_month`, in one transaction across both files.
+        path = self._partition_dir / partition_file(month)
+        columns = ", ".join(FEED_ITEM_COLUMNS)
+        wanted = f"(source_id, item_key) IN (VALUES {', '.join(['(?, ?)'] * len(keys))})"
+        params = [param for key in keys for param in key]
+        conn.execute("ATTACH DATABASE ? AS part;", (str(path),))
+        try:
+            with conn:
+                restored = conn.execute(
+                    f"""
+                    INSERT INTO main.feed_items ({columns})
+                    SELECT {columns} FROM part.feed_items WHERE {wanted}
+                    RETURNING item_id, published_at, title_signature;
+                    """,
+                    params,
+                ).fetchall()
+                conn.executemany(
+                    "INSERT OR IGNORE INTO near_dup_bands (band_key, published_at, item_id) "
+                    "VALUES (?, ?, ?);",
+                    [
+                        (key, published_at, item_id)
+                        for item_id, published_at, signature in restored
+                        if signature is not None
+                        for key in band_keys(signature)
+                    ],
+                )
+                conn.execute(f"DELETE FROM part.feed_items WHERE {wanted};", params)
+                conn.execute(f"DELETE FROM main.archived_items WHERE {wanted};", params)
+                count, max_change_seq = conn.execute(
+                    "SELECT count(*), coalesce(max(change_seq), 0) FROM part.feed_items;"
+                ).fetchone()
+                conn.execute(
+                    "UPDATE main.feed_partitions SET rows = ?, max_change_seq = ? WHERE month = ?;",
+                    (count, max_change_seq, month),
+                )
+                conn.execute(_BUMP_GENERATION_SQL)
+        finally:
+            conn.execute("DETACH DATABASE part;")
+        logger.info("unarchived month=%s rows=%s from %s", month, len(restored), path)
+
+    def _assign_cluster(
+        self, conn: sqlite3.Connection, item: FeedItem, *, source_id: int, item_key: ItemKey
+    ) -> None:
+        """Place an upserted item in a near-duplicate cluster.
+
+        An item joins the cluster of another item with the same canonical URL, or of the
+        most similar title among its LSH candidates; otherwise it starts its own cluster
+        (cluster_id = its content_id). Items whose title is unchanged keep their cluster.
+        """
+
+        signature = title_signature(item.title)
+        current = conn.execute(
+            """
+            SELECT item_id, cluster_id, title_signature, published_at FROM feed_items
+            WHERE source_id = ? AND item_key = ?;
+            """,
+            (source_id, item_key),
+        ).fetchone()
+        if current["cluster_id"] is not None and current["title_signature"] == signature:
+            # Keep the band entries in step with a re-dated item.
+            conn.execute(
+                "UPDATE near_dup_bands SET published_at = ? "
+                "WHERE item_id = ? AND published_at != ?;",
+                (current["published_at"], current["item_id"], current["published_at"]),
+            )
+            return
+
+        item_id = current["item_id"]
+        cluster_id = self._find_cluster(conn, item, item_id, signature) or item.content_id
+        conn.execute(
+            "UPDATE feed_items SET cluster_id = ?, title_signature = ? WHERE item_id = ?;",
+            (cluster_id, signature, item_id),
+        )
+        conn.execute("DELETE FROM near_dup_bands WHERE item_id = ?;", (item_id,))
+        if signature is not None:
+            conn.executemany(
+                "INSERT OR IGNORE INTO near_dup_bands (band_key, published_at, item_id) "
+                "VALUES (?, ?, ?);",
+                [(key, current["published_at"], item_id) for key in band_keys(signature)],
+            )
+
+    def _find_cluster(
+        self, conn: sqlite3.Connection, item: FeedItem, item_id: int, signature: bytes | None
+    ) -> str | None:
+        row = conn.execute(
+            """
+            SELECT cluster_id FROM feed_items
+            WHERE source_url = ? AND item_id != ? AND cluster_id IS NOT NULL
+            LIMIT 1;
+            """,
+            (item.source_url, item_id),
+        ).fetchone()
+        if row is not None:
+            return row["cluster_id"]
+        if signature is None:
+            return None
 
-    def list_latest(self, *, limit: int = 50) -> list[FeedItem]:
+        published_at = FeedItem.ensure_utc(item.published_at)
+        keys = band_keys(signature)
+        # Band hits inside the time window (an index range per band), closest in time
+        # first, capped only then.
+        candidates = conn.execute(
+            f"""
+            SELECT cluster_id, title_signature FROM feed_items
+            WHERE item_id IN (
+                SELECT item_id FROM near_dup_bands
+                WHERE band_key IN ({", ".join("?" * len(keys))})
+                  AND published_at BETWEEN ? AND ?
+                  AND item_id != ?
+                GROUP BY item_id
+                ORDER BY abs(min(published_at) - ?)
+                LIMIT ?
+              )
+              AND cluster_id IS NOT NULL
+              AND title_signature IS NOT NULL;
+            """,
+            (
+                *keys,
+                to_epoch_us(published_at - _CLUSTER_WINDOW),
+                to_epoch_us(published_at + _CLUSTER_WINDOW),
+                item_id,
+                to_epoch_us(published_at),
+                _MAX_CLUSTER_CANDIDATES,
+            ),
+        ).fetchall()
+
+        best: tuple[float, str] | None = None
+        for c in candidates:
+            score = similarity(signature, c["title_signature"])
+            if score >= SIMILARITY_THRESHOLD and (best is None or score > best[0]):
+                best = (score, c["cluster_id"])
+        return best[1] if best else None
+
+    def get_many(self, content_ids: Sequence[str]) -> dict[str, FeedItem]:
+        """Look up items by id in one query, probing the (source_id, item_key) unique index
+        once per id."""
+
+        keys: list[tuple[int, ItemKey]] = []
+        for content_id in dict.fromkeys(content_ids):
+            try:
+                source, item_key = split_content_id(content_id)
+            except ValueError:
+                continue
+            source_id = self._lookup_source_id(source)
+            if source_id is not None:
+                keys.append((source_id, item_key))
+        if not keys:
+            return {}
+
+        rows = self._get_rows(self._read_connection(), keys)
+        # Ids not found among recent items are read from the month files that hold them.
+        missing = set(keys).difference((row[0], row[1]) for row in rows)
+        for partition, archived in self._archived_partitions(missing):
+            rows += self._get_rows(self._partition_connection(partition), archived)
+        return {item.content_id: item for item in self._items_from_rows(rows)}
+
+    def _archived_partitions(
+        self, keys: Iterable[tuple[int, ItemKey]]
+    ) -> list[tuple[Partition, list[tuple[int, ItemKey]]]]:
+        # The attached month partitions holding any of `keys`, with the keys each holds.
+        keys = list(keys)
+        if not keys or self._partition_dir is None:
+            return []
+        months = self._archived_months(self._read_connection(), keys)
+        if not months:
+            return []
+        return [(p, months[p.month]) for p in self.partitions() if p.month in months]
+
+    @staticmethod
+    def _get_rows(conn: sqlite3.Connection, keys: list[tuple[int, ItemKey]]) -> list:
+        # Item keys can be blobs, so the ids go in as bound VALUES rather than json_each.
+        # CROSS JOIN keeps the wanted ids as the outer loop.
+        return conn.execute(
+            f"""
+            WITH wanted (source_id, item_key) AS (
+              VALUES {", ".join(["(?, ?)"] * len(keys))}
+            )
+            SELECT {_ITEM_COLUMNS}
+            FROM wanted AS w
+            CROSS JOIN feed_items AS f
+              ON f.source_id = w.source_id AND f.item_key = w.item_key;
+            """,
+            [param for key in keys for param in key],
+        ).fetchall()
+
+    def known_items(self, content_ids: Sequence[str]) -> dict[str, KnownItem]:
+        """Look up stored items in one query per source (a feed is one source). Ids not found
+        among recent items are looked up in the archived-key index, and only the month files
+        that hold any of them are read."""
+
+        by_source: dict[int, dict[ItemKey, str]] = {}
+        for content_id in content_ids:
+            try:
+                source, item_key = split_content_id(content_id)
+            except ValueError:
+                continue
+            source_id = self._lookup_source_id(source)
+            if source_id is not None:
+                by_source.setdefault(source_id, {})[item_key] = content_id
+
+        found = self._known_in(self._read_connection(), by_source)
+        missing = [
+            (source_id, item_key)
+            for source_id, keys in by_source.items()
+            for item_key, content_id in keys.items()
+            if content_id not in found
+        ]
+        for partition, archived in self._archived_partitions(missing):
+            wanted: dict[int, dict[ItemKey, str]] = {}
+            for source_id, item_key in archived:
+                wanted.setdefault(source_id, {})[item_key] = by_source[source_id][item_key]
+            found.update(self._known_in(self._partition_connection(partition), wanted))
+        return found
+
+    @staticmethod
+    def _known_in(
+        conn: sqlite3.Connection, by_source: dict[int, dict[ItemKey, str]]
+    ) -> dict[str, KnownItem]:
+        found: dict[str, KnownItem] = {}
+        for source_id, keys in by_source.items():
+            item_keys = list(keys)
+            for start in range(0, len(item_keys), _KNOWN_ITEMS_CHUNK):
+                chunk = item_keys[start : start + _KNOWN_ITEMS_CHUNK]
+                rows = conn.execute(
+                    f"""
+                    SELECT item_key, title, source_name, source_url, published_at,
+                           image_last_checked
+                    FROM feed_items
+                    WHERE source_id = ? AND item_key IN ({", ".join("?" * len(chunk))});
+                    """,
+                    (source_id, *chunk),
+                )
+                for item_key, title, source_name, source_url, published_at, checked in rows:
+                    found[keys[item_key]] = KnownItem(
+                        fingerprint=make_fingerprint(
+                            title=title,
+                            source_name=source_name,
+                            source_url=source_url,
+                            published_at=from_epoch_us(published_at),
+                        ),
+                        image_last_checked=None if checked is None else from_epoch_us(checked),
+                    )
+        return found
+
+    def generation(self) -> int:
+        row = (
+            self._read_connection()
+            .execute("SELECT generation FROM feed_meta WHERE id = 1;")
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def list_latest(
+        self,
+        *,
+        limit: int = 50,
+        before: FeedCursor | None = None,
+        source: str | None = None,
+        collapse: bool = False,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[FeedItem]:
         if limit <= 0:
             return []
-        with self._connect() as conn:
-            rows = conn.execute(
+        clauses: list[str] = []
+        params: list = []
+        since_us = to_epoch_us(since) if since is not None else None
+        until_us = to_epoch_us(until) if until is not None else None
+        if since_us is not None:
+            clauses.append("f.published_at >= ?")
+            params.append(since_us)
+        if until_us is not None:
+            clauses.append("f.published_at < ?")
+            params.append(until_us)
+        if before is not None:
+            published_at, source_id, _ = self.order_key(
+                published_at=before.published_at, content_id=before.content_id
+            )
+            clauses.append("(f.published_at, f.source_id, f.item_key) < (?, ?, ?)")
+            params += [published_at, source_id, split_content_id(before.content_id)[1]]
+        if source is not None:
+            source_id = self._lookup_source_id(source)
+            if source_id is None:
+                return []
+            clauses.append("f.source_id = ?")
+            params.append(source_id)
+        if collapse:
+            # Keep only the newest member of each near-duplicate cluster.
+            clauses.append(
+                """
+                (f.cluster_id IS NULL OR NOT EXISTS (
+                  SELECT 1 FROM feed_items AS newer
+                  WHERE newer.cluster_id = f.cluster_id
+                    AND (newer.published_at, newer.source_id, newer.item_key)
+                      > (f.published_at, f.source_id, f.item_key)
+                ))
                 """
-                                SELECT
-                                    content_id,
-                                    title,
-                                    source_name,
-                                    source_url,
-                                    published_at,
-                                    image_url,
-                                    image_source,
-                                    image_last_checked
-                FROM feed_items
-                ORDER BY published_at DESC
+            )
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        sql = f"""
+            SELECT {_ITEM_COLUMNS}
+            FROM feed_items AS f
+            {where}
+            ORDER BY f.published_at DESC, f.source_id DESC, f.item_key DESC
+            LIMIT ?;
+        """
+        rows = self._read_connection().execute(sql, params).fetchall()
+        if self._partition_dir is not None:
+            # Months are disjoint and visited newest first: once the page is full and ends
+            # at or after a month's upper bound, neither it nor any older month can
+            # contribute. (Clusters are collapsed within each partition.)
+            for partition in self.partitions():
+                if len(rows) >= limit and rows[limit - 1][5] >= partition.upper_us:
+                    break
+                if since_us is not None and partition.upper_us <= since_us:
+                    break
+                if until_us is not None and partition.lower_us >= until_us:
+                    continue
+                older = self._partition_connection(partition).execute(sql, params).fetchall()
+                rows = list(heapq.merge(rows, older, key=_feed_order, reverse=True))[:limit]
+
+        return self._items_from_rows(rows)
+
+    def inserted_since(self, *, after: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        """Items inserted after insert sequence `after`, oldest first, with their sequence
+        numbers. Updates to existing items do not move them."""
+
+        if limit <= 0:
+            return []
+        rows = (
+            self._read_connection()
+            .execute(
+                f"""
+                SELECT f.item_id, {_ITEM_COLUMNS}
+                FROM feed_items AS f
+                WHERE f.item_id > ?
+                ORDER BY f.item_id
                 LIMIT ?;
                 """,
-                (limit,),
-            ).fetchall()
+                (after, limit),
+            )
+            .fetchall()
+        )
+        items = self._items_from_rows(row[1:] for row in rows)
+        return [(row[0], item) for row, item in zip(rows, items, strict=True)]
+
+    def list_changes(self, *, since: int, limit: int = 100) -> list[tuple[int, FeedItem]]:
+        """Items inserted or changed after change sequence `since`, as (sequence, item) in
+        change order. An item changed several times appears once, at its latest change."""
+
+        if limit <= 0:
+            return []
+        sql = f"""
+            SELECT f.change_seq, {_ITEM_COLUMNS}
+            FROM feed_items AS f
+            WHERE f.change_seq > ?
+            ORDER BY f.change_seq
+            LIMIT ?;
+        """
+        rows = self._read_connection().execute(sql, (since, limit)).fetchall()
+        # Archived items keep their sequence numbers; only months holding changes after
+        # `since` are read.
+        for partition in self.partitions():
+            if partition.max_change_seq > since:
+                older = self._partition_connection(partition).execute(sql, (since, limit))
+                rows = list(heapq.merge(rows, older, key=lambda row: row[0]))[:limit]
+        items = self._items_from_rows(row[1:] for row in rows)
+        return [(row[0], item) for row, item in zip(rows, items, strict=True)]
+
+    def last_inserted(self) -> int:
+        """Insert sequence of the newest item (0 if none was ever inserted)."""
+
+        row = (
+            self._read_connection()
+            .execute("SELECT seq FROM sqlite_sequence WHERE name = 'feed_items';")
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def sync_marks(self) -> tuple[int, int]:
+        """(change sequence, unsequenced writes). A reader that applied `list_changes` up to
+        the first is current for as long as the second stays the same; when it moves, rows
+        were pruned or a month was detached or attached, and the feed must be read again."""
+
+        row = (
+            self._read_connection()
+            .execute(
+                """
+                SELECT (SELECT value FROM change_sequence WHERE id = 1), unsequenced_writes
+                FROM feed_meta WHERE id = 1;
+                """
+            )
+            .fetchone()
+        )
+        return (row[0] or 0, row[1]) if row else (0, 0)
+
+    def write_marks(self) -> tuple[int, int]:
+        """Current (insert sequence, change sequence); pass to `writes_since` later to
+        count what was written in between."""
+
+        row = (
+            self._read_connection()
+            .execute("SELECT value FROM change_sequence WHERE id = 1;")
+            .fetchone()
+        )
+        return self.last_inserted(), row[0] if row else 0
 
+    def writes_since(self, marks: tuple[int, int]) -> dict[str, tuple[int, int]]:
+        """(inserted, updated) items per source since `write_marks()` returned `marks`.
+        An item inserted and then changed counts as inserted; pruned items not at all."""
+
+        inserted_after, changed_after = marks
+        rows = (
+            self._read_connection()
+            .execute(
+                """
+                SELECT s.source_key, count(*), sum(f.item_id > ?)
+                FROM feed_items AS f
+                JOIN sources AS s ON s.source_id = f.source_id
+                WHERE f.change_seq > ?
+                GROUP BY s.source_key;
+                """,
+                (inserted_after, changed_after),
+            )
+            .fetchall()
+        )
+        return {source: (inserted, changed - inserted) for source, changed, inserted in rows}
+
+    def _items_from_rows(self, rows: Iterable[Sequence]) -> list[FeedItem]:
+        # Rows are unpacked positionally (in SELECT order): cheaper than named access.
         return [
             FeedItem(
-                content_id=r["content_id"],
-                title=r["title"],
-                source_name=r["source_name"],
-                source_url=r["source_url"],
-                published_at=datetime.fromisoformat(r["published_at"]),
-                image_url=r["image_url"],
-                image_source=r["image_source"],
+                content_id=self._content_id(source_id, item_key),
+                title=title,
+                source_name=source_name,
+                source_url=source_url,
+                published_at=from_epoch_us(published_at),
+                image_url=image_url,
+                image_source=image_source,
                 image_last_checked=(
-                    datetime.fromisoformat(r["image_last_checked"])
-                    if r["image_last_checked"]
-                    else None
+                    from_epoch_us(image_last_checked) if image_last_checked is not None else None
                 ),
+                cluster_id=cluster_id,
             )
-            for r in rows
+            for (
+                source_id,
+                item_key,
+                title,
+                source_name,
+                source_url,
+                published_at,
+                image_url,
+                image_source,
+                image_last_checked,
+                cluster_id,
+            ) in rows
         ]
+
+    def prune(self, *, policy: RetentionPolicy, now: datetime | None = None) -> PruneReport:
+        """Delete items outside the retention policy and reclaim the freed space.
+
+        Deletes run in batches of `policy.batch_size`, each in its own transaction, so
+        readers and the ingest writer are never blocked for long.
+        """
+
+        if not policy.enabled:
+            return PruneReport(rows_deleted=0, bytes_freed=0)
+
+        dropped = PruneReport(rows_deleted=0, bytes_freed=0)
+        batch_size = max(1, policy.batch_size)
+        deleted = 0
+        conn = self._connect()
+        try:
+            pages_before = conn.execute("PRAGMA page_count;").fetchone()[0]
+            # Each limit is turned into a cutoff key once (the newest row to drop), then
+            # everything at or below it is deleted by keyset, batch after batch.
+            if policy.max_age is not None:
+                cutoff = FeedItem.ensure_utc(now or datetime.now(tz=UTC)) - policy.max_age
+                dropped = self._drop_partitions(before_us=to_epoch_us(cutoff))
+                deleted += self._delete_batched(
+                    conn, "published_at < ?", (to_epoch_us(cutoff),), batch_size
+                )
+            if policy.max_items_per_source is not None:
+                for (source_id,) in conn.execute("SELECT source_id FROM sources;").fetchall():
+                    row = conn.execute(
+                        """
+                        SELECT published_at, item_key FROM feed_items WHERE source_id = ?
+                        ORDER BY published_at DESC, item_key DESC
+                        LIMIT 1 OFFSET ?;
+                        """,
+                        (source_id, max(0, policy.max_items_per_source)),
+                    ).fetchone()
+                    if row is not None:
+                        deleted += self._delete_batched(
+                            conn,
+                            "source_id = ? AND (published_at, item_key) <= (?, ?)",
+                            (source_id, *row),
+                            batch_size,
+                        )
+            if policy.max_items is not None:
+                row = conn.execute(
+                    """
+                    SELECT published_at, source_id, item_key FROM feed_items
+                    ORDER BY published_at DESC, source_id DESC, item_key DESC
+                    LIMIT 1 OFFSET ?;
+                    """,
+                    (max(0, policy.max_items),),
+                ).fetchone()
+                if row is not None:
+                    deleted += self._delete_batched(
+                        conn, "(published_at, source_id, item_key) <= (?, ?, ?)", row, batch_size
+                    )
+
+            conn.execute("PRAGMA incremental_vacuum;")
+            pages_after = conn.execute("PRAGMA page_count;").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+        finally:
+            conn.close()
+
+        return PruneReport(
+            rows_deleted=deleted + dropped.rows_deleted,
+            bytes_freed=max(0, pages_before - pages_after) * page_size + dropped.bytes_freed,
+        )
+
+    @staticmethod
+    def _delete_batched(
+        conn: sqlite3.Connection, where: str, params: Sequence, batch_size: int
+    ) -> int:
+        """Delete the items matching `where`, `batch_size` per transaction."""
+
+        deleted = 0
+        while True:
+            with conn:
+                cur = conn.execute(
+                    f"""
+                    DELETE FROM feed_items WHERE item_id IN (
+                      SELECT item_id FROM feed_items WHERE {where} LIMIT ?
+                    );
+                    """,
+                    (*params, batch_size),
+                )
+                if cur.rowcount:
+                    conn.execute(_BUMP_UNSEQUENCED_SQL)
+            deleted += cur.rowcount
+            if cur.rowcount < batch_size:
+                return deleted
+
+    def partitions(self) -> list[Partition]:
+        """Attached month partitions, newest first (none without a partition directory)."""
+
+        if self._partition_dir is None:
+            return []
+        rows = (
+            self._read_connection()
+            .execute(
+                """
+                SELECT month, lower_us, upper_us, rows, max_change_seq FROM feed_partitions
+                ORDER BY upper_us DESC;
+                """
+            )
+            .fetchall()
+        )
+        partitions = [
+            Partition(
+                month=month,
+                path=self._partition_dir / partition_file(month),
+                lower_us=lower_us,
+                upper_us=upper_us,
+                rows=count,
+                max_change_seq=max_change_seq,
+            )
+            for month, lower_us, upper_us, count, max_change_seq in rows
+        ]
+        # Drop this thread's connections to months detached since.
+        conns = getattr(self._local, "partition_conns", {})
+        for month in conns.keys() - {p.month for p in partitions}:
+            self._close_thread_connection(conns.pop(month))
+        return partitions
+
+    def archive(self, *, hot_months: int, now: datetime | None = None) -> ArchiveReport:
+        """Move items published before the start of the month `hot_months` months ago
+        into their month partitions, leaving `feed_items` with the current month and the
+        `hot_months` before it. Months already archived (e.g. receiving a late item) are
+        merged into."""
+
+        if self._partition_dir is None:
+            raise ValueError("archiving needs a partition directory")
+        boundary = add_months(month_start(now or datetime.now(tz=UTC)), -max(0, hot_months))
+        boundary_us = to_epoch_us(boundary)
+        moved = 0
+        months: list[str] = []
+        conn = self._connect()
+        try:
+            while True:
+                (oldest,) = conn.execute(
+                    "SELECT min(published_at) FROM feed_items WHERE published_at < ?;",
+                    (boundary_us,),
+                ).fetchone()
+                if oldest is None:
+                    break
+                month = month_start(from_epoch_us(oldest))
+                moved += self._archive_month(
+                    conn,
+                    month=month_name(month),
+                    lower_us=to_epoch_us(month),
+                    upper_us=to_epoch_us(add_months(month, 1)),
+                )
+                months.append(month_name(month))
+            if moved:
+                conn.execute("PRAGMA incremental_vacuum;")
+        finally:
+            conn.close()
+        return ArchiveReport(rows_moved=moved, months=tuple(months))
+
+    def _archive_month(
+        self, conn: sqlite3.Connection, *, month: str, lower_us: int, upper_us: int
+    ) -> int:
+        # Copy and delete in one transaction across both files, so an item is never in
+        # neither (nor, once committed, in both).
+        path = self._partition_dir / partition_file(month)
+        create_partition_file(path, month=month, lower_us=lower_us, upper_us=upper_us)
+        columns = ", ".join(FEED_ITEM_COLUMNS)
+        in_month = "published_at >= ? AND published_at < ?"
+        conn.execute("ATTACH DATABASE ? AS part;", (str(path),))
+        try:
+            with conn:
+                conn.execute(
+                    f"""
+                    INSERT OR IGNORE INTO part.sources (source_id, source_key)
+                    SELECT source_id, source_key FROM main.sources
+                    WHERE source_id IN (SELECT source_id FROM main.feed_items WHERE {in_month});
+                    """,
+                    (lower_us, upper_us),
+                )
+                conn.execute(
+                    f"""
+                    INSERT OR REPLACE INTO main.archived_items (source_id, item_key, month)
+                    SELECT source_id, item_key, ? FROM main.feed_items WHERE {in_month};
+                    """,
+                    (month, lower_us, upper_us),
+                )
+                # A late item already archived under an older item_id replaces that row.
+                moved = conn.execute(
+                    f"""
+                    INSERT OR REPLACE INTO part.feed_items ({columns})
+                    SELECT {columns} FROM main.feed_items WHERE {in_month};
+                    """,
+                    (lower_us, upper_us),
+                ).rowcount
+                conn.execute(f"DELETE FROM main.feed_items WHERE {in_month};", (lower_us, upper_us))
+                count, max_change_seq = conn.execute(
+                    "SELECT count(*), coalesce(max(change_seq), 0) FROM part.feed_items;"
+                ).fetchone()
+                conn.execute(
+                    """
+                    INSERT INTO main.feed_partitions
+                      (month, lower_us, upper_us, rows, max_change_seq)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (month) DO UPDATE SET
+                      rows = excluded.rows, max_change_seq = excluded.max_change_seq;
+                    """,
+                    (month, lower_us, upper_us, count, max_change_seq),
+                )
+                conn.execute(_BUMP_GENERATION_SQL)
+        finally:
+            conn.execute("DETACH DATABASE part;")
+        logger.info("archived month=%s rows=%s into %s", month, moved, path)
+        return moved
+
+    def detach_partition(self, month: str) -> Path:
+        """Stop reading a month partition. Its file is left in place, to be moved to cold
+        storage or attached again; returns its path."""
+
+        with self._connect() as conn:
+            if not conn.execute("DELETE FROM feed_partitions WHERE month = ?;", (month,)).rowcount:
+                raise KeyError(f"no attached partition {month!r}")
+            conn.execute("DELETE FROM archived_items WHERE month = ?;", (month,))
+            conn.execute(_BUMP_UNSEQUENCED_SQL)
+        return self._partition_dir / partition_file(month)
+
+    def attach_partition(self, month: str) -> Partition:
+        """Read a month file (back) from the partition directory."""
+
+        if self._partition_dir is None:
+            raise ValueError("attaching needs a partition directory")
+        partition = read_partition_file(self._partition_dir / partition_file(month))
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO feed_partitions
+                      (month, lower_us, upper_us, rows, max_change_seq)
+                    VALUES (?, ?, ?, ?, ?);
+                    """,
+                    (
+                        partition.month,
+                        partition.lower_us,
+                        partition.upper_us,
+                        partition.rows,
+                        partition.max_change_seq,
+                    ),
+                )
+                conn.execute(_BUMP_UNSEQUENCED_SQL)
+            self._index_partition(conn, partition.month)
+        finally:
+            conn.close()
+        return partition
+
+    def _index_partition(self, conn: sqlite3.Connection, month: str) -> None:
+        # Add a month file's keys to the archived-key index.
+        conn.execute(
+            "ATTACH DATABASE ? AS part;", (str(self._partition_dir / partition_file(month)),)
+        )
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO main.archived_items (source_id, item_key, month)
+                    SELECT source_id, item_key, ? FROM part.feed_items;
+                    """,
+                    (month,),
+                )
+        finally:
+            conn.execute("DETACH DATABASE part;")
+
+    def _drop_partitions(self, *, before_us: int) -> PruneReport:
+        # Retention by age deletes whole month files once all of the month is too old.
+        rows = freed = 0
+        for partition in self.partitions():
+            if partition.upper_us > before_us:
+                continue
+            self.detach_partition(partition.month)
+            freed += partition.path.stat().st_size if partition.path.exists() else 0
+            partition.path.unlink(missing_ok=True)
+            rows += partition.rows
+        return PruneReport(rows_deleted=rows, bytes_freed=freed)
@@ -0,0 +1,101 @@
+"""Opt-in cProfile support for API requests and ingestion runs.
+
+Nothing here is imported or wrapped unless profiling is switched on, so unprofiled
+requests and runs pay nothing for it.
+
+cProfile only sees the thread it is enabled on, so work handed to thread pools (feed
+fetches, reader-pool queries) is profiled on those threads and merged into the same named
+stage. One `.pstats` file is written per stage; inspect it with `python -m pstats`.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import pstats
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Set while an API request is being profiled, so reader-pool work done on its behalf is
+# profiled into the same stage (see `AsyncFeedReader`).
+active_stage: ContextVar[tuple[StageProfiler, str] | None] = ContextVar(
+    "active_stage", default=None
+)
+
+
+class StageProfiler:
+    """Collects cProfile data per named stage, from any number of threads."""
+
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+        self._lock = threading.Lock()
+        self._profiles: dict[str, list[cProfile.Profile]] = {}
+
+    def __getstate__(self) -> dict[str, object]:
+        # Sent to ingestion worker processes, which write their own files.
+        return {"out_dir": self.out_dir}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__(state["out_dir"])
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the calling thread for the duration of the block. Stages must not nest
+        on one thread."""
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.setdefault(name, []).append(profile)
+
+    def call(self, name: str, fn: Callable[[], T]) -> T:
+        with self.stage(name):
+            return fn()
+
+    def iterate(self, name: str, fn: Callable[..., Iterable[T]]) -> Callable[..., Iterator[T]]:
+        """`fn`, with the iteration of its result profiled on whichever thread consumes it."""
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Iterator[T]:
+            with self.stage(name):
+                yield from fn(*args, **kwargs)
+
+        return wrapper
+
+    def write(self, *, prefix: str = "") -> list[Path]:
+        """Write `{prefix}{stage}.pstats` for every stage profiled so far."""
+
+        with self._lock:
+            profiles = dict(self._profiles)
+        if not profiles:
+            return []
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, runs in profiles.items():
+            stats = pstats.Stats(runs[0])
+            for run in runs[1:]:
+                stats.add(run)
+            path = self.out_dir / f"{prefix}{name}.pstats"
+            stats.dump_stats(path)
+            written.append(path)
+        return written
+
+
+def in_active_stage(fn: Callable[[], T]) -> Callable[[], T]:
+    """`fn`, profiled into the caller's active stage (if any) on the thread that runs it."""
+
+    active = active_stage.get()
+    if active is None:
+        return fn
+    profiler, name = active
+    return functools.partial(profiler.call, name, fn)
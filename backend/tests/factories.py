@@ -0,0 +1,44 @@
+"""Builders for test data shared by the test modules."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.ingestion.rss_common import RSSSource
+
+# When items built without a publication time were published.
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+# The source ingestion tests parse `rss_feed` documents as, and the time they do it at.
+SOURCE = RSSSource(source_id="test", source_name="Test", feed_url="https://example.invalid")
+NOW = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+
+def make_item(
+    content_id: str,
+    published_at: datetime = BASE,
+    *,
+    title: str | None = None,
+    source_url: str | None = None,
+) -> FeedItem:
+    """A feed item for tests; title and URL default to ones derived from `content_id`."""
+
+    return FeedItem(
+        content_id=content_id,
+        title=title or content_id,
+        source_name="Mock",
+        source_url=source_url or f"https://example.com/{content_id}",
+        published_at=published_at,
+    )
+
+
+def rss_feed(*items: tuple[str, str], published: str = "Mon, 01 Jan 2024 10:00:00 GMT") -> bytes:
+    """An RSS 2.0 document with one item per (slug, title), linking to example.com/slug."""
+
+    entries = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{slug}</link>"
+        f"<pubDate>{published}</pubDate></item>"
+        for slug, title in items
+    )
+    return f"<?xml version='1.0'?><rss version='2.0'><channel>{entries}</channel></rss>".encode()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import UTC, datetime
+
+from factories import make_item
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+
+
+def _changes(client: TestClient, since: int, limit: int = 100) -> tuple[list[str], int]:
+    r = client.get("/api/changes", params={"since": since, "limit": limit})
+    assert r.status_code == 200
+    body = r.json()
+    return [i["content_id"] for i in body["items"]], body["next_since"]
+
+
+def test_changes_pages_through_inserts(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    app = create_app(settings)
+    with TestClient(app) as client:
+        app.state.repo.upsert_many([make_item("a:1"), make_item("a:2"), make_item("a:3")])
+
+        first, since = _changes(client, 0, limit=2)
+        assert first == ["a:1", "a:2"]
+        rest, since = _changes(client, since, limit=2)
+        assert rest == ["a:3"]
+        assert _changes(client, since) == ([], since)
+
+
+def test_changes_report_real_updates_only(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    app = create_app(settings)
+    with TestClient(app) as client:
+        repo = app.state.repo
+        repo.upsert_many([make_item("a:1"), make_item("a:2")])
+        _, since = _changes(client, 0)
+
+        # Re-ingesting the same content, or only re-checking the image, is not a change.
+        repo.upsert(make_item("a:1"))
+        repo.upsert(dataclasses.replace(make_item("a:2"), image_last_checked=datetime.now(tz=UTC)))
+        assert _changes(client, since) == ([], since)
+
+        repo.upsert(dataclasses.replace(make_item("a:1"), title="Edited"))
+        changed, next_since = _changes(client, since)
+        assert changed == ["a:1"]
+        assert next_since > since
+        # The earlier full sync now lists a:1 after a:2 (its latest change).
+        assert _changes(client, 0)[0] == ["a:2", "a:1"]
+
+
+def test_changes_rejects_negative_since(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    with TestClient(create_app(settings)) as client:
+        assert client.get("/api/changes", params={"since": -1}).status_code == 422
@@ -1,6 +1,9 @@
+import base64
+
 from fastapi.testclient import TestClient
 
 from provenance_feed.api.app import create_app
+from provenance_feed.api.compression import negotiate_encoding
 from provenance_feed.config import Settings
 from provenance_feed.ingestion.mock_source import fetch_mock_items
 from provenance_feed.ingestion.service import ingest_once
@@ -10,14 +13,79 @@ def test_feed_endpoint_returns_list(tmp_path) -> None:
     # Do not hit the network in tests.
     settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
     app = create_app(settings)
-    ingest_once(repo=app.state.repo, records=fetch_mock_items())
-    client = TestClient(app)
-    r = client.get("/api/feed")
-    assert r.status_code == 200
-    data = r.json()
-    assert isinstance(data, list)
-    if data:
-        assert "content_id" in data[0]
-        assert "title" in data[0]
-        assert "source_name" in data[0]
-        assert "published_at" in data[0]
+    with TestClient(app) as client:
+        ingest_once(repo=app.state.repo, records=fetch_mock_items())
+        r = client.get("/api/feed")
+        assert r.status_code == 200
+        data = r.json()
+        assert isinstance(data, list)
+        if data:
+            assert "content_id" in data[0]
+            assert "title" in data[0]
+            assert "source_name" in data[0]
+            assert "published_at" in data[0]
+
+
+def test_feed_endpoint_pages_with_cursor(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    app = create_app(settings)
+    with TestClient(app) as client:
+        ingest_once(repo=app.state.repo, records=fetch_mock_items())
+
+        first = client.get("/api/feed", params={"limit": 2})
+        assert [i["content_id"] for i in first.json()] == ["mock:3", "mock:2"]
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = client.get("/api/feed", params={"limit": 2, "cursor": cursor})
+        assert [i["content_id"] for i in second.json()] == ["mock:1"]
+        assert "X-Next-Cursor" not in second.headers
+
+        assert client.get("/api/feed", params={"cursor": "not-a-cursor"}).status_code == 400
+        # Well-formed token, but its content_id has no `source:` part.
+        bad = base64.urlsafe_b64encode(b"2025-01-01T00:00:00+00:00|nocolon").decode()
+        assert client.get("/api/feed", params={"cursor": bad}).status_code == 400
+
+
+def test_feed_endpoint_compresses_once_per_generation(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    app = create_app(settings)
+    with TestClient(app) as client:
+        repo = app.state.repo
+        ingest_once(repo=repo, records=fetch_mock_items())
+
+        calls: list[int] = []
+        list_latest = repo.list_latest
+
+        def counting_list_latest(**kwargs):
+            calls.append(1)
+            return list_latest(**kwargs)
+
+        repo.list_latest = counting_list_latest
+
+        plain = client.get("/api/feed", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["vary"].startswith("Accept-Encoding")
+
+        gz = client.get("/api/feed", headers={"Accept-Encoding": "gzip"})
+        assert gz.headers["content-encoding"] == "gzip"
+        assert gz.content == plain.content
+        assert len(calls) == 1
+
+        cache = app.state.response_cache
+        entry = cache.get(repo.generation(), (50, None, None, False))
+        assert entry is not None
+        first_variant, _ = entry.encoded("gzip")
+        client.get("/api/feed", headers={"Accept-Encoding": "gzip"})
+        assert entry.encoded("gzip")[0] is first_variant
+
+        ingest_once(repo=repo, records=fetch_mock_items()[:1])
+        client.get("/api/feed", headers={"Accept-Encoding": "gzip"})
+        assert len(calls) == 2
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("*") is not None
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from factories import make_item
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.api.schemas import MAX_BATCH_GET_IDS
+from provenance_feed.config import Settings
+
+DIGEST = "ab" * 32
+
+
+@pytest.fixture
+def client(tmp_path) -> Iterator[TestClient]:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    with TestClient(create_app(settings)) as client:
+        client.app.state.repo.upsert_many(
+            [make_item("mock:1"), make_item("mock:2"), make_item(f"bbc:{DIGEST}")]
+        )
+        yield client
+
+
+def test_batch_get_preserves_order_and_reports_missing(client) -> None:
+    ids = ["mock:2", "nope:1", f"bbc:{DIGEST}", "mock:9", "mock:1", "mock:2", "not-an-id"]
+
+    r = client.post("/api/items:batchGet", json={"content_ids": ids})
+
+    assert r.status_code == 200
+    body = r.json()
+    assert [i["content_id"] for i in body["items"]] == ["mock:2", f"bbc:{DIGEST}", "mock:1"]
+    assert body["missing"] == ["nope:1", "mock:9", "not-an-id"]
+
+
+def test_batch_get_limits_request_size(client) -> None:
+    ids = [f"mock:{i}" for i in range(MAX_BATCH_GET_IDS + 1)]
+    assert client.post("/api/items:batchGet", json={"content_ids": ids}).status_code == 422
+    r = client.post("/api/items:batchGet", json={"content_ids": ids[:MAX_BATCH_GET_IDS]})
+    assert r.status_code == 200
+    assert len(r.json()["items"]) == 2
+
+
+def test_batch_get_is_one_indexed_query(client) -> None:
+    repo = client.app.state.repo
+    conn = repo._read_connection()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    found = repo.get_many(["mock:1", f"bbc:{DIGEST}", "mock:404"])
+
+    conn.set_trace_callback(None)
+    assert set(found) == {"mock:1", f"bbc:{DIGEST}"}
+    assert len(statements) == 1
+    plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statements[0]}"))
+    assert "SEARCH f USING INDEX sqlite_autoindex_feed_items_1" in plan
+    assert "SCAN f" not in plan
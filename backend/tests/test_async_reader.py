@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from datetime import UTC, datetime
+
+import pytest
+
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+
+class _RecordingRepo:
+    def __init__(self) -> None:
+        self.threads: list[str] = []
+
+    def list_latest(self, *, limit: int = 50, **_filters) -> list[FeedItem]:
+        self.threads.append(threading.current_thread().name)
+        return []
+
+
+def test_async_reader_uses_dedicated_threads() -> None:
+    repo = _RecordingRepo()
+    reader = AsyncFeedReader(repo=repo, max_workers=2)
+
+    async def run() -> None:
+        await asyncio.gather(*(reader.list_latest(limit=5) for _ in range(10)))
+
+    try:
+        asyncio.run(run())
+    finally:
+        reader.close()
+
+    assert len(repo.threads) == 10
+    assert all(name.startswith("feed-reader") for name in repo.threads)
+    assert len(set(repo.threads)) <= 2
+
+
+def test_async_reader_reads_from_sqlite(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    repo.upsert(
+        FeedItem(
+            content_id="mock:1",
+            title="A",
+            source_name="Mock",
+            source_url="https://example.com/1",
+            published_at=datetime(2025, 1, 1, 12, 0, tzinfo=UTC),
+        )
+    )
+    reader = AsyncFeedReader(repo=repo)
+    try:
+        items = asyncio.run(reader.list_latest(limit=10))
+    finally:
+        reader.close()
+
+    assert [i.content_id for i in items] == ["mock:1"]
+
+
+def test_closing_the_repository_closes_every_reader_threads_connections(tmp_path) -> None:
+    repo = SQLiteFeedRepository(
+        database_path=tmp_path / "feed.db", partition_dir=tmp_path / "partitions"
+    )
+    repo.init_schema()
+    repo.upsert_many(
+        [
+            FeedItem(
+                content_id=f"mock:{month}",
+                title="A",
+                source_name="Mock",
+                source_url=f"https://example.com/{month}",
+                published_at=datetime(2025, month, 1, tzinfo=UTC),
+            )
+            for month in (1, 2, 6)
+        ]
+    )
+    repo.archive(hot_months=0, now=datetime(2025, 6, 15, tzinfo=UTC))
+    reader = AsyncFeedReader(repo=repo, max_workers=3)
+
+    async def run() -> list[list[FeedItem]]:
+        return await asyncio.gather(*(reader.list_latest(limit=5) for _ in range(9)))
+
+    try:
+        assert all(len(page) == 3 for page in asyncio.run(run()))
+    finally:
+        reader.close()
+    conns = set(repo._thread_conns)
+    # A read connection per thread, plus one per thread and month file.
+    assert len(conns) >= 3
+
+    repo.close()
+    assert not repo._thread_conns
+    for conn in conns:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1;")
+    # Used again, it reconnects.
+    assert len(repo.list_latest(limit=5)) == 3
+    repo.close()
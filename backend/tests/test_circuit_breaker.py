@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from provenance_feed.ingestion.circuit_breaker import CircuitBreakers, CircuitOpenError
+from provenance_feed.persistence.breakers import CLOSED, HALF_OPEN, OPEN, SQLiteBreakerStore
+
+URL = "https://feeds.example.com/rss"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = datetime(2025, 1, 1, tzinfo=UTC)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _fail() -> bytes:
+    raise URLError("timed out")
+
+
+def _trip(breakers: CircuitBreakers, times: int) -> None:
+    for _ in range(times):
+        with pytest.raises(URLError):
+            breakers.call(URL, _fail)
+
+
+def test_breaker_opens_after_threshold_and_skips_host() -> None:
+    breakers = CircuitBreakers(failure_threshold=2, clock=_Clock())
+    _trip(breakers, 2)
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breakers.call("https://feeds.example.com/other", lambda: calls.append(1))
+    assert calls == []
+    (b,) = breakers.breakers()
+    assert (b.host, b.state, b.trips) == ("feeds.example.com", OPEN, 1)
+    assert breakers.skipped() == {"feeds.example.com": 1}
+    # Other hosts are unaffected.
+    assert breakers.call("https://other.example.com/", lambda: b"ok") == b"ok"
+
+
+def test_half_open_allows_one_probe_and_cooldown_grows() -> None:
+    clock = _Clock()
+    breakers = CircuitBreakers(failure_threshold=1, cooldown=timedelta(minutes=5), clock=clock)
+    _trip(breakers, 1)
+    assert breakers.breakers()[0].open_until == clock.now + timedelta(minutes=5)
+
+    clock.now += timedelta(minutes=5)
+    assert breakers.allow(URL)  # the probe
+    assert breakers.breakers()[0].state == HALF_OPEN
+    assert not breakers.allow(URL)  # only one probe at a time
+
+    breakers.record_failure(URL)
+    b = breakers.breakers()[0]
+    assert (b.state, b.trips, b.open_until) == (OPEN, 2, clock.now + timedelta(minutes=10))
+
+    clock.now += timedelta(minutes=10)
+    assert breakers.call(URL, lambda: b"ok") == b"ok"
+    assert breakers.breakers()[0].state == CLOSED
+    assert breakers.breakers()[0].trips == 0
+
+
+def test_client_errors_do_not_trip_the_breaker() -> None:
+    breakers = CircuitBreakers(failure_threshold=1)
+
+    def not_found() -> bytes:
+        raise HTTPError(URL, 404, "Not Found", {}, None)
+
+    with pytest.raises(HTTPError):
+        breakers.call(URL, not_found)
+    assert breakers.allow(URL)
+
+
+def test_breaker_state_persists_across_runs(tmp_path) -> None:
+    store = SQLiteBreakerStore(tmp_path / "feed.db")
+    store.init_schema()
+    clock = _Clock()
+    first = CircuitBreakers.load(store, failure_threshold=1, clock=clock)
+    _trip(first, 1)
+    first.save()
+
+    second = CircuitBreakers.load(store, failure_threshold=1, clock=clock)
+    assert second.breakers() == first.breakers()
+    assert not second.allow(URL)
+
+
+def test_breaker_times_migrate_from_iso_text_to_epoch_micros(tmp_path) -> None:
+    db = tmp_path / "feed.db"
+    # A file whose breaker table was created with ISO text times, before schema versioning.
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE host_breakers (host TEXT PRIMARY KEY, state TEXT NOT NULL, "
+            "failures INTEGER NOT NULL, trips INTEGER NOT NULL, open_until TEXT NULL, "
+            "updated_at TEXT NOT NULL);"
+        )
+        conn.execute(
+            "INSERT INTO host_breakers VALUES "
+            "('a.example', 'open', 0, 2, '2025-01-01T12:00:00.250000+00:00', "
+            "'2025-01-01T11:00:00+00:00'), "
+            "('b.example', 'closed', 1, 0, NULL, '2025-01-01T11:00:00+00:00');"
+        )
+    store = SQLiteBreakerStore(db)
+    store.init_schema()
+
+    opened = datetime(2025, 1, 1, 12, 0, 0, 250000, tzinfo=UTC)
+    assert {b.host: b.open_until for b in store.load_breakers()} == {
+        "a.example": opened,
+        "b.example": None,
+    }
+    store.save_breakers(store.load_breakers())
+    with sqlite3.connect(db) as conn:
+        rows = conn.execute(
+            "SELECT typeof(open_until), typeof(updated_at) FROM host_breakers ORDER BY host;"
+        ).fetchall()
+    assert rows == [("integer", "integer"), ("null", "integer")]
+
+
+def test_breakers_round_trip_to_worker_processes() -> None:
+    breakers = CircuitBreakers(failure_threshold=1)
+    _trip(breakers, 1)
+    breakers.allow(URL)
+
+    copy = pickle.loads(pickle.dumps(breakers))
+    assert copy.breakers() == breakers.breakers()
+    assert copy.skipped() == {}
+
+    initial = copy.breakers()
+    copy.record_failure("https://pages.example.com/a")
+    changed = copy.changed_since(initial)
+    assert [b.host for b in changed] == ["pages.example.com"]
+    breakers.merge(changed, {"pages.example.com": 2})
+    assert breakers.skipped()["pages.example.com"] == 2
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from factories import make_item
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.export.ndjson import main, ndjson_chunks
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _item(i: int) -> FeedItem:
+    return make_item(f"{'ab'[i % 2]}:{i}", START + timedelta(days=i))
+
+
+def _ids(body: bytes) -> list[str]:
+    return [json.loads(line)["content_id"] for line in body.splitlines()]
+
+
+@pytest.fixture
+def client(tmp_path) -> Iterator[TestClient]:
+    settings = Settings(
+        database_path=tmp_path / "feed.db", auto_ingest_on_startup=False, export_chunk_size=4
+    )
+    with TestClient(create_app(settings)) as client:
+        client.app.state.repo.upsert_many([_item(i) for i in range(23)])
+        yield client
+
+
+def test_export_streams_every_row_with_filters_and_resume(client) -> None:
+    newest_first = [f"{'ab'[i % 2]}:{i}" for i in range(22, -1, -1)]
+
+    r = client.get("/api/export.ndjson", headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in r.headers
+    lines = r.content.splitlines()
+    assert _ids(r.content) == newest_first
+    assert json.loads(lines[0]) == client.get("/api/feed", params={"limit": 1}).json()[0]
+    # Byte for byte what the CLI writes.
+    assert r.content == b"".join(ndjson_chunks(client.app.state.repo))
+
+    r = client.get(
+        "/api/export.ndjson",
+        params={
+            "source": "b",
+            "since": (START + timedelta(days=5)).isoformat(),
+            "until": (START + timedelta(days=15)).isoformat(),
+        },
+    )
+    assert _ids(r.content) == ["b:13", "b:11", "b:9", "b:7", "b:5"]
+
+    # Resuming after the eighth line (a chunk boundary) and mid-chunk.
+    for n in (8, 10):
+        r = client.get("/api/export.ndjson", params={"after": newest_first[n - 1]})
+        assert _ids(r.content) == newest_first[n:]
+    assert client.get("/api/export.ndjson", params={"after": "a:99"}).status_code == 400
+
+
+def test_export_is_gzipped_when_accepted(client) -> None:
+    with client.stream("GET", "/api/export.ndjson", headers={"Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        raw = b"".join(r.iter_raw())
+    assert len(_ids(gzip.decompress(raw))) == 23
+
+
+def test_cli_export_and_resume(tmp_path, monkeypatch, capsys) -> None:
+    monkeypatch.setenv("BACKEND_DATABASE_PATH", str(tmp_path / "feed.db"))
+    monkeypatch.setenv("BACKEND_PARTITION_DIR", str(tmp_path / "partitions"))
+    monkeypatch.setenv("BACKEND_EXPORT_CHUNK_SIZE", "5")
+    repo = SQLiteFeedRepository(
+        database_path=tmp_path / "feed.db", partition_dir=tmp_path / "partitions"
+    )
+    repo.init_schema()
+    repo.upsert_many([_item(i) for i in range(120)])
+    # Spread the history over archived month files too.
+    assert repo.archive(hot_months=1, now=START + timedelta(days=120)).rows_moved == 90
+    newest_first = [f"{'ab'[i % 2]}:{i}" for i in range(119, -1, -1)]
+
+    out = tmp_path / "feed.ndjson.gz"
+    main(["-o", str(out), "--gzip", "--until", (START + timedelta(days=100)).isoformat()])
+    assert "Exported 100 items" in capsys.readouterr().err
+    exported = _ids(gzip.decompress(out.read_bytes()))
+    assert exported == newest_first[20:]
+
+    # An export to a file that ends mid-member (gzip) or mid-line resumes after its last
+    # complete line, leaving a file that reads back whole.
+    until = ["--until", (START + timedelta(days=100)).isoformat()]
+    whole = out.read_bytes()
+    for cut in (len(whole) // 2, len(whole) - 3, len(whole)):
+        out.write_bytes(whole[:cut])
+        main(["-o", str(out), "--gzip", "--append", *until])
+        assert _ids(gzip.decompress(out.read_bytes())) == exported
+    plain = tmp_path / "feed.ndjson"
+    main(["-o", str(plain), *until])
+    whole = plain.read_bytes()
+    for cut in (len(whole) // 2, whole.index(b"\n") + 1, 10, 0):
+        plain.write_bytes(whole[:cut])
+        main(["-o", str(plain), "--append", *until])
+        assert plain.read_bytes() == whole
+
+    # Starting after an item, into a new file.
+    main(["-o", str(out), "--gzip", "--after", exported[49]])
+    assert _ids(gzip.decompress(out.read_bytes())) == newest_first[70:]
+    for args in (["--after", exported[49]], ["--gzip"]):
+        with pytest.raises(SystemExit):
+            main(["-o", str(plain), "--append", *args])
+    assert plain.read_bytes() == whole
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+from datetime import UTC, datetime, timedelta
+
+from factories import make_item
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.api.stream import HEARTBEAT, FeedBroadcaster, sse_stream
+from provenance_feed.config import Settings
+from provenance_feed.persistence.async_reader import AsyncFeedReader
+from provenance_feed.persistence.retention import RetentionPolicy
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _repo(tmp_path) -> SQLiteFeedRepository:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    return repo
+
+
+def _ids(events) -> list[str]:
+    return [json.loads(message.split(b"data: ", 1)[1])["content_id"] for _, message in events]
+
+
+def test_insert_sequence_skips_updates_and_is_never_reused(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    repo.upsert_many([make_item("a:1"), make_item("a:2")])
+    assert [i.content_id for _, i in repo.inserted_since(after=0)] == ["a:1", "a:2"]
+    head = repo.last_inserted()
+
+    repo.upsert(dataclasses.replace(make_item("a:1"), title="edited"))
+    assert repo.inserted_since(after=head) == []
+
+    # Pruning the newest insert must not let the next insert take over its sequence.
+    repo.upsert(make_item("a:old", BASE - timedelta(days=365)))
+    pruned_seq = repo.last_inserted()
+    repo.prune(policy=RetentionPolicy(max_age=timedelta(days=30)), now=BASE)
+    repo.upsert(make_item("a:3"))
+    assert [(s > pruned_seq, i.content_id) for s, i in repo.inserted_since(after=head)] == [
+        (True, "a:3")
+    ]
+
+
+def test_broadcaster_publishes_new_inserts_and_resumes(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    repo.upsert(make_item("a:0"))
+    reader = AsyncFeedReader(repo=repo)
+    broadcaster = FeedBroadcaster(reader=reader, poll_seconds=3600, buffer_size=2)
+
+    async def run() -> None:
+        await broadcaster.start()
+        start = broadcaster.head
+        assert await broadcaster.poll() == 0
+
+        repo.upsert_many([make_item("a:1"), make_item("a:2"), make_item("a:3")])
+        assert await broadcaster.poll() == 3
+
+        assert _ids(await broadcaster.events_after(start)) == ["a:1", "a:2", "a:3"]
+        first = (await broadcaster.events_after(start))[0][0]
+        # From the two-event buffer, and from the database for the older resume point.
+        assert _ids(await broadcaster.events_after(first)) == ["a:2", "a:3"]
+        assert await broadcaster.events_after(broadcaster.head) == []
+        await broadcaster.stop()
+
+    try:
+        asyncio.run(run())
+    finally:
+        reader.close()
+
+
+def test_sse_stream_sends_heartbeats_then_items(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    reader = AsyncFeedReader(repo=repo)
+    broadcaster = FeedBroadcaster(reader=reader, poll_seconds=0.01)
+
+    async def run() -> list[bytes]:
+        stream = sse_stream(broadcaster, after=0, heartbeat_seconds=0.05)
+        chunks = [await anext(stream), await anext(stream)]
+        repo.upsert(make_item("a:1"))
+        chunks.append(await anext(stream))
+        await stream.aclose()
+        await broadcaster.stop()
+        return chunks
+
+    try:
+        retry, heartbeat, event = asyncio.run(run())
+    finally:
+        reader.close()
+
+    assert retry.startswith(b"retry: ")
+    assert heartbeat == HEARTBEAT
+    assert event.startswith(b"id: 1\nevent: item\ndata: ")
+    assert _ids([(1, event)]) == ["a:1"]
+
+
+def test_stream_rejects_invalid_last_event_id(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    with TestClient(create_app(settings)) as client:
+        r = client.get("/api/feed/stream", headers={"Last-Event-ID": "not-a-number"})
+        assert r.status_code == 400
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import gzip
+import pickle
+import ssl
+import threading
+import zlib
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from provenance_feed.ingestion import http_client
+from provenance_feed.ingestion.http_client import HTTPClient, ResponseTooLargeError, brotli
+from provenance_feed.ingestion.rss_common import fetch_feed_xml, fetch_page_html
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[tuple[str, int]] = set()
+
+    def do_GET(self) -> None:  # noqa: N802
+        _Handler.connections.add(self.client_address)
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/feed")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith(("/compressed/", "/truncated/", "/bomb/")):
+            body = b"<rss>" + b"<item>same story again</item>" * 2000 + b"</rss>"
+            if self.path.startswith("/bomb/"):
+                body = b"\0" * 50_000_000
+            encoding = self.path.rsplit("/", 1)[-1]
+            if encoding == "gzip":
+                body = gzip.compress(body)
+            elif encoding == "deflate":
+                # Raw deflate (no zlib wrapper), as some servers send it.
+                c = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+                body = c.compress(body) + c.flush()
+            elif encoding == "br":
+                body = brotli.compress(body, quality=1)
+            if self.path.startswith("/truncated/"):
+                body = body[: len(body) // 2]
+            _Handler.accept_encoding = self.headers["Accept-Encoding"]
+            self.send_response(200)
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        body = f"{self.path} {self.headers['Accept']}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/drop":
+            # Close the keep-alive connection without announcing it, as idle servers do.
+            self.close_connection = True
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    _Handler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetchers_reuse_one_keep_alive_connection_per_host(server: str) -> None:
+    client = HTTPClient()
+    assert fetch_feed_xml(url=f"{server}/feed", client=client).startswith(b"/feed application/rss")
+    for i in range(3):
+        assert fetch_page_html(url=f"{server}/a/{i}", client=client).startswith(b"/a/")
+
+    assert client.connections_opened == 1
+    assert len(_Handler.connections) == 1
+    client.close()
+
+
+def test_follows_redirects_and_raises_http_errors(server: str) -> None:
+    client = HTTPClient()
+    resp = client.get(f"{server}/old")
+    assert (resp.url, resp.status) == (f"{server}/feed", 200)
+
+    with pytest.raises(HTTPError) as e:
+        client.get(f"{server}/missing")
+    assert e.value.code == 404
+    client.close()
+
+
+def test_reconnects_when_an_idle_connection_was_closed(server: str) -> None:
+    client = HTTPClient()
+    client.get(f"{server}/drop")
+    assert client.get(f"{server}/two").body.startswith(b"/two")
+    assert client.connections_opened == 2
+    client.close()
+
+
+def test_client_pickles_without_connections(server: str) -> None:
+    client = HTTPClient(max_idle_per_host=2, dns_ttl_seconds=5)
+    client.get(f"{server}/one")
+    copy = pickle.loads(pickle.dumps(client))
+    assert copy._idle == {}
+    assert copy._max_idle_per_host == 2
+    assert copy.get(f"{server}/two").status == 200
+    client.close()
+    copy.close()
+
+
+def test_https_connections_share_one_default_ssl_context(monkeypatch) -> None:
+    built = []
+    create = ssl.create_default_context
+    monkeypatch.setattr(ssl, "create_default_context", lambda: built.append(1) or create())
+    client = HTTPClient()
+    monkeypatch.setattr(client, "_resolve", lambda host, port: [])
+    # Opening does not connect yet.
+    first = client._open(("https", "a.example.invalid", 443), 1.0)
+    second = client._open(("https", "b.example.invalid", 443), 1.0)
+    assert len(built) == 1
+    assert first._context is second._context
+    monkeypatch.undo()
+    assert pickle.loads(pickle.dumps(client))._default_ssl_context is None
+
+
+def test_requests_go_through_the_environment_proxy(server: str, monkeypatch) -> None:
+    for name in ("no_proxy", "NO_PROXY", "http_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("HTTP_PROXY", server)
+    client = HTTPClient()
+    # The test server plays the proxy: it is sent the absolute URL.
+    r = client.get("http://feeds.example.invalid/rss?x=1")
+    assert r.body.startswith(b"http://feeds.example.invalid/rss?x=1 ")
+    client.close()
+
+    monkeypatch.setenv("HTTP_PROXY", "http://127.0.0.1:9")
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    client = HTTPClient()
+    assert client.get(f"{server}/direct").body.startswith(b"/direct")
+    client.close()
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_negotiates_and_decodes_compressed_bodies(server: str, encoding: str) -> None:
+    client = HTTPClient()
+    resp = client.get(f"{server}/compressed/{encoding}")
+
+    assert "gzip" in _Handler.accept_encoding
+    assert resp.body.startswith(b"<rss><item>") and len(resp.body) == 58_011
+    assert resp.wire_bytes < len(resp.body) // 10
+    assert (client.bytes_received, client.bytes_decoded) == (resp.wire_bytes, len(resp.body))
+    client.close()
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_rejects_truncated_compressed_bodies(server: str, encoding: str) -> None:
+    client = HTTPClient()
+    with pytest.raises(URLError, match="truncated"):
+        client.get(f"{server}/truncated/{encoding}")
+    client.close()
+
+
+def test_brotli_bomb_is_cut_off_at_the_cap(server: str, monkeypatch) -> None:
+    pytest.importorskip("brotli")
+    decoded: list[int] = []
+    decode = http_client._Decoder.decode
+
+    def spy(self, data: bytes, limit: int) -> bytes:
+        out = decode(self, data, limit)
+        decoded.append(len(out))
+        return out
+
+    monkeypatch.setattr(http_client._Decoder, "decode", spy)
+    client = HTTPClient(max_body_bytes=1_000_000)
+    with pytest.raises(ResponseTooLargeError):
+        client.get(f"{server}/bomb/br")
+    # Decoding stopped near the cap instead of inflating all 50 MB.
+    assert sum(decoded) < 2_000_000
+    client.close()
+
+
+def test_aborts_when_decoded_body_exceeds_cap(server: str) -> None:
+    client = HTTPClient(max_body_bytes=10_000)
+    with pytest.raises(ResponseTooLargeError):
+        client.get(f"{server}/compressed/gzip")
+    # The abandoned connection is not reused.
+    assert client.get(f"{server}/after").body.startswith(b"/after")
+    assert client.connections_opened == 2
+    client.close()
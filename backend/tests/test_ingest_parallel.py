@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+
+from provenance_feed.ingestion.parallel import ingest_sharded, shard_sources
+from provenance_feed.ingestion.rss_common import RSSSource
+from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+from provenance_feed.profiling import StageProfiler
+
+
+def _source(source_id: str) -> RSSSource:
+    return RSSSource(source_id=source_id, source_name=source_id.upper(), feed_url="https://x")
+
+
+# Module-level so spawned worker processes can import them.
+def _fake_fetch(*, source: RSSSource, timeout_seconds: float) -> list[dict]:
+    if source.source_id == "boom":
+        raise RuntimeError("feed unavailable")
+    if source.source_id == "crash":
+        os._exit(3)
+    return [
+        {
+            "source": source.source_id,
+            "source_item_id": str(i),
+            "title": f"{source.source_id} {i}",
+            "source_name": source.source_name,
+            "source_url": f"https://example.com/{source.source_id}/{i}",
+            "published_at": f"2025-01-01T12:0{i}:00+00:00",
+        }
+        for i in range(3)
+    ]
+
+
+def test_shard_sources_round_robin() -> None:
+    sources = [_source(s) for s in "abcde"]
+    shards = shard_sources(sources, 2)
+    assert [[s.source_id for s in shard] for shard in shards] == [["a", "c", "e"], ["b", "d"]]
+    assert len(shard_sources(sources, 10)) == 5
+
+
+def test_ingest_sharded_persists_from_parent_and_reports_per_worker(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+
+    summaries = ingest_sharded(
+        repo=repo,
+        sources=[_source("a"), _source("b"), _source("boom")],
+        workers=3,
+        batch_size=2,
+        fetch_source=_fake_fetch,
+    )
+
+    assert [s.sources for s in summaries] == [["a"], ["b"], ["boom"]]
+    assert [s.upserted for s in summaries] == [3, 3, 0]
+    assert summaries[2].errors == {"boom": "RuntimeError: feed unavailable"}
+    assert not any(s.crashed for s in summaries)
+    assert all(s.pid and s.pid != os.getpid() for s in summaries)
+    assert len(repo.list_latest(limit=100)) == 6
+
+
+def test_ingest_sharded_survives_worker_crash(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+
+    summaries = ingest_sharded(
+        repo=repo,
+        sources=[_source("a"), _source("crash")],
+        workers=2,
+        fetch_source=_fake_fetch,
+    )
+
+    assert not summaries[0].crashed
+    assert summaries[1].crashed
+    assert summaries[1].exitcode == 3
+    assert {i.content_id.split(":")[0] for i in repo.list_latest(limit=100)} == {"a"}
+
+
+def test_ingest_sharded_profiles_workers_and_persistence(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    profiler = StageProfiler(tmp_path / "profile")
+
+    ingest_sharded(
+        repo=repo,
+        sources=[_source("a"), _source("b")],
+        workers=2,
+        fetch_source=_fake_fetch,
+        profiler=profiler,
+    )
+    profiler.write()
+
+    assert sorted(p.name for p in (tmp_path / "profile").iterdir()) == [
+        "persist.pstats",
+        "worker0-fetch.pstats",
+        "worker1-fetch.pstats",
+    ]
+
+
+def test_ingest_commits_on_batch_size_boundaries(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    # One upsert_many call is one transaction.
+    commits: list[int] = []
+    upsert_many = repo.upsert_many
+
+    def counting_upsert_many(items):
+        commits.append(len(items))
+        upsert_many(items)
+
+    repo.upsert_many = counting_upsert_many
+
+    # Workers stream back chunks of 2, which must not become transactions of their own.
+    summaries = ingest_sharded(
+        repo=repo,
+        sources=[_source("a"), _source("b"), _source("c")],
+        workers=3,
+        batch_size=4,
+        chunk_size=2,
+        fetch_source=_fake_fetch,
+    )
+    assert commits == [4, 4, 1]
+    assert [s.upserted for s in summaries] == [3, 3, 3]
+
+    commits.clear()
+    records = [r for s in "def" for r in _fake_fetch(source=_source(s), timeout_seconds=1)]
+    assert ingest_once(repo=repo, records=records, batch_size=4) == 9
+    assert commits == [4, 4, 1]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pickle
+from datetime import timedelta
+
+from factories import NOW, SOURCE, rss_feed
+
+from provenance_feed.ingestion.precheck import KnownItemCheck
+from provenance_feed.ingestion.rss_common import parse_rss_xml
+from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+
+class _CountingFetcher:
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+
+    def __call__(self, url: str, _timeout: float) -> bytes:
+        self.urls.append(url)
+        return b"<html></html>"
+
+
+def _repo(tmp_path) -> SQLiteFeedRepository:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    return repo
+
+
+def test_unchanged_entries_skip_image_resolution(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    xml = rss_feed(("a", "First"), ("b", "Second"))
+    ingest_once(
+        repo=repo, records=parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=NOW)
+    )
+
+    known = KnownItemCheck(repo)
+    fetcher = _CountingFetcher()
+    records = parse_rss_xml(
+        xml=xml, source=SOURCE, page_fetcher=fetcher, now=NOW + timedelta(hours=1), known=known
+    )
+
+    assert records == []
+    assert fetcher.urls == []
+    report = known.report()
+    assert (report.candidates, report.skipped, report.lookups) == (2, 2, 1)
+
+
+def test_new_and_changed_entries_are_processed(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    xml = rss_feed(("a", "First"), ("b", "Second"))
+    ingest_once(
+        repo=repo, records=parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=NOW)
+    )
+
+    known = KnownItemCheck(repo)
+    records = parse_rss_xml(
+        xml=rss_feed(("a", "First"), ("b", "Second, updated"), ("c", "Third")),
+        source=SOURCE,
+        page_fetcher=None,
+        now=NOW,
+        known=known,
+    )
+
+    assert sorted(r.title for r in records) == ["Second, updated", "Third"]
+    report = known.report()
+    assert (report.skipped, report.changed, report.new) == (1, 1, 1)
+
+
+def test_stale_image_check_is_reprocessed(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    xml = rss_feed(("a", "First"))
+    ingest_once(
+        repo=repo, records=parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=NOW)
+    )
+
+    known = KnownItemCheck(repo, image_recheck_after=timedelta(days=1))
+    fetcher = _CountingFetcher()
+    records = parse_rss_xml(
+        xml=xml, source=SOURCE, page_fetcher=fetcher, now=NOW + timedelta(days=2), known=known
+    )
+
+    assert len(records) == 1
+    assert fetcher.urls == ["https://example.com/a"]
+    assert known.report().stale_images == 1
+
+
+def test_failed_lookup_processes_everything(tmp_path) -> None:
+    class _BrokenRepo:
+        def known_items(self, content_ids):
+            raise RuntimeError("database is locked")
+
+    known = KnownItemCheck(_BrokenRepo())
+    records = parse_rss_xml(
+        xml=rss_feed(("a", "First")), source=SOURCE, page_fetcher=None, now=NOW, known=known
+    )
+
+    assert len(records) == 1
+    assert known.report().failed_lookups == 1
+
+
+def test_check_pickles_for_worker_processes(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    xml = rss_feed(("a", "First"))
+    ingest_once(
+        repo=repo, records=parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=NOW)
+    )
+
+    known = KnownItemCheck(repo)
+    parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=NOW, known=known)
+    copy = pickle.loads(pickle.dumps(known))
+
+    assert copy.report().candidates == 0
+    assert parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=NOW, known=copy) == []
+    known.merge(copy.report())
+    assert known.report().skipped == 2
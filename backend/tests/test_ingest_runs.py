@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pickle
+from datetime import datetime, timedelta
+
+from factories import NOW, SOURCE, rss_feed
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+from provenance_feed.ingestion.precheck import KnownItemCheck
+from provenance_feed.ingestion.rss_common import parse_rss_xml
+from provenance_feed.ingestion.run_stats import RunStats
+from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.persistence.ingest_runs import (
+    IngestRun,
+    IngestRunSource,
+    SQLiteIngestRunStore,
+    compare_to_baseline,
+)
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+
+def _run(seconds: float, *, entries: int = 100, error: str | None = None) -> IngestRun:
+    return IngestRun(
+        run_id=None,
+        started_at=NOW,
+        finished_at=NOW + timedelta(seconds=seconds),
+        persist_seconds=0.1,
+        sources=(
+            IngestRunSource(
+                source_id="test",
+                fetch_seconds=1.0,
+                parse_seconds=0.5,
+                bytes=10_000,
+                entries=entries,
+                kept=entries,
+                written=10,
+                error=error,
+            ),
+        ),
+    )
+
+
+def _ingest(repo: SQLiteFeedRepository, xml: bytes, *, now: datetime) -> IngestRun:
+    stats = RunStats()
+    marks = repo.write_marks()
+    ingest_once(
+        repo=repo,
+        records=parse_rss_xml(
+            xml=xml,
+            source=SOURCE,
+            page_fetcher=None,
+            now=now,
+            known=KnownItemCheck(repo),
+            stats=stats,
+        ),
+        batch_size=10,
+        stats=stats,
+    )
+    return stats.to_run(started_at=now, finished_at=now, writes=repo.writes_since(marks))
+
+
+def test_run_stats_count_entries_and_writes(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    _ingest(repo, rss_feed(("a", "First"), ("b", "Second")), now=NOW)
+
+    # One unchanged, one retitled, one new and one invalid (no title) entry.
+    xml = rss_feed(("a", "First"), ("b", "Second, updated"), ("c", "Third"), ("d", ""))
+    [source] = _ingest(repo, xml, now=NOW + timedelta(hours=1)).sources
+
+    assert source.source_id == "test"
+    assert (source.entries, source.kept, source.skipped, source.written) == (4, 3, 1, 2)
+    assert (source.inserted, source.updated, source.unchanged) == (1, 1, 1)
+    assert source.parse_seconds > 0
+
+
+def test_run_stats_merge_from_workers() -> None:
+    parent = RunStats()
+    worker = pickle.loads(pickle.dumps(parent))
+    worker.add("a", entries=3, written=2)
+    worker.error("b", "URLError: down")
+    parent.add("a", entries=1)
+    parent.merge(worker.sources())
+
+    sources = parent.sources()
+    assert (sources["a"].entries, sources["a"].written) == (4, 2)
+    assert sources["b"].error == "URLError: down"
+
+
+def test_ledger_round_trip_and_baseline(tmp_path) -> None:
+    store = SQLiteIngestRunStore(tmp_path / "feed.db")
+    store.init_schema()
+    for seconds in (10.0, 11.0, 9.0):
+        store.record(_run(seconds))
+    store.record(_run(1.0, error="URLError: down"))  # fast, but not a usable baseline
+
+    [latest, *previous] = store.list_runs(limit=10)
+    assert latest.run_id == 4 and latest.errors == 1
+    assert previous[0].sources == _run(9.0).sources
+
+    slow = {c.metric: c for c in compare_to_baseline(_run(20.0), previous)}
+    assert slow["entries_per_second"].baseline == 10.0
+    assert slow["entries_per_second"].regressed
+    assert not slow["parse_ms_per_entry"].regressed
+    assert not any(c.regressed for c in compare_to_baseline(_run(11.0), previous))
+    assert compare_to_baseline(_run(20.0), previous[:2]) == []
+
+
+def test_ingest_runs_endpoint_flags_latest_regression(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    with TestClient(create_app(settings)) as client:
+        assert client.get("/api/ingest/runs").json() == {"runs": [], "regressed": False}
+
+        store = SQLiteIngestRunStore(settings.database_path)
+        for seconds in (10.0, 10.0, 10.0, 30.0):
+            store.record(_run(seconds))
+
+        body = client.get("/api/ingest/runs", params={"limit": 2}).json()
+        assert [r["run_id"] for r in body["runs"]] == [4, 3]
+        assert body["regressed"] is True
+        latest = body["runs"][0]
+        assert latest["totals"]["entries"] == 100
+        assert latest["sources"][0]["source_id"] == "test"
+        assert {c["metric"] for c in latest["baseline"] if c["regressed"]} == {"entries_per_second"}
+        # The third run only has two runs before it: no baseline yet.
+        assert body["runs"][1]["baseline"] == []
+
+
+def test_app_startup_ingestion_is_recorded_in_the_ledger(tmp_path, monkeypatch) -> None:
+    from provenance_feed.ingestion import cycle
+
+    def fake_records(*, stats, **_):
+        return parse_rss_xml(
+            xml=rss_feed(("a", "First"), ("b", "Second")),
+            source=SOURCE,
+            page_fetcher=None,
+            now=NOW,
+            stats=stats,
+        )
+
+    monkeypatch.setattr(cycle, "iter_all_records", fake_records)
+    settings = Settings(database_path=tmp_path / "feed.db")
+    with TestClient(create_app(settings)) as client:
+        [run] = client.get("/api/ingest/runs").json()["runs"]
+    assert run["totals"]["inserted"] == 2
+    assert run["sources"][0]["source_id"] == "test"
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+
+from provenance_feed.ingestion.mock_source import fetch_mock_items
+from provenance_feed.ingestion.pipeline import stream_sources
+from provenance_feed.ingestion.rss_common import RSSSource
+from provenance_feed.ingestion.service import ingest_once
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+
+def _source(source_id: str) -> RSSSource:
+    return RSSSource(source_id=source_id, source_name=source_id, feed_url="https://x")
+
+
+def _record(source: str, i: int) -> dict:
+    return {
+        "source": source,
+        "source_item_id": str(i),
+        "title": f"{source} {i}",
+        "source_name": source,
+        "source_url": f"https://example.com/{source}/{i}",
+        "published_at": "2025-01-01T12:00:00+00:00",
+    }
+
+
+def test_ingest_once_commits_batches_before_the_stream_ends(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    stored_when_yielding: list[int] = []
+
+    def records() -> Iterator[dict]:
+        for i in range(5):
+            stored_when_yielding.append(len(repo.list_latest(limit=100)))
+            yield _record("s", i)
+
+    assert ingest_once(repo=repo, records=records(), batch_size=2) == 5
+    assert stored_when_yielding == [0, 0, 2, 2, 4]
+
+
+def test_ingest_once_accepts_lists() -> None:
+    class _Repo:
+        def __init__(self) -> None:
+            self.items: list[str] = []
+
+        def upsert_many(self, items) -> None:
+            self.items.extend(i.content_id for i in items)
+
+    repo = _Repo()
+    assert ingest_once(repo=repo, records=fetch_mock_items(), batch_size=2) == 3
+    assert repo.items == ["mock:1", "mock:2", "mock:3"]
+
+
+def test_stream_sources_yields_fast_sources_while_slow_ones_block() -> None:
+    release_slow = threading.Event()
+
+    def fetch(*, source: RSSSource, timeout_seconds: float) -> Iterator[dict]:
+        if source.source_id == "slow":
+            release_slow.wait(timeout=5)
+        if source.source_id == "broken":
+            raise RuntimeError("down")
+        for i in range(3):
+            yield _record(source.source_id, i)
+
+    stream = stream_sources(
+        [_source("slow"), _source("fast"), _source("broken")],
+        max_workers=3,
+        queue_size=2,
+        fetch_source=fetch,
+    )
+    first = [next(stream) for _ in range(3)]
+    assert {r["source"] for r in first} == {"fast"}
+
+    release_slow.set()
+    rest = list(stream)
+    assert [r["source"] for r in rest] == ["slow"] * 3
+
+
+def test_stream_sources_can_be_closed_early() -> None:
+    def fetch(*, source: RSSSource, timeout_seconds: float) -> Iterator[dict]:
+        for i in range(10_000):
+            yield _record(source.source_id, i)
+
+    stream = stream_sources([_source("a"), _source("b")], queue_size=4, fetch_source=fetch)
+    assert next(stream)["source"] in {"a", "b"}
+    stream.close()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+import provenance_feed.api.app as app_module
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+from provenance_feed.leader import LeaderElection
+from provenance_feed.persistence.leases import SQLiteLeaseStore
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_lease_is_held_renewed_and_taken_over_after_expiry(tmp_path) -> None:
+    store = SQLiteLeaseStore(tmp_path / "feed.db")
+    store.init_schema()
+
+    assert store.try_acquire("ingestion", "a", ttl_seconds=10, now=100)
+    assert not store.try_acquire("ingestion", "b", ttl_seconds=10, now=105)
+    assert store.try_acquire("ingestion", "a", ttl_seconds=10, now=106)
+    lease = store.get("ingestion")
+    assert (lease.holder, lease.acquired_at, lease.expires_at) == ("a", 100, 116)
+
+    assert not store.try_acquire("ingestion", "b", ttl_seconds=10, now=115.9)
+    assert store.try_acquire("ingestion", "b", ttl_seconds=10, now=116)
+    assert store.get("ingestion").acquired_at == 116
+
+    store.release("ingestion", "a")  # no longer a's to release
+    assert store.get("ingestion").holder == "b"
+    store.release("ingestion", "b")
+    assert store.get("ingestion") is None
+
+
+def test_follower_takes_over_when_leader_stops_heartbeating(tmp_path) -> None:
+    store = SQLiteLeaseStore(tmp_path / "feed.db")
+    store.init_schema()
+    options = {"ttl_seconds": 0.5, "heartbeat_seconds": 0.05}
+    leader = LeaderElection(store, holder="leader", **options)
+    follower = LeaderElection(store, holder="follower", **options)
+
+    assert leader.start()
+    assert not follower.start()
+    # Renewals keep the lease well past its TTL.
+    time.sleep(0.8)
+    assert leader.is_leader and not follower.is_leader
+
+    # A leader that dies (no release) loses the lease once it expires.
+    leader.stop(release=False)
+    assert _wait_for(lambda: follower.is_leader)
+    assert store.get("ingestion").holder == "follower"
+
+    follower.stop()
+    assert store.get("ingestion") is None
+
+
+def test_only_one_app_process_ingests(tmp_path, monkeypatch) -> None:
+    runs = []
+
+    def fake_run_ingestion(*, settings, repo, observer=None):
+        runs.append(repo)
+
+    monkeypatch.setattr(app_module, "_run_ingestion", fake_run_ingestion)
+    settings = Settings(
+        database_path=tmp_path / "feed.db",
+        ingest_interval_seconds=0.05,
+        ingest_lease_heartbeat_seconds=0.05,
+    )
+    first, second = create_app(settings), create_app(settings)
+
+    with TestClient(first), TestClient(second):
+        # Startup and periodic runs all come from the app that took the lease first.
+        assert _wait_for(lambda: len(runs) >= 4)
+        assert {id(repo) for repo in runs} == {id(first.state.repo)}
+
+    # Shutting down released the lease for the next process.
+    assert SQLiteLeaseStore(tmp_path / "feed.db").get("ingestion") is None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from factories import make_item
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.domain.near_duplicates import band_keys, similarity, title_signature
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+T0 = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _item(content_id: str, title: str, *, minutes: int = 0, url: str | None = None) -> FeedItem:
+    return make_item(content_id, T0 + timedelta(minutes=minutes), title=title, source_url=url)
+
+
+def test_signatures_match_reordered_titles_and_reject_unrelated() -> None:
+    a = title_signature("Japan earthquake kills 10 people")
+    b = title_signature("Earthquake in Japan kills 10 people")
+    c = title_signature("Central bank holds interest rates steady")
+    assert a and b and c
+    assert similarity(a, b) == 1.0
+    assert similarity(a, c) < 0.6
+    assert set(band_keys(a)) & set(band_keys(b))
+    assert title_signature("Live") is None
+
+
+def _clusters(repo: SQLiteFeedRepository) -> dict[str, str]:
+    return {i.content_id: i.cluster_id for i in repo.list_latest(limit=100)}
+
+
+def test_repository_clusters_cross_source_duplicates(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+
+    repo.upsert_many(
+        [
+            _item("bbc:1", "Israel and Hamas agree ceasefire deal"),
+            _item("guardian:1", "Israel, Hamas agree to ceasefire deal", minutes=5),
+            _item("npr:1", "Central bank holds interest rates steady", minutes=6),
+        ]
+    )
+    repo.upsert(_item("npr:2", "Syndicated copy", minutes=7, url="https://example.com/bbc:1"))
+    # Same title days later is a different story.
+    repo.upsert(_item("bbc:2", "Israel and Hamas agree ceasefire deal", minutes=60 * 24 * 5))
+
+    clusters = _clusters(repo)
+    assert clusters["bbc:1"] == clusters["guardian:1"] == clusters["npr:2"] == "bbc:1"
+    assert clusters["npr:1"] == "npr:1"
+    assert clusters["bbc:2"] == "bbc:2"
+
+    # Re-ingesting an unchanged item keeps its cluster.
+    repo.upsert(_item("guardian:1", "Israel, Hamas agree to ceasefire deal", minutes=5))
+    assert _clusters(repo)["guardian:1"] == "bbc:1"
+
+
+def test_clustering_is_not_crowded_out_by_old_band_collisions(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    title = "Israel and Hamas agree ceasefire deal"
+    # More same-title items than the candidate cap, all long before the clustering window.
+    repo.upsert_many([_item(f"old:{n}", title, minutes=-60 * 24 * (10 + n)) for n in range(80)])
+    repo.upsert(_item("bbc:1", title))
+    repo.upsert(_item("guardian:1", "Israel, Hamas agree to ceasefire deal", minutes=5))
+
+    assert _clusters(repo)["guardian:1"] == "bbc:1"
+
+    # A re-dated item is found at its new time.
+    repo.upsert(_item("old:0", title, minutes=-60 * 24 * 30))
+    repo.upsert(_item("old:0", title, minutes=60 * 24 * 10))
+    repo.upsert(_item("npr:1", "Israel and Hamas agree a ceasefire deal", minutes=60 * 24 * 11))
+    assert _clusters(repo)["npr:1"] == _clusters(repo)["old:0"]
+
+
+def test_feed_collapse_returns_newest_item_per_cluster(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    app = create_app(settings)
+    with TestClient(app) as client:
+        app.state.repo.upsert_many(
+            [
+                _item("bbc:1", "Japan earthquake kills 10 people"),
+                _item("npr:1", "Earthquake in Japan kills 10 people", minutes=3),
+                _item("eff:1", "New privacy rules announced for apps", minutes=1),
+            ]
+        )
+
+        full = client.get("/api/feed").json()
+        assert [i["content_id"] for i in full] == ["npr:1", "eff:1", "bbc:1"]
+
+        collapsed = client.get("/api/feed", params={"collapse": "true"}).json()
+        assert [i["content_id"] for i in collapsed] == ["npr:1", "eff:1"]
+        assert collapsed[0]["cluster_id"] == "bbc:1"
+
+        page = client.get("/api/feed", params={"collapse": "true", "limit": 1})
+        rest = client.get(
+            "/api/feed",
+            params={"collapse": "true", "limit": 1, "cursor": page.headers["X-Next-Cursor"]},
+        )
+        assert [i["content_id"] for i in rest.json()] == ["eff:1"]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from factories import SOURCE, rss_feed
+
+from provenance_feed.ingestion.parse_pool import ParseError, ParsePool, ParseTimeoutError
+from provenance_feed.ingestion.rss_common import parse_feed, parse_rss_xml
+
+
+def _large_feed(items: int) -> bytes:
+    return rss_feed(
+        *((str(i), f"Item {i}") for i in range(items)), published="Mon, 06 Jan 2025 10:00:00 GMT"
+    )
+
+
+def test_pool_parses_like_inline_and_recycles_workers() -> None:
+    xml = (Path(__file__).parent / "fixtures" / "rss_with_media.xml").read_bytes()
+    now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+    with ParsePool(processes=1, max_tasks_per_child=2) as pool:
+        assert pool.parse(xml, SOURCE) == parse_feed(xml, SOURCE)
+        [worker] = list(pool._slots.queue)
+        records = parse_rss_xml(
+            xml=xml, source=SOURCE, page_fetcher=None, now=now, parser=pool.parse
+        )
+        # Its second parse retired the worker; the next parse starts a fresh one.
+        assert list(pool._slots.queue) == [None]
+        assert not worker.process.is_alive()
+
+    assert records == parse_rss_xml(xml=xml, source=SOURCE, page_fetcher=None, now=now)
+    assert records[0]["image_source"] == "rss"
+
+
+def test_slow_parse_is_killed_and_worker_replaced() -> None:
+    with ParsePool(processes=1, timeout_seconds=0.05, memory_limit_mb=None) as pool:
+        with pytest.raises(ParseTimeoutError):
+            pool.parse(_large_feed(20000), SOURCE)
+        assert list(pool._slots.queue) == [None]
+        assert len(pool.parse(_large_feed(3), SOURCE).kept) == 3
+
+
+def test_parse_over_memory_cap_fails_without_taking_down_the_pool() -> None:
+    pytest.importorskip("resource")
+    with ParsePool(processes=1, memory_limit_mb=64) as pool:
+        with pytest.raises(ParseError, match="MemoryError"):
+            pool.parse(_large_feed(30000), SOURCE)
+        assert len(pool.parse(_large_feed(3), SOURCE).kept) == 3
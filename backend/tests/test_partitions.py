@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from factories import make_item
+
+from provenance_feed.persistence.repository import FeedCursor
+from provenance_feed.persistence.retention import RetentionPolicy
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+NOW = datetime(2025, 6, 15, tzinfo=UTC)
+
+
+def _seeded(tmp_path) -> SQLiteFeedRepository:
+    repo = SQLiteFeedRepository(
+        database_path=tmp_path / "feed.db", partition_dir=tmp_path / "partitions"
+    )
+    repo.init_schema()
+    # Two items a week, alternating sources, from January to mid-June.
+    repo.upsert_many(
+        [
+            make_item(
+                f"{'ab'[i % 2]}:{i}", datetime(2025, 1, 1, tzinfo=UTC) + timedelta(days=3.5 * i)
+            )
+            for i in range(47)
+        ]
+    )
+    return repo
+
+
+def _all_pages(repo: SQLiteFeedRepository, **kwargs) -> list[str]:
+    ids: list[str] = []
+    before = None
+    while page := repo.list_latest(limit=7, before=before, **kwargs):
+        ids += [item.content_id for item in page]
+        before = FeedCursor.after(page[-1])
+    return ids
+
+
+def test_archived_history_reads_the_same(tmp_path) -> None:
+    repo = _seeded(tmp_path)
+    feed, by_source = _all_pages(repo), _all_pages(repo, source="b")
+    changes = repo.list_changes(since=0, limit=1000)
+
+    report = repo.archive(hot_months=1, now=NOW)
+    assert report.months == ("2025-01", "2025-02", "2025-03", "2025-04")
+    assert [p.month for p in repo.partitions()] == ["2025-04", "2025-03", "2025-02", "2025-01"]
+    assert sum(p.rows for p in repo.partitions()) == report.rows_moved
+    assert all(p.path.exists() for p in repo.partitions())
+
+    assert _all_pages(repo) == feed
+    assert _all_pages(repo, source="b") == by_source
+    assert repo.list_changes(since=0, limit=1000) == changes
+    assert repo.list_changes(since=changes[9][0], limit=5) == changes[10:15]
+    assert set(repo.get_many(["a:0", "b:45", "a:99"])) == {"a:0", "b:45"}
+    # Nothing left to move.
+    assert repo.archive(hot_months=1, now=NOW).rows_moved == 0
+
+
+def test_recent_pages_do_not_touch_month_files(tmp_path, monkeypatch) -> None:
+    repo = _seeded(tmp_path)
+    repo.archive(hot_months=1, now=NOW)
+    opened: list[str] = []
+    connect = repo._partition_connection
+    monkeypatch.setattr(
+        repo, "_partition_connection", lambda p: opened.append(p.month) or connect(p)
+    )
+
+    page = repo.list_latest(limit=10)
+    assert page[-1].published_at >= datetime(2025, 5, 1, tzinfo=UTC)
+    assert opened == []
+
+    cursor = FeedCursor.after(repo.get_many(["b:33"])["b:33"])
+    opened.clear()
+    # A cursor into April reads April, and March only to fill the rest of the page.
+    repo.list_latest(limit=10, before=cursor)
+    assert opened == ["2025-04", "2025-03"]
+
+
+def test_late_item_for_archived_month_is_merged(tmp_path) -> None:
+    repo = _seeded(tmp_path)
+    repo.archive(hot_months=1, now=NOW)
+
+    # Re-published under the same id, and a new item, both dated in archived February.
+    repo.upsert_many(
+        [
+            make_item("a:10", datetime(2025, 2, 5, tzinfo=UTC), title="edited"),
+            make_item("c:late", datetime(2025, 2, 20, tzinfo=UTC)),
+        ]
+    )
+    feed = _all_pages(repo)
+    assert feed.count("a:10") == 1
+    assert feed.index("c:late") < feed.index("a:14")
+
+    assert repo.archive(hot_months=1, now=NOW).months == ("2025-02",)
+    feed = _all_pages(repo)
+    assert feed.count("a:10") == 1 and "c:late" in feed
+    assert repo.get_many(["a:10"])["a:10"].title == "edited"
+
+
+def test_upserting_an_archived_item_keeps_one_copy(tmp_path) -> None:
+    repo = _seeded(tmp_path)
+    moved = repo.archive(hot_months=1, now=NOW).rows_moved
+    [archived] = repo.get_many(["a:2"]).values()
+    assert set(repo.known_items(["a:2", "b:45", "a:99"])) == {"a:2", "b:45"}
+
+    for edited in (archived, dataclasses.replace(archived, title="edited")):
+        repo.upsert_many([edited])
+        feed = _all_pages(repo)
+        assert feed.count("a:2") == 1 and len(feed) == 47
+        assert repo.get_many(["a:2"])["a:2"] == edited
+    # Moved back into the hot table under its old id, not inserted as a new item.
+    assert [seq for seq, item in repo.inserted_since(after=0) if item.content_id == "a:2"] == [3]
+    assert sum(p.rows for p in repo.partitions()) == moved - 1
+    assert [item.content_id for _, item in repo.list_changes(since=0, limit=100)].count("a:2") == 1
+
+    repo.archive(hot_months=1, now=NOW)
+    assert _all_pages(repo).count("a:2") == 1
+    assert repo.get_many(["a:2"])["a:2"].title == "edited"
+
+
+def test_detach_attach_and_retention_by_whole_month(tmp_path) -> None:
+    repo = _seeded(tmp_path)
+    repo.archive(hot_months=1, now=NOW)
+    total = len(_all_pages(repo))
+
+    path = repo.detach_partition("2025-03")
+    assert path.exists()
+    assert len(_all_pages(repo)) == total - 9
+    assert repo.get_many(["b:19"]) == {}
+    with pytest.raises(KeyError):
+        repo.detach_partition("2025-03")
+    assert repo.attach_partition("2025-03").rows == 9
+    assert len(_all_pages(repo)) == total
+
+    # Only months entirely past the cutoff are dropped, file and all.
+    report = repo.prune(policy=RetentionPolicy(max_age=timedelta(days=90)), now=NOW)
+    assert [p.month for p in repo.partitions()] == ["2025-04", "2025-03"]
+    assert not (tmp_path / "partitions" / "feed-2025-02.db").exists()
+    assert report.rows_deleted == 9 + 8
+
+
+def test_lookups_only_read_the_month_files_holding_the_ids(tmp_path, monkeypatch) -> None:
+    repo = _seeded(tmp_path)
+    repo.archive(hot_months=1, now=NOW)
+    opened: list[str] = []
+    connect = repo._partition_connection
+    monkeypatch.setattr(
+        repo, "_partition_connection", lambda p: opened.append(p.month) or connect(p)
+    )
+
+    # New items, and ids that were never stored, touch no month file.
+    repo.upsert_many([make_item("c:1", NOW), make_item("a:999", NOW)])
+    assert set(repo.known_items(["c:2", "a:1000", "b:45"])) == {"b:45"}
+    assert repo.get_many(["c:3"]) == {}
+    assert opened == []
+
+    assert set(repo.known_items(["a:2", "b:19", "b:45"])) == {"a:2", "b:19", "b:45"}
+    assert sorted(opened) == ["2025-01", "2025-03"]
+
+    # Re-dated into another month, an archived item still leaves its old month file.
+    [archived] = repo.get_many(["a:2"]).values()
+    repo.upsert(dataclasses.replace(archived, published_at=datetime(2025, 3, 3, tzinfo=UTC)))
+    assert _all_pages(repo).count("a:2") == 1
+    repo.archive(hot_months=1, now=NOW)
+    assert _all_pages(repo).count("a:2") == 1
+
+
+def test_archived_key_index_is_rebuilt_for_older_partitions(tmp_path) -> None:
+    repo = _seeded(tmp_path)
+    repo.archive(hot_months=1, now=NOW)
+    with sqlite3.connect(tmp_path / "feed.db") as conn:
+        conn.execute("DELETE FROM archived_items;")
+    assert repo.get_many(["a:2"]) == {}
+
+    repo.init_schema()
+    assert set(repo.get_many(["a:2", "b:19"])) == {"a:2", "b:19"}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import pstats
+import sqlite3
+import threading
+
+from factories import make_item
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+from provenance_feed.profiling import StageProfiler
+
+
+def _functions(path) -> set[str]:
+    return {name for _, _, name in pstats.Stats(str(path)).stats}
+
+
+def test_stage_profiler_merges_threads_per_stage(tmp_path) -> None:
+    profiler = StageProfiler(tmp_path)
+
+    def produce():
+        yield from range(3)
+
+    consumed = []
+    fetch = profiler.iterate("fetch", produce)
+    thread = threading.Thread(target=lambda: consumed.extend(fetch()))
+    thread.start()
+    thread.join()
+    assert profiler.call("persist", lambda: sorted(consumed)) == [0, 1, 2]
+
+    paths = profiler.write(prefix="run-")
+    assert sorted(p.name for p in paths) == ["run-fetch.pstats", "run-persist.pstats"]
+    assert "produce" in _functions(tmp_path / "run-fetch.pstats")
+
+
+def test_profile_header_profiles_request_and_reader_queries(tmp_path) -> None:
+    settings = Settings(
+        database_path=tmp_path / "feed.db",
+        auto_ingest_on_startup=False,
+        profile_token="secret",
+        profile_dir=tmp_path / "profiles",
+    )
+    with TestClient(create_app(settings)) as client:
+        r = client.get("/api/feed", headers={"X-Profile": "secret"})
+        assert r.status_code == 200
+        report = settings.profile_dir / r.headers["X-Profile-Report"]
+        # The query itself runs on a reader-pool thread.
+        assert "list_latest" in _functions(report)
+
+        assert "X-Profile-Report" not in client.get("/api/feed").headers
+        wrong = client.get("/api/feed", headers={"X-Profile": "guess"})
+        assert "X-Profile-Report" not in wrong.headers
+
+
+def test_streaming_routes_are_not_profiled(tmp_path) -> None:
+    settings = Settings(
+        database_path=tmp_path / "feed.db",
+        auto_ingest_on_startup=False,
+        profile_token="secret",
+        profile_dir=tmp_path / "profiles",
+    )
+    with TestClient(create_app(settings)) as client:
+        r = client.get("/api/export.ndjson", headers={"X-Profile": "secret"})
+        assert r.status_code == 200
+        assert "X-Profile-Report" not in r.headers
+        assert not settings.profile_dir.exists()
+        # The profiling slot is still free.
+        r = client.get("/api/feed", headers={"X-Profile": "secret"})
+        assert (settings.profile_dir / r.headers["X-Profile-Report"]).exists()
+
+
+def test_profiling_is_not_installed_without_token(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    with TestClient(create_app(settings)) as client:
+        r = client.get("/api/feed", headers={"X-Profile": ""})
+        assert "X-Profile-Report" not in r.headers
+
+
+def test_slow_query_log(tmp_path, caplog) -> None:
+    plain = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    plain.init_schema()
+    assert type(plain._connect()) is sqlite3.Connection
+
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db", slow_query_seconds=0.0)
+    repo.upsert_many([make_item("a:1"), make_item("a:2")])
+    with caplog.at_level(logging.WARNING, logger="provenance_feed.persistence.sqlite"):
+        assert len(repo.list_latest(limit=10)) == 2
+    [message] = [r.getMessage() for r in caplog.records if "ORDER BY" in r.getMessage()]
+    assert message.startswith("slow query ")
+    assert "(rows=2): SELECT f.source_id" in message
+
+    caplog.clear()
+    quiet = SQLiteFeedRepository(database_path=tmp_path / "feed.db", slow_query_seconds=60.0)
+    with caplog.at_level(logging.WARNING, logger="provenance_feed.persistence.sqlite"):
+        quiet.list_latest(limit=10)
+    assert caplog.records == []
@@ -1,6 +1,15 @@
-from datetime import UTC, datetime
+import dataclasses
+import sqlite3
+from datetime import UTC, datetime, timedelta
 
+from factories import make_item
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
 from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.maintenance import migrate, vacuum
+from provenance_feed.persistence.repository import FeedCursor
+from provenance_feed.persistence.retention import RetentionPolicy
 from provenance_feed.persistence.sqlite import SQLiteFeedRepository
 
 
@@ -29,3 +38,199 @@ def test_sqlite_repo_upsert_and_list_latest(tmp_path) -> None:
 
     items = repo.list_latest(limit=10)
     assert [i.content_id for i in items] == ["mock:2", "mock:1"]
+
+
+def test_sqlite_repo_prune_applies_each_limit_in_batches(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    for i in range(10):
+        repo.upsert(make_item(f"a:{i}", base + timedelta(days=i)))
+    for i in range(4):
+        repo.upsert(make_item(f"b:{i}", base + timedelta(days=i, hours=1)))
+
+    # Older than 2025-01-03 -> a:0, a:1, b:0, b:1.
+    report = repo.prune(
+        policy=RetentionPolicy(max_age=timedelta(days=8), batch_size=3),
+        now=base + timedelta(days=10),
+    )
+    assert report.rows_deleted == 4
+
+    report = repo.prune(policy=RetentionPolicy(max_items_per_source=5, batch_size=2))
+    assert report.rows_deleted == 3
+    assert {i.content_id for i in repo.list_latest(limit=100)} == {
+        "a:5",
+        "a:6",
+        "a:7",
+        "a:8",
+        "a:9",
+        "b:2",
+        "b:3",
+    }
+
+    report = repo.prune(policy=RetentionPolicy(max_items=3, batch_size=2))
+    assert report.rows_deleted == 4
+    assert [i.content_id for i in repo.list_latest(limit=100)] == ["a:9", "a:8", "a:7"]
+
+
+def test_sqlite_repo_prune_reclaims_space(tmp_path) -> None:
+    db = tmp_path / "feed.db"
+    repo = SQLiteFeedRepository(database_path=db)
+    repo.init_schema()
+
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == 2
+
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    for i in range(300):
+        item = make_item(f"a:{i}", base + timedelta(minutes=i))
+        repo.upsert(dataclasses.replace(item, title="x" * 500))
+
+    size_before = db.stat().st_size
+    report = repo.prune(policy=RetentionPolicy(max_items=10))
+    assert report.rows_deleted == 290
+    assert report.bytes_freed > 0
+    assert db.stat().st_size == size_before - report.bytes_freed
+
+
+def test_sqlite_repo_prune_is_noop_without_limits(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    repo.upsert(make_item("a:1", datetime(2000, 1, 1, tzinfo=UTC)))
+
+    report = repo.prune(policy=RetentionPolicy())
+    assert report.rows_deleted == 0
+    assert len(repo.list_latest(limit=10)) == 1
+
+
+def test_sqlite_repo_round_trips_compact_keys_and_timestamps(tmp_path) -> None:
+    db = tmp_path / "feed.db"
+    repo = SQLiteFeedRepository(database_path=db)
+    repo.init_schema()
+
+    digest = "ab" * 32
+    checked = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=UTC)
+    repo.upsert(
+        FeedItem(
+            content_id=f"bbc:{digest}",
+            title="Hashed",
+            source_name="BBC",
+            source_url="https://example.com/h",
+            published_at=datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=UTC),
+            image_last_checked=checked,
+        )
+    )
+    repo.upsert(make_item("mock:1", datetime(2025, 1, 1, 11, 0, tzinfo=UTC)))
+
+    hashed, mock = repo.list_latest(limit=10)
+    assert hashed.content_id == f"bbc:{digest}"
+    assert hashed.published_at == datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=UTC)
+    assert hashed.image_last_checked == checked
+    assert mock.content_id == "mock:1"
+    assert [i.content_id for i in repo.list_latest(limit=10, source="bbc")] == [f"bbc:{digest}"]
+
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == 9
+        rows = conn.execute(
+            "SELECT typeof(item_key), length(item_key), typeof(published_at) FROM feed_items "
+            "ORDER BY item_id;"
+        ).fetchall()
+    assert rows == [("blob", 32, "integer"), ("text", 1, "integer")]
+
+
+def test_sqlite_repo_migrates_legacy_text_schema(tmp_path) -> None:
+    db = tmp_path / "feed.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            """
+            CREATE TABLE feed_items (
+              content_id TEXT PRIMARY KEY,
+              title TEXT NOT NULL,
+              source_name TEXT NOT NULL,
+              source_url TEXT NOT NULL,
+              published_at TEXT NOT NULL,
+              created_at TEXT NOT NULL
+            );
+            """
+        )
+        conn.execute("CREATE INDEX idx_feed_items_published_at ON feed_items (published_at);")
+        conn.executemany(
+            "INSERT INTO feed_items VALUES (?, ?, 'Src', ?, ?, '2025-01-05T00:00:00+00:00');",
+            [
+                ("mock:1", "Older", "https://example.com/1", "2025-01-01T12:00:00+00:00"),
+                (f"bbc:{'0f' * 32}", "Newer", "https://example.com/2", "2025-01-02T09:30:00+01:00"),
+            ],
+        )
+
+    repo = SQLiteFeedRepository(database_path=db)
+    repo.init_schema()
+    repo.init_schema()  # idempotent once migrated
+
+    items = repo.list_latest(limit=10)
+    assert [(i.content_id, i.published_at) for i in items] == [
+        (f"bbc:{'0f' * 32}", datetime(2025, 1, 2, 8, 30, tzinfo=UTC)),
+        ("mock:1", datetime(2025, 1, 1, 12, 0, tzinfo=UTC)),
+    ]
+    assert all(i.cluster_id is None for i in items)
+
+    # Migrated rows are updated in place, not duplicated.
+    repo.upsert(make_item("mock:1", datetime(2025, 1, 3, tzinfo=UTC)))
+    assert [i.content_id for i in repo.list_latest(limit=10)] == ["mock:1", f"bbc:{'0f' * 32}"]
+    # Migrated rows start out in the change feed; the update moves mock:1 to its end.
+    assert [i.content_id for _, i in repo.list_changes(since=0)] == [f"bbc:{'0f' * 32}", "mock:1"]
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == 9
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "feed_items_legacy" not in tables
+
+
+def test_sqlite_repo_cursor_pages_through_timestamp_ties(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    same = datetime(2025, 1, 1, tzinfo=UTC)
+    ids = ["a:1", "a:2", f"b:{'cd' * 32}", "b:x", "c:1"]
+    repo.upsert_many([make_item(cid, same) for cid in ids])
+
+    seen: list[str] = []
+    before = None
+    while page := repo.list_latest(limit=2, before=before):
+        seen += [i.content_id for i in page]
+        before = FeedCursor.after(page[-1])
+    assert sorted(seen) == sorted(ids)
+    assert seen == [i.content_id for i in repo.list_latest(limit=10)]
+
+
+def test_startup_migrates_without_vacuuming_and_vacuum_is_explicit(tmp_path) -> None:
+    db = tmp_path / "feed.db"
+    # A file from before incremental auto-vacuum, with a lease table created on first use.
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE leases (name TEXT PRIMARY KEY, holder TEXT NOT NULL, "
+            "acquired_at REAL NOT NULL, expires_at REAL NOT NULL);"
+        )
+        conn.execute("INSERT INTO leases VALUES ('ingestion', 'old', 1, 2);")
+
+    SQLiteFeedRepository(database_path=db).init_schema()
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == 0
+        assert conn.execute("SELECT holder FROM leases;").fetchall() == [("old",)]
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert {"feed_meta", "host_breakers", "ingest_runs", "ingest_run_sources"} <= tables
+
+    vacuum(db)
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == 2
+
+
+def test_app_construction_leaves_migrations_to_startup_or_migrate(tmp_path) -> None:
+    db = tmp_path / "feed.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE leases (name TEXT PRIMARY KEY);")
+
+    create_app(Settings(database_path=db, auto_ingest_on_startup=False))
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == 0
+
+    assert migrate(db) == (0, 9)
+    assert migrate(db) == (9, 9)
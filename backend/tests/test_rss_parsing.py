@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from pathlib import Path
 
+from provenance_feed.ingestion.records import RawRecord
 from provenance_feed.ingestion.rss_common import RSSSource, parse_rss_xml
+from provenance_feed.ingestion.service import normalise_record
 
 
 def _fixture(path: str) -> bytes:
@@ -114,3 +116,20 @@ def test_no_image_sets_none_source() -> None:
     assert len(records) == 1
     assert records[0]["image_url"] is None
     assert records[0]["image_source"] == "none"
+
+
+def test_records_carry_native_datetimes_into_feed_items() -> None:
+    source = RSSSource(source_id="test", source_name="Test", feed_url="https://example.invalid")
+    now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+    records = parse_rss_xml(
+        xml=_fixture("rss_with_media.xml"), source=source, page_fetcher=None, now=now
+    )
+    assert isinstance(records[0], RawRecord)
+    assert isinstance(records[0].published_at, datetime)
+    assert records[0].image_last_checked == now
+
+    item = normalise_record(records[0])
+    assert item.published_at == records[0].published_at
+    assert item.published_at.tzinfo is not None
+    assert item.image_last_checked == now
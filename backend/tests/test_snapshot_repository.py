@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from factories import make_item
+
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.persistence.repository import FeedCursor
+from provenance_feed.persistence.retention import RetentionPolicy
+from provenance_feed.persistence.snapshot import SnapshotFeedRepository
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+BASE = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _item(n: int, *, minutes: int | None = None) -> FeedItem:
+    published_at = BASE + timedelta(minutes=n if minutes is None else minutes)
+    return make_item(f"mock:{n:03d}", published_at, title=f"Item {n}")
+
+
+def _pages(repo, limit: int) -> list[list[str]]:
+    pages: list[list[str]] = []
+    before = None
+    while True:
+        page = repo.list_latest(limit=limit, before=before)
+        if not page:
+            return pages
+        pages.append([i.content_id for i in page])
+        before = FeedCursor.after(page[-1])
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path) -> SQLiteFeedRepository:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    # Include timestamp ties so ordering falls back to content_id.
+    repo.upsert_many([_item(n, minutes=n // 2) for n in range(25)])
+    return repo
+
+
+def _snapshot(sqlite_repo, tmp_path, *, max_items: int) -> SnapshotFeedRepository:
+    repo = SnapshotFeedRepository(
+        backing=sqlite_repo,
+        database_path=tmp_path / "feed.db",
+        max_items=max_items,
+        poll_seconds=0,
+    )
+    repo.init_schema()
+    return repo
+
+
+@pytest.mark.parametrize("max_items", [100, 10])
+def test_snapshot_pages_match_sqlite(sqlite_repo, tmp_path, max_items) -> None:
+    snap = _snapshot(sqlite_repo, tmp_path, max_items=max_items)
+    try:
+        assert _pages(snap, 7) == _pages(sqlite_repo, 7)
+        assert sum(len(p) for p in _pages(snap, 7)) == 25
+    finally:
+        snap.close()
+
+
+def test_snapshot_applies_deltas_from_writes(sqlite_repo, tmp_path) -> None:
+    snap = _snapshot(sqlite_repo, tmp_path, max_items=100)
+    try:
+        snap.upsert(_item(99))
+        snap.upsert(dataclasses.replace(_item(0), title="Renamed"))
+
+        latest = snap.list_latest(limit=1)
+        assert latest[0].content_id == "mock:099"
+        by_id = {i.content_id: i for i in snap.list_latest(limit=100)}
+        assert by_id["mock:000"].title == "Renamed"
+        assert len(by_id) == 26
+        # Own writes are not mistaken for another process's.
+        assert snap.refresh_if_changed() is False
+    finally:
+        snap.close()
+
+
+def test_snapshot_deltas_keep_stored_fields_and_the_window(sqlite_repo, tmp_path) -> None:
+    snap = _snapshot(sqlite_repo, tmp_path, max_items=10)
+    try:
+        # Moved into the window, and one too old for it (left to SQLite).
+        snap.upsert_many([_item(3, minutes=100), _item(300, minutes=-5)])
+        snap.upsert(dataclasses.replace(_item(301, minutes=101), source_url=_item(3).source_url))
+
+        assert _pages(snap, 4) == _pages(sqlite_repo, 4)
+        latest = snap.list_latest(limit=2)
+        assert [i.content_id for i in latest] == ["mock:301", "mock:003"]
+        # Clustered by the write (same URL), as stored.
+        assert latest[0].cluster_id == latest[1].cluster_id is not None
+        assert snap.refresh_if_changed() is False
+    finally:
+        snap.close()
+
+
+def test_snapshot_picks_up_external_writes_via_data_version(sqlite_repo, tmp_path) -> None:
+    snap = _snapshot(sqlite_repo, tmp_path, max_items=100)
+    try:
+        assert snap.refresh_if_changed() is False
+
+        other_process = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+        other_process.upsert(_item(200))
+        assert snap.list_latest(limit=1)[0].content_id == "mock:024"
+
+        assert snap.refresh_if_changed() is True
+        assert snap.list_latest(limit=1)[0].content_id == "mock:200"
+    finally:
+        snap.close()
+
+
+def _source_pages(repo, source: str, limit: int) -> list[list[str]]:
+    pages: list[list[str]] = []
+    before = None
+    while page := repo.list_latest(limit=limit, before=before, source=source):
+        pages.append([i.content_id for i in page])
+        before = FeedCursor.after(page[-1])
+    return pages
+
+
+@pytest.mark.parametrize("max_items", [100, 10])
+def test_snapshot_source_pages_match_sqlite(sqlite_repo, tmp_path, max_items) -> None:
+    sqlite_repo.upsert_many(
+        [make_item(f"other:{n}", BASE + timedelta(minutes=n, seconds=30)) for n in range(12)]
+    )
+    snap = _snapshot(sqlite_repo, tmp_path, max_items=max_items)
+    try:
+        for source in ("mock", "other", "none"):
+            assert _source_pages(snap, source, 3) == _source_pages(sqlite_repo, source, 3)
+    finally:
+        snap.close()
+
+
+def test_snapshot_merges_external_changes_and_reloads_after_removals(sqlite_repo, tmp_path) -> None:
+    snap = _snapshot(sqlite_repo, tmp_path, max_items=100)
+    reloads: list[int] = []
+    list_latest = sqlite_repo.list_latest
+
+    def counting_list_latest(**kwargs):
+        reloads.append(1)
+        return list_latest(**kwargs)
+
+    sqlite_repo.list_latest = counting_list_latest
+    try:
+        other_process = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+        other_process.upsert_many(
+            [_item(200), dataclasses.replace(_item(3, minutes=1), title="Edited")]
+        )
+        assert snap.refresh_if_changed() is True
+        assert _pages(snap, 7) == _pages(other_process, 7)
+        titles = {i.content_id: i.title for i in snap.list_latest(limit=30, source="mock")}
+        assert titles["mock:003"] == "Edited"
+        assert reloads == []
+
+        # Retention deletes rows without a change to follow: the snapshot is re-read.
+        other_process.prune(policy=RetentionPolicy(max_items=5))
+        assert snap.refresh_if_changed() is True
+        assert reloads == [1]
+        assert _pages(snap, 7) == _pages(other_process, 7)
+    finally:
+        snap.close()
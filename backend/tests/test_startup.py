@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+# Generous budgets: these guard against regressions (e.g. ingestion dependencies creeping
+# back into the serving import path), not against slow CI machines.
+IMPORT_BUDGET_SECONDS = 5.0
+FIRST_REQUEST_BUDGET_SECONDS = 2.0
+
+_PROBE = """
+import json, os, sys, time
+
+t0 = time.perf_counter()
+import provenance_feed.main as main
+import_seconds = time.perf_counter() - t0
+created_on_import = os.path.exists(os.environ["BACKEND_DATABASE_PATH"])
+
+from fastapi.testclient import TestClient
+
+with TestClient(main.app) as client:
+    t0 = time.perf_counter()
+    r = client.get("/api/feed")
+    first_request_seconds = time.perf_counter() - t0
+
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "created_on_import": created_on_import,
+    "first_request_seconds": first_request_seconds,
+    "status": r.status_code,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def test_cold_start_skips_ingestion_dependencies_and_meets_budget(tmp_path) -> None:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(sys.path),
+        "BACKEND_DATABASE_PATH": str(tmp_path / "feed.db"),
+        "BACKEND_AUTO_INGEST_ON_STARTUP": "false",
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        env=env,
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert result["status"] == 200
+    # Importing the app leaves the database alone; startup creates and migrates it.
+    assert not result["created_on_import"]
+    modules = set(result["modules"])
+    assert "feedparser" not in modules
+    assert "provenance_feed.ingestion.rss_common" not in modules
+    assert "provenance_feed.provenance_graph.observer" not in modules
+
+    assert result["import_seconds"] < IMPORT_BUDGET_SECONDS
+    assert result["first_request_seconds"] < FIRST_REQUEST_BUDGET_SECONDS
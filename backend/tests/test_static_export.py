@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from provenance_feed.api.app import create_app
+from provenance_feed.config import Settings
+from provenance_feed.domain.models import FeedItem
+from provenance_feed.export.static_pages import export_static_feed
+from provenance_feed.persistence.sqlite import SQLiteFeedRepository
+
+
+def _seed(repo) -> None:
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    repo.upsert_many(
+        [
+            FeedItem(
+                content_id=f"{source}:{n}",
+                title=f"{source} story {n} — “quoted”",
+                source_name=source.upper(),
+                source_url=f"https://example.com/{source}/{n}",
+                published_at=base + timedelta(minutes=n * 3 + i),
+                image_last_checked=base,
+            )
+            for i, source in enumerate(("bbc", "npr"))
+            for n in range(5)
+        ]
+    )
+
+
+def test_static_pages_match_api_bytes(tmp_path) -> None:
+    settings = Settings(database_path=tmp_path / "feed.db", auto_ingest_on_startup=False)
+    app = create_app(settings)
+    with TestClient(app) as client:
+        _seed(app.state.repo)
+        out = tmp_path / "static"
+
+        report = export_static_feed(
+            repo=app.state.repo, out_dir=out, page_size=4, pages=2, sources=["bbc", "npr"]
+        )
+        assert report.changed
+
+        manifest = json.loads((out / "manifest.json").read_text())
+        assert manifest["version"] == report.version
+        assert len(manifest["feed"]) == 2
+        assert len(manifest["sources"]["bbc"]) == 2
+
+        cursor = None
+        for page in manifest["feed"]:
+            params = {"limit": 4} | ({"cursor": cursor} if cursor else {})
+            r = client.get("/api/feed", params=params)
+            body = (out / page["path"]).read_bytes()
+            assert body == r.content
+            assert gzip.decompress((out / (page["path"] + ".gz")).read_bytes()) == body
+            assert page["next_cursor"] == r.headers.get("X-Next-Cursor")
+            cursor = page["next_cursor"]
+
+        r = client.get("/api/feed", params={"limit": 4, "source": "npr"})
+        assert (out / manifest["sources"]["npr"][0]["path"]).read_bytes() == r.content
+        assert {i["content_id"].split(":")[0] for i in r.json()} == {"npr"}
+
+
+def test_static_export_skips_unchanged_and_prunes_old_versions(tmp_path) -> None:
+    repo = SQLiteFeedRepository(database_path=tmp_path / "feed.db")
+    repo.init_schema()
+    _seed(repo)
+    out = tmp_path / "static"
+    t0 = datetime(2025, 2, 1, tzinfo=UTC)
+
+    first = export_static_feed(repo=repo, out_dir=out, now=t0)
+    again = export_static_feed(repo=repo, out_dir=out, now=t0 + timedelta(minutes=1))
+    assert not again.changed
+    assert again.version == first.version
+
+    for n in range(3):
+        repo.upsert(
+            FeedItem(
+                content_id=f"bbc:new{n}",
+                title="New",
+                source_name="BBC",
+                source_url=f"https://example.com/new/{n}",
+                published_at=t0 + timedelta(days=n),
+            )
+        )
+        export_static_feed(repo=repo, out_dir=out, keep_versions=2, now=t0 + timedelta(hours=n))
+
+    versions = sorted(p.name for p in (out / "versions").iterdir())
+    assert len(versions) == 2
+    manifest = json.loads((out / "manifest.json").read_text())
+    assert manifest["version"] == versions[-1]
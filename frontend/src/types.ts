@@ -8,4 +8,6 @@ export type FeedItem = {
   image_url?: string | null
   image_source?: 'rss' | 'page_meta' | 'none' | string | null
   image_last_checked?: string | null
+
+  cluster_id?: string | null
 }